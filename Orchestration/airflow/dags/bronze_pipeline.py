@@ -3,72 +3,9 @@ Bronze Layer Data Pipeline
 Purpose: Orchestrate raw data ingestion from S3 to Snowflake bronze layer
 Schedule: Daily at 2:00 AM UTC
 Dependencies: S3 file availability, Snowflake connectivity
+Airflow tasks, schedule and default_args are declared in config/pipelines.yaml (built by plugins/dag_factory.py)
 """
 
-from datetime import datetime, timedelta
-from airflow import DAG
-from airflow.operators.python_operator import PythonOperator
-from airflow.providers.snowflake.operators.snowflake import SnowflakeOperator
+from dag_factory import build_dag
 
-default_args = {
-    'owner': 'data_engineering',
-    'depends_on_past': False,
-    'start_date': datetime(2024, 1, 1),
-    'email_on_failure': True,
-    'email_on_retry': False,
-    'retries': 2,
-    'retry_delay': timedelta(minutes=5)
-}
-
-with DAG(
-    'bronze_data_pipeline',
-    default_args=default_args,
-    description='Ingest raw data from S3 to Snowflake bronze layer',
-    schedule_interval='0 2 * * *',  # Daily at 2:00 AM UTC
-    catchup=False,
-    tags=['bronze', 'ingestion']
-) as dag:
-
-    # Task to validate S3 file availability
-    validate_s3_files = PythonOperator(
-        task_id='validate_s3_files',
-        python_callable=validate_s3_availability,
-        op_kwargs={'bucket': 'robel-data-lake', 'prefixes': ['raw/crm/', 'raw/erp/']}
-    )
-
-    # Task to execute bronze layer loading procedure
-    load_bronze_tables = SnowflakeOperator(
-        task_id='load_bronze_tables',
-        sql='CALL bronze.load_bronze_layer();',
-        snowflake_conn_id='snowflake_default'
-    )
-
-    # Task to validate bronze layer data quality
-    validate_bronze_data = SnowflakeOperator(
-        task_id='validate_bronze_data',
-        sql='CALL bronze.validate_ingestion_success();',
-        snowflake_conn_id='snowflake_default'
-    )
-
-    # Task to log pipeline completion
-    log_completion = PythonOperator(
-        task_id='log_pipeline_completion',
-        python_callable=log_bronze_completion
-    )
-
-    # Define task dependencies
-    validate_s3_files >> load_bronze_tables >> validate_bronze_data >> log_completion
-
-def validate_s3_availability(bucket, prefixes):
-    """
-    Validate that required S3 files are available before processing
-    """
-    # Implementation would check S3 for required files
-    print(f"Validating S3 files in bucket: {bucket}, prefixes: {prefixes}")
-    return True
-
-def log_bronze_completion():
-    """
-    Log successful bronze layer pipeline execution
-    """
-    print("Bronze layer pipeline completed successfully")
+dag = build_dag('bronze_data_pipeline')
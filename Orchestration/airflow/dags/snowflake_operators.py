@@ -3,13 +3,26 @@ Custom Snowflake Operators for Airflow
 Purpose: Extend Airflow with Snowflake-specific functionality
 """
 
+from datetime import datetime, timezone
+
 from airflow.models import BaseOperator
 from airflow.providers.snowflake.hooks.snowflake import SnowflakeHook
 from airflow.utils.decorators import apply_defaults
+from pipeline_tracing import instrument_hook, tracer
+from query_profiling import QueryProfiler, SnowflakeQueryHistory, query_tag_from_context
+from sampled_quality import SampledQualityChecker
 
 class SnowflakeDataQualityOperator(BaseOperator):
     """
     Custom operator for Snowflake data quality checks
+
+    `hook` overrides the SnowflakeHook, e.g. LocalHook from Orchestration/local_backend.
+    Queries are tagged with the DAG/task; with `profile_queries` their QUERY_HISTORY stats are
+    pulled after the checks (from `history_source` if given) and pushed to XCom as `query_profile`.
+    `approximate_checks` ({name: {"from", "failure" | "key", "max_failure_rate"}}) are estimated from a
+    `sample_percent` sample (or HyperLogLog for loose duplicate-key thresholds) and re-run exactly only
+    when the confidence interval straddles the threshold; their results are pushed to XCom as
+    `approximate_checks`
     """
     
     @apply_defaults
@@ -17,20 +30,111 @@ class SnowflakeDataQualityOperator(BaseOperator):
         self,
         sql_checks,
         snowflake_conn_id='snowflake_default',
+        hook=None,
+        profile_queries=True,
+        history_source=None,
+        profile_dir=None,
+        approximate_checks=None,
+        sample_percent=1.0,
+        sample_method='SYSTEM',
+        confidence=0.95,
         *args, **kwargs
     ):
         super(SnowflakeDataQualityOperator, self).__init__(*args, **kwargs)
         self.sql_checks = sql_checks
         self.snowflake_conn_id = snowflake_conn_id
+        self.hook = hook
+        self.profile_queries = profile_queries
+        self.history_source = history_source
+        self.profile_dir = profile_dir
+        self.approximate_checks = approximate_checks or {}
+        self.sample_percent = sample_percent
+        self.sample_method = sample_method
+        self.confidence = confidence
+
+    def get_hook(self, query_tag=None):
+        if self.hook is not None:
+            if query_tag and hasattr(self.hook, "query_tag"):
+                self.hook.query_tag = query_tag
+            return self.hook
+        session_parameters = {"QUERY_TAG": query_tag} if query_tag else None
+        return SnowflakeHook(snowflake_conn_id=self.snowflake_conn_id, session_parameters=session_parameters)
+
+    def profile(self, query_tag, started_at, context):
+        """
+        Summarize the tagged queries; profiling problems are logged, never fail the task
+        """
+        try:
+            history_source = self.history_source or SnowflakeQueryHistory(
+                lambda: SnowflakeHook(snowflake_conn_id=self.snowflake_conn_id).get_conn())
+            report = QueryProfiler(history_source).profile(query_tag, started_at)
+        except Exception as e:
+            self.log.warning(f"Query profiling failed: {e}")
+            return None
+        
+        summary = report["summary"]
+        self.log.info(f"Query profile: {summary['query_count']} queries, {summary['total_elapsed_ms']} ms, "
+                      f"{summary['bytes_scanned']} bytes scanned")
+        for flagged in report["flagged"]:
+            self.log.warning(f"Query {flagged['query_id']} flagged {flagged['flags']}: {flagged['query_text']}")
+        if self.profile_dir:
+            QueryProfiler.save(report, self.profile_dir)
+        task_instance = context.get("task_instance") or context.get("ti")
+        if task_instance is not None:
+            task_instance.xcom_push(key="query_profile", value={"summary": summary, "flagged": report["flagged"]})
+        return report
 
     def execute(self, context):
-        hook = SnowflakeHook(snowflake_conn_id=self.snowflake_conn_id)
+        query_tag = query_tag_from_context(context, component="data_quality")
+        started_at = datetime.now(timezone.utc)
         
+        with tracer.task_span(context):
+            hook = instrument_hook(self.get_hook(query_tag))
+            
+            try:
+                self.run_checks(hook)
+                if self.approximate_checks:
+                    results = self.run_approximate_checks(hook)
+                    task_instance = context.get("task_instance") or context.get("ti")
+                    if task_instance is not None:
+                        task_instance.xcom_push(key="approximate_checks", value=results)
+                    failed = [name for name, result in results.items() if not result["passed"]]
+                    if failed:
+                        raise ValueError(f"Data quality check failed: {', '.join(failed)}")
+            finally:
+                if self.profile_queries:
+                    self.profile(query_tag, started_at, context)
+
+    def run_checks(self, hook):
         for check_name, check_sql in self.sql_checks.items():
             self.log.info(f"Running data quality check: {check_name}")
-            result = hook.get_first(check_sql)
+            with tracer.span("data_quality.check", check=check_name) as span:
+                result = hook.get_first(check_sql)
+                passed = not (result and result[0] > 0)
+                span.set_attribute("passed", passed)
+            tracer.increment("pipeline_data_quality_checks_total", result="passed" if passed else "failed")
             
-            if result and result[0] > 0:
+            if not passed:
                 raise ValueError(f"Data quality check failed: {check_name}")
             
             self.log.info(f"Data quality check passed: {check_name}")
+
+    def run_approximate_checks(self, hook):
+        checker = SampledQualityChecker(lambda sql, params=None: hook.get_first(sql, parameters=params),
+                                        sample_percent=self.sample_percent, method=self.sample_method,
+                                        confidence=self.confidence)
+        results = {}
+        for check_name, check in self.approximate_checks.items():
+            self.log.info(f"Running approximate data quality check: {check_name}")
+            with tracer.span("data_quality.check", check=check_name) as span:
+                result, _ = checker.run(check)
+                span.set_attribute("method", result["method"])
+                span.set_attribute("passed", result["passed"])
+            tracer.increment("pipeline_data_quality_checks_total", result="passed" if result["passed"] else "failed")
+            
+            low, high = result["confidence_interval"]
+            self.log.info(f"{check_name}: {result['method']} failure rate {result['failure_rate']:.6f} "
+                          f"({self.confidence:.0%} CI {low:.6f}-{high:.6f}, threshold {result['threshold']}, "
+                          f"escalated: {result['escalated']})")
+            results[check_name] = result
+        return results
@@ -0,0 +1,184 @@
+"""
+Config-Driven DAG Factory
+Purpose: Build the bronze/silver/gold/full DAGs from dags/config/pipelines.yaml so default_args, dbt
+         paths and env blocks live in one place, and keep DAG parsing side-effect free: task callables
+         are referenced as "module.function" strings and imported only when the task executes
+Usage: dag = build_dag("bronze_data_pipeline")   # in a DAG file under dags/
+Dependencies: Airflow, PyYAML (ships with Airflow)
+"""
+
+import importlib
+import inspect
+import os
+from datetime import datetime, timedelta
+from functools import lru_cache, partial
+
+import yaml
+from airflow import DAG
+
+DEFAULT_CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "dags", "config",
+                                   "pipelines.yaml")
+# Inside the containers plugins/ and dags/ are mounted side by side under /opt/airflow
+CONFIG_PATH = os.environ.get("PIPELINE_DAG_CONFIG", DEFAULT_CONFIG_PATH)
+
+
+@lru_cache(maxsize=None)
+def load_config(path=CONFIG_PATH):
+    """
+    Parsed pipeline config; cached so every DAG file in a parsing process reads it once
+    """
+    with open(path) as f:
+        return yaml.safe_load(f)
+
+
+def _import_attribute(path):
+    module_name, _, attribute = path.rpartition(".")
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+def run_callable(callable_path, *args, **kwargs):
+    """
+    Import `callable_path` at execution time and call it with the keyword arguments it accepts
+    (PythonOperator hands the whole task context to callables taking **kwargs, as this one does)
+    """
+    function = _import_attribute(callable_path)
+    parameters = inspect.signature(function).parameters
+    if not any(p.kind is inspect.Parameter.VAR_KEYWORD for p in parameters.values()):
+        kwargs = {name: value for name, value in kwargs.items() if name in parameters}
+    return function(*args, **kwargs)
+
+
+def _default_args(defaults, overrides):
+    args = dict(defaults, **(overrides or {}))
+    start_date = args.get("start_date")
+    if start_date is not None and not isinstance(start_date, datetime):
+        args["start_date"] = datetime.combine(start_date, datetime.min.time())
+    if "retry_delay_minutes" in args:
+        args["retry_delay"] = timedelta(minutes=args.pop("retry_delay_minutes"))
+    return args
+
+
+def _bind_snowflake_task(task, warehouse):
+    sql = [task.sql] if isinstance(task.sql, str) else list(task.sql)
+    task.sql = [f"USE WAREHOUSE {warehouse};"] + sql
+
+
+def _bind_dbt_task(task, warehouse):
+    # Read by the projects' +snowflake_warehouse model config (dbt_project.yml)
+    task.env = dict(task.env or {}, DBT_SNOWFLAKE_WAREHOUSE=warehouse)
+
+
+SIZING_BINDERS = {"snowflake": _bind_snowflake_task, "dbt": _bind_dbt_task}
+
+
+def _sizing_callbacks(dag_id, task_id, task_type, sizing, config):
+    """
+    pre_execute / post_execute / cleanup that resize the task's warehouse (plugins/warehouse_sizing.py)
+    and run the task on it; without `warehouse:` the Snowflake connection's warehouse is resized
+    """
+    from warehouse_sizing import SizingHistory, WarehouseSizer, sizing_callbacks
+    if task_type not in SIZING_BINDERS:
+        raise ValueError(f"sizing is only supported on snowflake and dbt tasks, not {task_type!r} ({task_id})")
+    settings = dict(config.get("warehouse_sizing") or {}, **sizing)
+    conn_id = settings.pop("snowflake_conn_id", config["defaults"]["snowflake_conn_id"])
+    history_path = settings.pop("history_path", None)
+    data_volume_sql = settings.pop("data_volume_sql", None)
+    target_seconds = settings.pop("target_seconds", None)
+
+    def sizer_factory(context):
+        from airflow.providers.snowflake.hooks.snowflake import SnowflakeHook
+        hook = SnowflakeHook(snowflake_conn_id=conn_id)
+        warehouse = settings.get("warehouse")
+        if not warehouse:
+            extra = hook.get_connection(conn_id).extra_dejson
+            warehouse = extra.get("warehouse") or extra.get("extra__snowflake__warehouse")
+        if not warehouse:
+            raise ValueError(f"No warehouse to size for {task_id}: set sizing.warehouse or the {conn_id} warehouse")
+        return WarehouseSizer(lambda: hook.get_conn(), history=SizingHistory(history_path),
+                              run_id=context.get("run_id"), **dict(settings, warehouse=warehouse))
+
+    return sizing_callbacks(sizer_factory, f"{dag_id}.{task_id}", data_volume_sql, target_seconds,
+                            bind=SIZING_BINDERS[task_type])
+
+
+def _build_task(task_id, spec, config, dag_id=None):
+    """
+    Instantiate one operator; operator modules are imported per task type actually used
+    """
+    spec = dict(spec)
+    task_type = spec.pop("type")
+    spec.pop("upstream", None)
+    sizing = spec.pop("sizing", None)
+    if sizing:
+        pre_execute, post_execute, cleanup = _sizing_callbacks(dag_id, task_id, task_type, sizing, config)
+        spec.update(pre_execute=pre_execute, post_execute=post_execute,
+                    on_failure_callback=cleanup, on_retry_callback=cleanup)
+
+    if task_type == "python":
+        from airflow.operators.python_operator import PythonOperator
+        callable_path = spec.pop("callable")
+        python_callable = partial(run_callable, callable_path)
+        python_callable.__name__ = callable_path.rpartition(".")[2]
+        return PythonOperator(task_id=task_id, python_callable=python_callable, **spec)
+
+    if task_type == "snowflake":
+        from airflow.providers.snowflake.operators.snowflake import SnowflakeOperator
+        spec.setdefault("snowflake_conn_id", config["defaults"]["snowflake_conn_id"])
+        return SnowflakeOperator(task_id=task_id, **spec)
+
+    if task_type == "dbt":
+        from airflow.operators.bash_operator import BashOperator
+        project = config["dbt_projects"][spec.pop("project")]
+        return BashOperator(
+            task_id=task_id,
+            bash_command=f"cd {project['path']} && dbt {spec.pop('command')}",
+            env={
+                'DBT_PROFILES_DIR': project.get("profiles_dir", project["path"]),
+                'DBT_PROFILE': project["profile"]
+            },
+            **spec
+        )
+
+    if task_type == "bash":
+        from airflow.operators.bash_operator import BashOperator
+        return BashOperator(task_id=task_id, **spec)
+
+    if task_type == "trigger":
+        from airflow.operators.trigger_dagrun import TriggerDagRunOperator
+        spec.setdefault("wait_for_completion", True)
+        return TriggerDagRunOperator(task_id=task_id, **spec)
+
+    if task_type == "dummy":
+        from airflow.operators.dummy_operator import DummyOperator
+        return DummyOperator(task_id=task_id, **spec)
+
+    raise ValueError(f"Unknown task type {task_type!r} for task {task_id}")
+
+
+def build_dag(dag_id, config_path=CONFIG_PATH):
+    """
+    Build one DAG from its entry in the pipeline config
+    """
+    config = load_config(config_path)
+    spec = config["dags"][dag_id]
+    defaults = config["defaults"]
+    macros = {name: _import_attribute(path) for name, path in (spec.get("user_defined_macros") or {}).items()}
+
+    with DAG(
+        dag_id,
+        default_args=_default_args(defaults["default_args"], spec.get("default_args")),
+        description=spec.get("description"),
+        schedule_interval=spec.get("schedule_interval"),
+        catchup=spec.get("catchup", defaults.get("catchup", False)),
+        tags=spec.get("tags", []),
+        user_defined_macros=macros or None
+    ) as dag:
+        tasks = {task_id: _build_task(task_id, task_spec, config, dag_id)
+                 for task_id, task_spec in spec["tasks"].items()}
+
+        # Define task dependencies
+        for task_id, task_spec in spec["tasks"].items():
+            for upstream_id in task_spec.get("upstream", []):
+                tasks[upstream_id] >> tasks[task_id]
+
+    return dag
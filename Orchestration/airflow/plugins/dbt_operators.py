@@ -5,6 +5,7 @@ Purpose: Extend Airflow with dbt-specific functionality
 
 from airflow.models import BaseOperator
 from airflow.utils.decorators import apply_defaults
+from pipeline_tracing import tracer
 
 class DbtRunOperator(BaseOperator):
     """
@@ -33,25 +34,31 @@ class DbtRunOperator(BaseOperator):
         os.chdir(self.dbt_project_path)
         
         try:
-            # Set profiles directory if specified
-            env = os.environ.copy()
-            if self.profiles_dir:
-                env['DBT_PROFILES_DIR'] = self.profiles_dir
-            
-            # Execute dbt command
-            self.log.info(f"Executing dbt command: {self.dbt_command}")
-            result = subprocess.run(
-                self.dbt_command,
-                shell=True,
-                env=env,
-                capture_output=True,
-                text=True
-            )
-            
-            if result.returncode != 0:
-                raise Exception(f"dbt command failed: {result.stderr}")
+            with tracer.task_span(context):
+                # Set profiles directory if specified
+                env = os.environ.copy()
+                if self.profiles_dir:
+                    env['DBT_PROFILES_DIR'] = self.profiles_dir
+                
+                # Execute dbt command
+                self.log.info(f"Executing dbt command: {self.dbt_command}")
+                with tracer.span("dbt.invocation", command=self.dbt_command,
+                                 project_path=self.dbt_project_path) as span:
+                    result = subprocess.run(
+                        self.dbt_command,
+                        shell=True,
+                        env=env,
+                        capture_output=True,
+                        text=True
+                    )
+                    span.set_attribute("returncode", result.returncode)
+                tracer.increment("pipeline_dbt_invocations_total",
+                                 result="success" if result.returncode == 0 else "failed")
                 
-            self.log.info("dbt command executed successfully")
+                if result.returncode != 0:
+                    raise Exception(f"dbt command failed: {result.stderr}")
+                    
+                self.log.info("dbt command executed successfully")
             
         finally:
             os.chdir(original_dir)
@@ -0,0 +1,268 @@
+"""
+Change-Aware dbt Selection
+Purpose: Run and test only the dbt models whose inputs changed: bronze tables whose content fingerprint
+         moved since the last successful build, upstream-project models rebuilt since then, and models
+         whose own SQL changed, plus everything downstream of them in manifest.json lineage
+Usage: planner = DbtSelectionPlanner(load_manifest("target/manifest.json"), "silver_layer",
+                                     SelectionState("/opt/airflow/logs/dbt_selection/silver.json"))
+       plan = planner.plan(inputs=fingerprint_tables(connect, {}, "bronze", BRONZE_TABLES))
+       dbt run --select <plan["select"]>  ...  then planner.state.commit() once the tests passed
+Dependencies: dbt manifest.json (dbt parse); any DB-API connect() callable for fingerprints
+"""
+
+import hashlib
+import json
+import os
+from collections import deque
+from datetime import datetime, timedelta
+
+# Bronze tables read by the silver staging models (sources('bronze', ...))
+BRONZE_TABLES = ("crm_cust_info", "crm_prd_info", "crm_sales_details",
+                 "erp_cust_az12", "erp_loc_a101", "erp_px_cat_g1v2")
+# Load audit columns change on every reload without the data changing
+FINGERPRINT_EXCLUDE = ("dwh_loaded_at",)
+
+
+def fingerprint_tables(connect, snowflake_config, schema, tables, exclude_columns=FINGERPRINT_EXCLUDE):
+    """
+    {"<schema>.<table>": "<rows>:<hash>"} from one order-independent HASH_AGG scan per table; a full
+    TRUNCATE + COPY reload of identical files keeps the fingerprint
+    """
+    exclude = f" EXCLUDE ({', '.join(exclude_columns)})" if exclude_columns else ""
+    sql = "\nUNION ALL\n".join(
+        f"SELECT '{schema}.{table}', COUNT(*), HASH_AGG(*{exclude}) FROM {schema}.{table}" for table in tables)
+    conn = connect(**snowflake_config)
+    try:
+        cursor = conn.cursor()
+        cursor.execute(sql)
+        rows = cursor.fetchall()
+        cursor.close()
+    finally:
+        conn.close()
+    return {name.lower(): f"{count}:{digest}" for name, count, digest in rows}
+
+
+def load_manifest(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+class SelectionState:
+    """
+    JSON state of one dbt project: input fingerprints and model checksums of the last successful
+    build, the plan awaiting its tests, and recent builds (read by downstream projects)
+    """
+
+    def __init__(self, path=None, max_builds=50):
+        self.path = path
+        self.max_builds = max_builds
+        self.data = {"built": None, "pending": None, "builds": []}
+        if path and os.path.exists(path):
+            with open(path) as f:
+                self.data = json.load(f)
+
+    @property
+    def built(self):
+        return self.data["built"]
+
+    def builds_since(self, since):
+        return [build for build in self.data["builds"] if since is None or build["built_at"] > since]
+
+    def set_pending(self, plan):
+        self.data["pending"] = plan
+        self.save()
+
+    def commit(self, built_at=None):
+        """
+        Promote the pending plan once its models ran and their tests passed
+        """
+        plan = self.data["pending"]
+        if plan is None:
+            return None
+        built_at = (built_at or datetime.now()).isoformat()
+        previous = self.data["built"] or {}
+        self.data["built"] = {
+            "inputs": plan["inputs"],
+            "checksums": plan["checksums"],
+            # Upstream builds committed after the plan read them are picked up by the next plan
+            "planned_at": plan["created_at"],
+            "built_at": built_at,
+            "full_build_at": built_at if plan["mode"] == "full" else previous.get("full_build_at"),
+        }
+        self.data["builds"].append({"built_at": built_at, "mode": plan["mode"], "relations": plan["relations"]})
+        del self.data["builds"][:-self.max_builds]
+        self.data["pending"] = None
+        self.save()
+        return self.data["built"]
+
+    def save(self):
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        temporary = f"{self.path}.tmp"
+        with open(temporary, "w") as f:
+            json.dump(self.data, f, indent=2)
+        os.replace(temporary, self.path)
+
+
+class DbtSelectionPlanner:
+    """
+    Plans the affected subgraph of one dbt project from its manifest lineage
+
+    Changed inputs are matched against source nodes ("<source_name>.<table>") and upstream models
+    (their name or "<schema>.<alias>"). A full build runs without state, every full_build_days, and
+    when a project macro changed (macros are not part of model checksums)
+    """
+
+    def __init__(self, manifest, project_name, state, default_select=None, full_build_days=7):
+        self.manifest = manifest
+        self.project_name = project_name
+        self.state = state
+        self.default_select = default_select
+        self.full_build_days = full_build_days
+        self.nodes = dict(manifest.get("sources", {}), **manifest["nodes"])
+        self.child_map = manifest.get("child_map", {})
+        tag = default_select[4:] if default_select and default_select.startswith("tag:") else None
+        # Models this project builds (and that the default selector covers)
+        self.models = {
+            unique_id: node for unique_id, node in manifest["nodes"].items()
+            if node["resource_type"] == "model" and node["package_name"] == project_name
+            and (tag is None or tag in node.get("tags", []))
+        }
+
+    @staticmethod
+    def node_keys(node):
+        if node["resource_type"] == "source":
+            return {f"{node['source_name']}.{node['name']}".lower()}
+        relation = node.get("alias") or node["name"]
+        return {node["name"].lower(), f"{node['schema']}.{relation}".lower()}
+
+    def checksums(self):
+        checksums = {unique_id: node["checksum"]["checksum"] for unique_id, node in self.models.items()}
+        macros = sorted(self.manifest.get("macros", {}).items())
+        macro_sql = "".join(macro.get("macro_sql", "") for _, macro in macros if macro["package_name"] == self.project_name)
+        checksums["__macros__"] = hashlib.sha256(macro_sql.encode()).hexdigest()
+        return checksums
+
+    def _relations(self, model_ids):
+        return sorted(key for unique_id in model_ids for key in self.node_keys(self.models[unique_id]))
+
+    def _full_build_reason(self, built, checksums, now):
+        if built is None:
+            return "no previous build"
+        if built["checksums"].get("__macros__") != checksums["__macros__"]:
+            return "project macros changed"
+        last_full_build = built.get("full_build_at")
+        if self.full_build_days and (last_full_build is None or
+                                     now - datetime.fromisoformat(last_full_build) >= timedelta(days=self.full_build_days)):
+            return f"periodic full build ({self.full_build_days} days)"
+        return None
+
+    def plan(self, inputs=None, upstream_builds=(), now=None):
+        """
+        Plan dict: mode (full / incremental / skip), dbt selector, models, tests and the reasons
+        """
+        now = now or datetime.now()
+        inputs = inputs or {}
+        checksums = self.checksums()
+        built = self.state.built
+        plan = {
+            "project": self.project_name,
+            "inputs": inputs,
+            "checksums": checksums,
+            "created_at": now.isoformat(),
+        }
+
+        full_reason = self._full_build_reason(built, checksums, now)
+        if full_reason is None and any(build["mode"] == "full" for build in upstream_builds):
+            full_reason = "upstream project had a full build"
+        if full_reason:
+            print(f"dbt selection for {self.project_name}: full build ({full_reason})")
+            return dict(plan, mode="full", select=self.default_select or "*", reason=full_reason,
+                        models=sorted(node["name"] for node in self.models.values()), tests=[],
+                        relations=self._relations(self.models))
+
+        changed_inputs = sorted(key for key, fingerprint in inputs.items() if built["inputs"].get(key) != fingerprint)
+        changed_upstream = sorted({key for build in upstream_builds for key in build["relations"]})
+        changed_keys = set(changed_inputs) | set(changed_upstream)
+        modified = sorted(unique_id for unique_id in self.models
+                          if built["checksums"].get(unique_id) != checksums[unique_id])
+
+        roots = {unique_id for unique_id, node in self.nodes.items()
+                 if node["resource_type"] in ("source", "model", "seed", "snapshot")
+                 and unique_id not in self.models and self.node_keys(node) & changed_keys}
+        roots.update(modified)
+        affected, queue = set(roots), deque(roots)
+        while queue:
+            for child in self.child_map.get(queue.popleft(), []):
+                if child not in affected:
+                    affected.add(child)
+                    queue.append(child)
+
+        selected = sorted(unique_id for unique_id in affected if unique_id in self.models)
+        tests = sorted(self.nodes[unique_id]["name"] for unique_id in affected
+                       if self.nodes.get(unique_id, {}).get("resource_type") == "test"
+                       and self.nodes[unique_id]["package_name"] == self.project_name)
+        for unique_id in sorted(set(self.models) - set(selected)):
+            parents = [self._parent_label(parent) for parent in self.manifest.get("parent_map", {}).get(unique_id, [])]
+            print(f"dbt selection for {self.project_name}: skipping {self.models[unique_id]['name']} "
+                  f"(unchanged inputs: {', '.join(parents) or 'none'})")
+        for unique_id in selected:
+            print(f"dbt selection for {self.project_name}: running {self.models[unique_id]['name']}"
+                  f"{' (SQL changed)' if unique_id in modified else ''}")
+
+        names = [self.models[unique_id]["name"] for unique_id in selected]
+        return dict(
+            plan,
+            mode="incremental" if selected else "skip",
+            select=" ".join(names),
+            reason=(f"changed inputs: {', '.join(changed_inputs + changed_upstream) or 'none'}; "
+                    f"modified models: {len(modified)}"),
+            changed_inputs=changed_inputs,
+            changed_upstream=changed_upstream,
+            models=names,
+            tests=tests,
+            relations=self._relations(selected),
+        )
+
+    def _parent_label(self, unique_id):
+        node = self.nodes.get(unique_id)
+        if node is None:
+            return unique_id
+        return sorted(self.node_keys(node))[-1] if node["resource_type"] == "source" else node["name"]
+
+
+def plan_dbt_selection(project, project_name, manifest_path, state_dir, default_select, input_schema=None,
+                       upstream_project=None, snowflake_conn_id="snowflake_default", full_build_days=7, **context):
+    """
+    PythonOperator callable: plan the run, keep it pending until commit_dbt_selection and return it
+    (XCom) for the run/test commands; nothing affected skips the downstream dbt tasks
+    """
+    state = SelectionState(os.path.join(state_dir, f"{project}.json"))
+    planner = DbtSelectionPlanner(load_manifest(manifest_path), project_name, state, default_select, full_build_days)
+
+    inputs = None
+    if input_schema:
+        from airflow.providers.snowflake.hooks.snowflake import SnowflakeHook
+        hook = SnowflakeHook(snowflake_conn_id=snowflake_conn_id)
+        inputs = fingerprint_tables(lambda: hook.get_conn(), {}, input_schema, BRONZE_TABLES)
+    upstream_builds = []
+    if upstream_project:
+        since = state.built["planned_at"] if state.built else None
+        upstream_builds = SelectionState(os.path.join(state_dir, f"{upstream_project}.json")).builds_since(since)
+
+    plan = planner.plan(inputs, upstream_builds)
+    state.set_pending(plan)
+    if plan["mode"] == "skip":
+        from airflow.exceptions import AirflowSkipException
+        raise AirflowSkipException(f"No {project} model is affected ({plan['reason']})")
+    return {key: plan[key] for key in ("mode", "select", "reason", "models", "tests")}
+
+
+def commit_dbt_selection(project, state_dir, **context):
+    """
+    PythonOperator callable: record the planned build as done (run after the dbt tests)
+    """
+    built = SelectionState(os.path.join(state_dir, f"{project}.json")).commit()
+    print(f"dbt selection for {project}: committed build at {built['built_at'] if built else 'n/a'}")
+    return built is not None
@@ -0,0 +1,244 @@
+"""
+Cross-Layer Hash Reconciliation
+Purpose: Prove bronze, silver and gold agree without row-by-row joins: one aggregate scan per layer
+         computes a row count and an order-independent hash (SUM of row hashes) per key bucket, adjacent
+         layers are compared bucket by bucket, and only mismatching buckets are drilled into per key
+Usage: reconciler = LayerReconciler(hook.get_conn)   # or LocalWarehouse(...).connect
+       report = reconciler.reconcile()               # every chain in RECONCILIATION_CHAINS
+Dependencies: Snowflake HASH (DuckDB hash on the local backend); any DB-API connect() callable
+"""
+
+import json
+import os
+from datetime import datetime
+
+# Each chain lists its layers in load order. `columns` maps a canonical name to the layer's expression;
+# adjacent layers are compared on the canonical columns they share, so columns a layer legitimately
+# rewrites (e.g. silver repairs sales amounts, bronze stores dates as YYYYMMDD integers) are left out of
+# that pair. `key` is the canonical column used for bucketing and drill-down.
+RECONCILIATION_CHAINS = {
+    "sales": {
+        "key": "order_number",
+        "layers": [
+            {
+                "name": "bronze.crm_sales_details",
+                "from": "bronze.crm_sales_details",
+                "columns": {"order_number": "sls_ord_num", "product_number": "sls_prd_key",
+                            "customer_id": "sls_cust_id", "quantity": "sls_quantity"},
+            },
+            {
+                "name": "silver.crm_sales_details",
+                "from": "silver.crm_sales_details",
+                "columns": {"order_number": "sls_ord_num", "product_number": "sls_prd_key",
+                            "customer_id": "sls_cust_id", "quantity": "sls_quantity",
+                            "order_date": "sls_order_dt", "shipping_date": "sls_ship_dt", "due_date": "sls_due_dt",
+                            "sales_amount": "sls_sales", "price": "sls_price"},
+            },
+            {
+                "name": "gold.fct_sales",
+                "from": "gold.fct_sales",
+                "columns": {"order_number": "order_number", "quantity": "quantity",
+                            "order_date": "order_date", "shipping_date": "shipping_date", "due_date": "due_date",
+                            "sales_amount": "sales_amount", "price": "price"},
+            },
+        ],
+    },
+    "customers": {
+        "key": "customer_id",
+        "layers": [
+            {
+                # Silver keeps the latest row per non-null cst_id; compare bronze under the same rule
+                "name": "bronze.crm_cust_info",
+                "from": """(
+                    SELECT * FROM bronze.crm_cust_info
+                    WHERE cst_id IS NOT NULL
+                    QUALIFY ROW_NUMBER() OVER (PARTITION BY cst_id ORDER BY cst_create_date DESC) = 1
+                ) latest""",
+                "columns": {"customer_id": "cst_id", "customer_number": "cst_key",
+                            "first_name": "TRIM(cst_first_name)", "last_name": "TRIM(cst_last_name)",
+                            "create_date": "cst_create_date"},
+            },
+            {
+                "name": "silver.crm_cust_info",
+                "from": "silver.crm_cust_info",
+                "columns": {"customer_id": "cst_id", "customer_number": "cst_key",
+                            "first_name": "cst_firstname", "last_name": "cst_lastname",
+                            "create_date": "cst_create_date", "marital_status": "cst_marital_status"},
+            },
+            {
+                "name": "gold.dim_customers",
+                "from": "gold.dim_customers",
+                "columns": {"customer_id": "customer_id", "customer_number": "customer_number",
+                            "first_name": "first_name", "last_name": "last_name",
+                            "create_date": "create_date", "marital_status": "marital_status"},
+            },
+        ],
+    },
+}
+
+
+def _row_hash(expressions):
+    # VARCHAR casts make the hash independent of the (compatible) column types each layer uses
+    return f"HASH({', '.join(f'CAST({expression} AS VARCHAR)' for expression in expressions)})"
+
+
+def _bucket(key_expression, buckets):
+    return f"MOD(ABS(HASH(CAST({key_expression} AS VARCHAR))), {int(buckets)})"
+
+
+class LayerReconciler:
+    """
+    Compares adjacent layers of each chain per key bucket and drills into mismatching buckets only
+    """
+
+    def __init__(self, connect, snowflake_config=None, chains=None, buckets=64,
+                 max_drill_partitions=10, max_keys=50):
+        self.connect = connect
+        self.snowflake_config = snowflake_config or {}
+        self.chains = chains or RECONCILIATION_CHAINS
+        self.buckets = buckets
+        self.max_drill_partitions = max_drill_partitions
+        self.max_keys = max_keys
+        self.query_count = 0
+
+    def _fetchall(self, cursor, sql):
+        cursor.execute(sql)
+        self.query_count += 1
+        return cursor.fetchall()
+
+    @staticmethod
+    def _pairs(chain):
+        layers = chain["layers"]
+        for source, target in zip(layers, layers[1:]):
+            shared = [name for name in source["columns"] if name in target["columns"]]
+            if chain["key"] not in shared:
+                raise ValueError(f"{source['name']} -> {target['name']} do not share key {chain['key']!r}")
+            yield source, target, shared
+
+    def _scan_layer(self, cursor, layer, key, column_sets):
+        """
+        One aggregate scan: per bucket, the row count and one hash sum per compared column set
+        """
+        hashes = ", ".join(
+            f"SUM({_row_hash(layer['columns'][name] for name in columns)})" for columns in column_sets)
+        rows = self._fetchall(cursor, f"""
+            SELECT {_bucket(layer['columns'][key], self.buckets)} AS bucket, COUNT(*), {hashes}
+            FROM {layer['from']}
+            GROUP BY 1
+        """)
+        return {row[0]: (row[1], tuple(row[2:])) for row in rows}
+
+    def _drill_down(self, cursor, layer, key, columns, buckets):
+        """
+        Per-key row count and hash inside the given buckets
+        """
+        key_expression = layer["columns"][key]
+        rows = self._fetchall(cursor, f"""
+            SELECT CAST({key_expression} AS VARCHAR), COUNT(*),
+                   SUM({_row_hash(layer['columns'][name] for name in columns)})
+            FROM {layer['from']}
+            WHERE {_bucket(key_expression, self.buckets)} IN ({', '.join(str(int(b)) for b in buckets)})
+            GROUP BY 1
+        """)
+        return {row[0]: (row[1], row[2]) for row in rows}
+
+    def reconcile_chain(self, cursor, chain):
+        key = chain["key"]
+        pairs = list(self._pairs(chain))
+        # Column sets each layer must hash: one per adjacent layer it is compared with
+        column_sets = {layer["name"]: [] for layer in chain["layers"]}
+        for source, target, shared in pairs:
+            for layer in (source, target):
+                if shared not in column_sets[layer["name"]]:
+                    column_sets[layer["name"]].append(shared)
+
+        scans = {layer["name"]: self._scan_layer(cursor, layer, key, column_sets[layer["name"]])
+                 for layer in chain["layers"]}
+
+        comparisons = []
+        for source, target, shared in pairs:
+            source_index = column_sets[source["name"]].index(shared)
+            target_index = column_sets[target["name"]].index(shared)
+            source_scan, target_scan = scans[source["name"]], scans[target["name"]]
+            mismatched = sorted(
+                bucket for bucket in set(source_scan) | set(target_scan)
+                if (source_scan.get(bucket, (0, ()))[0] != target_scan.get(bucket, (0, ()))[0] or
+                    (source_scan[bucket][1][source_index] if bucket in source_scan else None) !=
+                    (target_scan[bucket][1][target_index] if bucket in target_scan else None)))
+
+            comparison = {
+                "source": source["name"],
+                "target": target["name"],
+                "columns": shared,
+                "source_rows": sum(count for count, _ in source_scan.values()),
+                "target_rows": sum(count for count, _ in target_scan.values()),
+                "partitions_compared": len(set(source_scan) | set(target_scan)),
+                "mismatched_partitions": mismatched,
+                "status": "reconciled" if not mismatched else "mismatch",
+            }
+            if mismatched:
+                drilled = mismatched[:self.max_drill_partitions]
+                source_keys = self._drill_down(cursor, source, key, shared, drilled)
+                target_keys = self._drill_down(cursor, target, key, shared, drilled)
+                missing = sorted(set(source_keys) - set(target_keys))
+                unexpected = sorted(set(target_keys) - set(source_keys))
+                changed = sorted(k for k in set(source_keys) & set(target_keys) if source_keys[k] != target_keys[k])
+                comparison["drill_down"] = {
+                    "partitions": drilled,
+                    "missing_in_target": missing[:self.max_keys],
+                    "unexpected_in_target": unexpected[:self.max_keys],
+                    "changed": changed[:self.max_keys],
+                    "mismatched_keys": len(missing) + len(unexpected) + len(changed),
+                }
+            comparisons.append(comparison)
+
+        return {
+            "status": "reconciled" if all(c["status"] == "reconciled" for c in comparisons) else "mismatch",
+            "key": key,
+            "comparisons": comparisons,
+        }
+
+    def reconcile(self, chain_names=None):
+        """
+        Reconcile the named chains (default: all) and return the consolidated report
+        """
+        self.query_count = 0
+        conn = self.connect(**self.snowflake_config)
+        try:
+            cursor = conn.cursor()
+            chains = {name: self.reconcile_chain(cursor, self.chains[name])
+                      for name in (chain_names or self.chains)}
+            cursor.close()
+        finally:
+            conn.close()
+
+        return {
+            "status": "reconciled" if all(c["status"] == "reconciled" for c in chains.values()) else "mismatch",
+            "buckets": self.buckets,
+            "chains": chains,
+            "query_count": self.query_count,
+            "timestamp": datetime.now().isoformat(),
+        }
+
+
+def reconcile_layers(snowflake_conn_id="snowflake_default", chain_names=None, buckets=64, report_dir=None,
+                     fail_on_mismatch=True):
+    """
+    PythonOperator callable: reconcile the layer chains and fail the task on a mismatch
+    """
+    from airflow.providers.snowflake.hooks.snowflake import SnowflakeHook
+    hook = SnowflakeHook(snowflake_conn_id=snowflake_conn_id)
+    report = LayerReconciler(lambda: hook.get_conn(), buckets=buckets).reconcile(chain_names)
+    if report_dir:
+        os.makedirs(report_dir, exist_ok=True)
+        path = os.path.join(report_dir, f"reconciliation_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2, default=str)
+    for chain_name, chain in report["chains"].items():
+        for comparison in chain["comparisons"]:
+            print(f"{chain_name}: {comparison['source']} -> {comparison['target']} {comparison['status']} "
+                  f"({comparison['source_rows']} / {comparison['target_rows']} rows, "
+                  f"{len(comparison['mismatched_partitions'])} mismatched partitions)")
+    if fail_on_mismatch and report["status"] != "reconciled":
+        raise ValueError("Layer reconciliation found mismatching partitions")
+    return {name: chain["status"] for name, chain in report["chains"].items()}
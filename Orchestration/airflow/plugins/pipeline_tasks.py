@@ -0,0 +1,21 @@
+"""
+Pipeline Task Callables
+Purpose: Python callables referenced by dags/config/pipelines.yaml ("pipeline_tasks.<function>");
+         the DAG factory imports this module only when a task runs, never while parsing DAGs
+"""
+
+
+def validate_s3_availability(bucket, prefixes):
+    """
+    Validate that required S3 files are available before processing
+    """
+    # Implementation would check S3 for required files
+    print(f"Validating S3 files in bucket: {bucket}, prefixes: {prefixes}")
+    return True
+
+
+def log_bronze_completion():
+    """
+    Log successful bronze layer pipeline execution
+    """
+    print("Bronze layer pipeline completed successfully")
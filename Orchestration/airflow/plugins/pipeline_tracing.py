@@ -0,0 +1,482 @@
+"""
+Pipeline Tracing and Metrics
+Purpose: Lightweight spans, counters and latency histograms shared by the Airflow operators and the
+         monitoring scripts, exported as OTLP/JSON lines and a Prometheus textfile
+Usage: export PIPELINE_TRACING_ENABLED=1
+       export PIPELINE_TRACE_FILE=/opt/airflow/logs/traces/spans.jsonl
+       export PIPELINE_METRICS_TEXTFILE=/var/lib/node_exporter/textfile/pipeline_{job}.prom
+
+       from pipeline_tracing import tracer
+       with tracer.task_span(context):                      # trace id = DAG run id
+           with tracer.span("dbt.invocation", command=cmd):
+               ...
+       connect = instrument_connect(snowflake.connector.connect)   # every query becomes a span
+Dependencies: None (standard library only); disabled unless PIPELINE_TRACING_ENABLED is set
+"""
+
+import atexit
+import contextvars
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from functools import wraps
+
+# Prometheus client default buckets, extended for long-running loads and dbt runs
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300, 900, 1800)
+
+SPAN_DURATION_METRIC = "pipeline_span_duration_seconds"
+SPAN_TOTAL_METRIC = "pipeline_spans_total"
+SPAN_ERROR_METRIC = "pipeline_span_errors_total"
+
+# Statements are truncated in span attributes to keep trace files small
+MAX_STATEMENT_LENGTH = 1000
+
+_TRUE_VALUES = ("1", "true", "yes", "on")
+_current_span = contextvars.ContextVar("pipeline_current_span", default=None)
+_current_trace = contextvars.ContextVar("pipeline_current_trace", default=None)
+
+
+def trace_id_for_run(run_id):
+    """
+    OTLP trace ids are 16 bytes; derive one deterministically from the DAG run id
+    """
+    return hashlib.sha256(str(run_id).encode()).hexdigest()[:32]
+
+
+class _NoopSpan:
+    """
+    Returned while tracing is disabled; every operation is a no-op
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set_attribute(self, key, value):
+        pass
+
+    def set_attributes(self, **attributes):
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Span:
+    """
+    A timed unit of work; nests under the span active in the current context
+    """
+
+    def __init__(self, tracer, name, attributes):
+        self.tracer = tracer
+        self.name = name
+        self.attributes = dict(attributes)
+        self.trace_id = None
+        self.span_id = os.urandom(8).hex()
+        self.parent_span_id = None
+        self.status = "OK"
+        self.error = None
+        self.start_ns = None
+        self.end_ns = None
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def set_attributes(self, **attributes):
+        self.attributes.update(attributes)
+
+    def __enter__(self):
+        parent = _current_span.get()
+        self.parent_span_id = parent.span_id if parent else None
+        self.trace_id = parent.trace_id if parent else (_current_trace.get() or self.tracer.default_trace_id)
+        self._token = _current_span.set(self)
+        self.start_ns = time.time_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.end_ns = time.time_ns()
+        _current_span.reset(self._token)
+        if exc_type is not None:
+            self.status = "ERROR"
+            self.error = f"{exc_type.__name__}: {exc}"
+        self.tracer._finish(self)
+        return False
+
+    @property
+    def duration_seconds(self):
+        return (self.end_ns - self.start_ns) / 1e9
+
+
+class _TaskSpan(Span):
+    """
+    Root span of an Airflow task; exports everything recorded once the task finishes
+    """
+
+    def __exit__(self, exc_type, exc, tb):
+        super().__exit__(exc_type, exc, tb)
+        self.tracer.flush()
+        return False
+
+
+class Tracer:
+    """
+    Records spans and metrics in-process and hands them to the configured exporters on flush
+    """
+
+    def __init__(self, enabled=False, exporters=None, service_name="snowflake-data-warehouse",
+                 buckets=DEFAULT_BUCKETS, max_buffered_spans=512):
+        self.enabled = enabled
+        self.exporters = exporters or []
+        self.service_name = service_name
+        self.buckets = tuple(buckets)
+        self.max_buffered_spans = max_buffered_spans
+        self.default_trace_id = trace_id_for_run(os.environ.get("AIRFLOW_CTX_DAG_RUN_ID") or uuid.uuid4())
+        self.resource = {"service.name": service_name}
+        self._spans = []
+        self._counters = {}
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls):
+        """
+        PIPELINE_TRACING_ENABLED switches the layer on; each path variable adds its exporter
+        """
+        enabled = os.environ.get("PIPELINE_TRACING_ENABLED", "").lower() in _TRUE_VALUES
+        exporters = []
+        if enabled and os.environ.get("PIPELINE_TRACE_FILE"):
+            exporters.append(OTLPFileExporter(os.environ["PIPELINE_TRACE_FILE"]))
+        if enabled and os.environ.get("PIPELINE_METRICS_TEXTFILE"):
+            exporters.append(PrometheusTextfileExporter(os.environ["PIPELINE_METRICS_TEXTFILE"]))
+        return cls(enabled=enabled, exporters=exporters,
+                   service_name=os.environ.get("PIPELINE_SERVICE_NAME", "snowflake-data-warehouse"))
+
+    # ------------------------------------------------------------------ #
+    # Spans
+    # ------------------------------------------------------------------ #
+    def span(self, name, **attributes):
+        if not self.enabled:
+            return _NOOP_SPAN
+        return Span(self, name, attributes)
+
+    def task_span(self, context, name="airflow.task"):
+        """
+        Root span for an Airflow task; all spans inside share the DAG run's trace id
+        """
+        if not self.enabled:
+            return _NOOP_SPAN
+        task_instance = context.get("task_instance") or context.get("ti")
+        dag_id = getattr(context.get("dag"), "dag_id", None) or getattr(task_instance, "dag_id", None)
+        task_id = getattr(task_instance, "task_id", None)
+        run_id = context.get("run_id") or os.environ.get("AIRFLOW_CTX_DAG_RUN_ID")
+        self.resource.update({"airflow.dag_id": dag_id, "airflow.dag_run_id": run_id})
+        self.resource["job"] = f"{dag_id}.{task_id}"
+        _current_trace.set(trace_id_for_run(run_id))
+        return _TaskSpan(self, name, {"dag_id": dag_id, "task_id": task_id, "run_id": run_id,
+                                      "try_number": getattr(task_instance, "try_number", None)})
+
+    def traced(self, name=None, **attributes):
+        """
+        Decorator form of span()
+        """
+        def decorator(function):
+            span_name = name or function.__qualname__
+
+            @wraps(function)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return function(*args, **kwargs)
+                with self.span(span_name, **attributes):
+                    return function(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def _finish(self, span):
+        labels = {"span": span.name}
+        self.observe(SPAN_DURATION_METRIC, span.duration_seconds, **labels)
+        self.increment(SPAN_TOTAL_METRIC, **labels)
+        if span.status == "ERROR":
+            self.increment(SPAN_ERROR_METRIC, **labels)
+        with self._lock:
+            self._spans.append(span)
+            flush_spans = len(self._spans) >= self.max_buffered_spans
+        if flush_spans:
+            self.flush(metrics=False)
+
+    # ------------------------------------------------------------------ #
+    # Metrics
+    # ------------------------------------------------------------------ #
+    def increment(self, name, value=1, **labels):
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        """
+        Add one observation to a latency histogram (seconds)
+        """
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = {"buckets": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            for position, bound in enumerate(self.buckets):
+                if value <= bound:
+                    histogram["buckets"][position] += 1
+                    break
+            histogram["sum"] += value
+            histogram["count"] += 1
+
+    # ------------------------------------------------------------------ #
+    # Export
+    # ------------------------------------------------------------------ #
+    def flush(self, metrics=True):
+        """
+        Export buffered spans (and a metrics snapshot) to every exporter
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            spans, self._spans = self._spans, []
+            counters = dict(self._counters)
+            histograms = {key: {"buckets": list(h["buckets"]), "sum": h["sum"], "count": h["count"]}
+                          for key, h in self._histograms.items()}
+        for exporter in self.exporters:
+            try:
+                if spans:
+                    exporter.export_spans(self, spans)
+                if metrics:
+                    exporter.export_metrics(self, counters, histograms)
+            except OSError as e:
+                # Instrumentation must never fail the pipeline
+                print(f"Tracing export failed ({type(exporter).__name__}): {e}")
+
+
+class OTLPFileExporter:
+    """
+    Appends spans as OTLP/JSON ExportTraceServiceRequest lines (one request per flush), the
+    format read by the OpenTelemetry Collector's otlpjsonfile receiver
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    @staticmethod
+    def _attributes(attributes):
+        encoded = []
+        for key, value in attributes.items():
+            if value is None:
+                continue
+            if isinstance(value, bool):
+                encoded.append({"key": key, "value": {"boolValue": value}})
+            elif isinstance(value, int):
+                encoded.append({"key": key, "value": {"intValue": str(value)}})
+            elif isinstance(value, float):
+                encoded.append({"key": key, "value": {"doubleValue": value}})
+            else:
+                encoded.append({"key": key, "value": {"stringValue": str(value)}})
+        return encoded
+
+    def export_spans(self, tracer, spans):
+        otlp_spans = []
+        for span in spans:
+            otlp_span = {
+                "traceId": span.trace_id,
+                "spanId": span.span_id,
+                "name": span.name,
+                "kind": 1,
+                "startTimeUnixNano": str(span.start_ns),
+                "endTimeUnixNano": str(span.end_ns),
+                "attributes": self._attributes(span.attributes),
+                "status": {"code": 2, "message": span.error} if span.status == "ERROR" else {"code": 1},
+            }
+            if span.parent_span_id:
+                otlp_span["parentSpanId"] = span.parent_span_id
+            otlp_spans.append(otlp_span)
+
+        request = {"resourceSpans": [{
+            "resource": {"attributes": self._attributes(tracer.resource)},
+            "scopeSpans": [{"scope": {"name": "pipeline_tracing"}, "spans": otlp_spans}],
+        }]}
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.path, "a") as f:
+            f.write(json.dumps(request) + "\n")
+
+    def export_metrics(self, tracer, counters, histograms):
+        pass
+
+
+class PrometheusTextfileExporter:
+    """
+    Writes a snapshot of all metrics in Prometheus text format for node_exporter's textfile
+    collector; `{job}` in the path is replaced by the task (dag_id.task_id) so concurrent tasks
+    don't overwrite each other. The file is replaced atomically
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    @staticmethod
+    def _labels(labels, extra=()):
+        pairs = list(labels) + list(extra)
+        if not pairs:
+            return ""
+        escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+        return "{" + ",".join(f'{key}="{value}"' for (key, _), value in zip(pairs, escaped)) + "}"
+
+    def export_spans(self, tracer, spans):
+        pass
+
+    def export_metrics(self, tracer, counters, histograms):
+        job = re.sub(r"[^\w.-]", "_", str(tracer.resource.get("job", tracer.service_name)))
+        path = self.path.format(job=job)
+        lines = []
+        for name in sorted({key[0] for key in counters}):
+            lines.append(f"# TYPE {name} counter")
+            for (metric, labels), value in sorted(counters.items()):
+                if metric == name:
+                    lines.append(f"{name}{self._labels(labels)} {value}")
+        for name in sorted({key[0] for key in histograms}):
+            lines.append(f"# TYPE {name} histogram")
+            for (metric, labels), histogram in sorted(histograms.items()):
+                if metric != name:
+                    continue
+                cumulative = 0
+                for bound, count in zip(tracer.buckets, histogram["buckets"]):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{self._labels(labels, [('le', bound)])} {cumulative}")
+                lines.append(f"{name}_bucket{self._labels(labels, [('le', '+Inf')])} {histogram['count']}")
+                lines.append(f"{name}_sum{self._labels(labels)} {histogram['sum']:.6f}")
+                lines.append(f"{name}_count{self._labels(labels)} {histogram['count']}")
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(temp_path, path)
+
+
+# ---------------------------------------------------------------------- #
+# Automatic instrumentation
+# ---------------------------------------------------------------------- #
+def _statement(sql):
+    sql = " ".join(str(sql).split())
+    return sql if len(sql) <= MAX_STATEMENT_LENGTH else sql[:MAX_STATEMENT_LENGTH] + "..."
+
+
+class _TracedCursor:
+    """
+    DB-API cursor proxy: each execute() is a `snowflake.query` span
+    """
+
+    def __init__(self, cursor, tracer):
+        self._cursor = cursor
+        self._tracer = tracer
+
+    def execute(self, sql, *args, **kwargs):
+        with self._tracer.span("snowflake.query", **{"db.system": "snowflake", "db.statement": _statement(sql)}) as span:
+            result = self._cursor.execute(sql, *args, **kwargs)
+            span.set_attributes(**{"db.query_id": getattr(self._cursor, "sfqid", None),
+                                   "db.rowcount": getattr(self._cursor, "rowcount", None)})
+        self._tracer.increment("pipeline_queries_total", system="snowflake")
+        return self if result is self._cursor else result
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __enter__(self):
+        self._cursor.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        return self._cursor.__exit__(*exc)
+
+
+class _TracedConnection:
+    """
+    DB-API connection proxy handing out traced cursors
+    """
+
+    def __init__(self, connection, tracer):
+        self._connection = connection
+        self._tracer = tracer
+
+    def cursor(self, *args, **kwargs):
+        return _TracedCursor(self._connection.cursor(*args, **kwargs), self._tracer)
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+    def __enter__(self):
+        self._connection.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        return self._connection.__exit__(*exc)
+
+
+def instrument_connect(connect, tracer=None):
+    """
+    Wrap a DB-API connect(**config) callable so connections and queries are traced;
+    returns `connect` unchanged while tracing is disabled
+    """
+    tracer = tracer or globals()["tracer"]
+    if not tracer.enabled:
+        return connect
+
+    @wraps(connect)
+    def traced_connect(*args, **kwargs):
+        with tracer.span("snowflake.connect", **{"db.system": "snowflake"}):
+            return _TracedConnection(connect(*args, **kwargs), tracer)
+    return traced_connect
+
+
+class _TracedHook:
+    """
+    Proxy for SnowflakeHook / LocalHook: query methods become `snowflake.query` spans
+    """
+
+    _QUERY_METHODS = ("get_first", "get_records", "get_pandas_df", "run")
+
+    def __init__(self, hook, tracer):
+        self._hook = hook
+        self._tracer = tracer
+
+    def __getattr__(self, name):
+        attribute = getattr(self._hook, name)
+        if name not in self._QUERY_METHODS:
+            return attribute
+
+        @wraps(attribute)
+        def traced(sql, *args, **kwargs):
+            with self._tracer.span("snowflake.query", **{"db.system": "snowflake", "db.statement": _statement(sql),
+                                                        "hook.method": name}):
+                result = attribute(sql, *args, **kwargs)
+            self._tracer.increment("pipeline_queries_total", system="snowflake")
+            return result
+        return traced
+
+
+def instrument_hook(hook, tracer=None):
+    """
+    Wrap an Airflow DB hook so its query methods are traced; returns `hook` unchanged while disabled
+    """
+    tracer = tracer or globals()["tracer"]
+    return _TracedHook(hook, tracer) if tracer.enabled else hook
+
+
+tracer = Tracer.from_env()
+atexit.register(tracer.flush)
@@ -0,0 +1,237 @@
+"""
+Per-Query Cost and Performance Profiling
+Purpose: Tag every pipeline query with DAG/task metadata (session QUERY_TAG) and, after a task,
+         pull the matching QUERY_HISTORY rows in one query into a per-run profile report that
+         flags full-table scans, spilling and queueing
+Usage: tag = query_tag_from_context(context, component="data_quality")
+       hook = SnowflakeHook(snowflake_conn_id="snowflake_default", session_parameters={"QUERY_TAG": tag})
+       ...
+       profile = QueryProfiler(SnowflakeQueryHistory(hook.get_conn)).profile(tag, datetime.now(timezone.utc))
+Dependencies: Snowflake INFORMATION_SCHEMA.QUERY_HISTORY; StaticQueryHistory stands in for tests and
+              the local backend (LocalWarehouse.query_history)
+"""
+
+import json
+import os
+from datetime import datetime, timedelta, timezone
+
+# Snowflake limits QUERY_TAG to 2000 characters
+MAX_QUERY_TAG_LENGTH = 2000
+
+# Columns read from QUERY_HISTORY; missing ones (e.g. in stubbed sources) default to 0
+HISTORY_COLUMNS = (
+    "query_id", "query_text", "query_tag", "warehouse_name", "warehouse_size", "execution_status",
+    "start_time", "end_time", "total_elapsed_time", "compilation_time", "execution_time",
+    "queued_provisioning_time", "queued_repair_time", "queued_overload_time", "bytes_scanned",
+    "rows_produced", "partitions_scanned", "partitions_total", "bytes_spilled_to_local_storage",
+    "bytes_spilled_to_remote_storage",
+)
+_TEXT_COLUMNS = {"query_id", "query_text", "query_tag", "warehouse_name", "warehouse_size", "execution_status",
+                 "start_time", "end_time"}
+
+DEFAULT_THRESHOLDS = {
+    # A query reading at least this share of a table's micro-partitions is a full scan...
+    "full_scan_ratio": 0.9,
+    # ...unless the table is too small for pruning to matter
+    "full_scan_min_partitions": 10,
+    "queued_ms": 10000,
+    "slow_query_ms": 60000,
+}
+
+
+def build_query_tag(dag_id=None, task_id=None, run_id=None, component=None):
+    """
+    JSON query tag; Snowflake stores it verbatim so QUERY_HISTORY can be filtered and grouped by it.
+    Retries of a task share its tag, so a profile covers every attempt
+    """
+    tag = {"app": "snowflake-data-warehouse", "component": component, "dag_id": dag_id,
+           "task_id": task_id, "run_id": run_id}
+    encoded = json.dumps({key: value for key, value in tag.items() if value is not None}, separators=(",", ":"))
+    return encoded[:MAX_QUERY_TAG_LENGTH]
+
+
+def query_tag_from_context(context, component=None):
+    task_instance = context.get("task_instance") or context.get("ti")
+    return build_query_tag(
+        dag_id=getattr(context.get("dag"), "dag_id", None) or getattr(task_instance, "dag_id", None),
+        task_id=getattr(task_instance, "task_id", None),
+        run_id=context.get("run_id"),
+        component=component,
+    )
+
+
+def query_tag_from_env(component=None):
+    """
+    Query tag for scripts run inside an Airflow task (PythonOperator / BashOperator export AIRFLOW_CTX_*)
+    """
+    return build_query_tag(
+        dag_id=os.environ.get("AIRFLOW_CTX_DAG_ID"),
+        task_id=os.environ.get("AIRFLOW_CTX_TASK_ID"),
+        run_id=os.environ.get("AIRFLOW_CTX_DAG_RUN_ID"),
+        component=component,
+    )
+
+
+def with_query_tag(snowflake_config, query_tag):
+    """
+    Copy of a snowflake.connector.connect config with QUERY_TAG added to its session parameters
+    """
+    config = dict(snowflake_config)
+    config["session_parameters"] = dict(config.get("session_parameters") or {}, QUERY_TAG=query_tag)
+    return config
+
+
+def _normalize(row):
+    row = {key.lower(): value for key, value in row.items()}
+    return {column: row.get(column) if column in _TEXT_COLUMNS else (row.get(column) or 0)
+            for column in HISTORY_COLUMNS}
+
+
+class SnowflakeQueryHistory:
+    """
+    Reads INFORMATION_SCHEMA.QUERY_HISTORY (no ACCOUNT_USAGE latency) for one query tag in a single query
+    """
+
+    def __init__(self, connect, snowflake_config=None, result_limit=10000):
+        self.connect = connect
+        self.snowflake_config = snowflake_config or {}
+        self.result_limit = result_limit
+
+    def fetch(self, query_tag, start_time):
+        conn = self.connect(**self.snowflake_config)
+        try:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                SELECT {', '.join(HISTORY_COLUMNS)}
+                FROM TABLE(INFORMATION_SCHEMA.QUERY_HISTORY(
+                    END_TIME_RANGE_START => %(start_time)s::TIMESTAMP_LTZ,
+                    RESULT_LIMIT => {int(self.result_limit)}))
+                WHERE query_tag = %(query_tag)s
+                ORDER BY start_time
+            """, {"start_time": start_time.isoformat(), "query_tag": query_tag})
+            columns = [column[0] for column in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+        finally:
+            conn.close()
+
+
+class StaticQueryHistory:
+    """
+    In-memory history source: a list of QUERY_HISTORY-like dicts, e.g. LocalWarehouse.query_history
+    or fixtures in tests
+    """
+
+    def __init__(self, records):
+        self.records = records
+
+    def fetch(self, query_tag, start_time):
+        records = ({key.lower(): value for key, value in record.items()} for record in list(self.records))
+        return [record for record in records if record.get("query_tag") == query_tag]
+
+
+class QueryProfiler:
+    """
+    Builds the per-run profile report from a history source
+    """
+
+    def __init__(self, history_source, thresholds=None):
+        self.history_source = history_source
+        self.thresholds = dict(DEFAULT_THRESHOLDS, **(thresholds or {}))
+
+    def _flags(self, query):
+        flags = []
+        total = query["partitions_total"]
+        if total >= self.thresholds["full_scan_min_partitions"] and \
+                query["partitions_scanned"] >= self.thresholds["full_scan_ratio"] * total:
+            flags.append("full_table_scan")
+        if query["bytes_spilled_to_remote_storage"]:
+            flags.append("remote_spill")
+        elif query["bytes_spilled_to_local_storage"]:
+            flags.append("local_spill")
+        if query["queued_ms"] >= self.thresholds["queued_ms"]:
+            flags.append("queued")
+        if query["total_elapsed_time"] >= self.thresholds["slow_query_ms"]:
+            flags.append("slow")
+        if query["execution_status"] not in (None, "SUCCESS"):
+            flags.append("failed")
+        return flags
+
+    def profile(self, query_tag, start_time=None):
+        """
+        Fetch every query carrying `query_tag` since `start_time` (timezone-aware) and summarize them
+        """
+        start_time = start_time or datetime.now(timezone.utc) - timedelta(days=1)
+        queries = []
+        for row in self.history_source.fetch(query_tag, start_time):
+            query = _normalize(row)
+            query["queued_ms"] = (query["queued_provisioning_time"] + query["queued_repair_time"] +
+                                  query["queued_overload_time"])
+            query["partition_scan_ratio"] = (round(query["partitions_scanned"] / query["partitions_total"], 4)
+                                             if query["partitions_total"] else None)
+            for column in ("start_time", "end_time"):
+                if isinstance(query[column], datetime):
+                    query[column] = query[column].isoformat()
+            query["flags"] = self._flags(query)
+            queries.append(query)
+
+        queries.sort(key=lambda q: q["total_elapsed_time"], reverse=True)
+        flagged = [{"query_id": q["query_id"], "flags": q["flags"], "total_elapsed_time": q["total_elapsed_time"],
+                    "query_text": (q["query_text"] or "")[:200]} for q in queries if q["flags"]]
+        return {
+            "status": "warning" if flagged else "ok",
+            "query_tag": query_tag,
+            "summary": {
+                "query_count": len(queries),
+                "failed_queries": sum(1 for q in queries if "failed" in q["flags"]),
+                "total_elapsed_ms": sum(q["total_elapsed_time"] for q in queries),
+                "execution_ms": sum(q["execution_time"] for q in queries),
+                "queued_ms": sum(q["queued_ms"] for q in queries),
+                "bytes_scanned": sum(q["bytes_scanned"] for q in queries),
+                "partitions_scanned": sum(q["partitions_scanned"] for q in queries),
+                "partitions_total": sum(q["partitions_total"] for q in queries),
+                "bytes_spilled_local": sum(q["bytes_spilled_to_local_storage"] for q in queries),
+                "bytes_spilled_remote": sum(q["bytes_spilled_to_remote_storage"] for q in queries),
+                "full_table_scans": sum(1 for q in queries if "full_table_scan" in q["flags"]),
+                "spilling_queries": sum(1 for q in queries if {"local_spill", "remote_spill"} & set(q["flags"])),
+            },
+            "flagged": flagged,
+            "queries": queries,
+            "thresholds": self.thresholds,
+            "timestamp": datetime.now().isoformat(),
+        }
+
+    @staticmethod
+    def save(report, profile_dir):
+        """
+        Write the report to <profile_dir>/<dag_id>/<run_id>/<task_id>.json (tag fields, sanitized)
+        """
+        try:
+            tag = json.loads(report["query_tag"])
+        except ValueError:
+            tag = {}
+        parts = [tag.get("dag_id", "adhoc"), tag.get("run_id", "manual"),
+                 f"{tag.get('task_id') or tag.get('component', 'queries')}.json"]
+        path = os.path.join(profile_dir, *("".join(c if c.isalnum() or c in "._-" else "_" for c in str(p))
+                                           for p in parts))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2, default=str)
+        return path
+
+
+def profile_task_queries(dag_id, task_id, run_id, component=None, history_source=None,
+                         snowflake_conn_id="snowflake_default", profile_dir=None, start_time=None):
+    """
+    PythonOperator callable: profile the queries of an upstream task that ran with build_query_tag(...)
+    """
+    if history_source is None:
+        from airflow.providers.snowflake.hooks.snowflake import SnowflakeHook
+        hook = SnowflakeHook(snowflake_conn_id=snowflake_conn_id)
+        history_source = SnowflakeQueryHistory(lambda: hook.get_conn())
+    query_tag = build_query_tag(dag_id=dag_id, task_id=task_id, run_id=run_id, component=component)
+    report = QueryProfiler(history_source).profile(query_tag, start_time)
+    if profile_dir:
+        report["path"] = QueryProfiler.save(report, profile_dir)
+    for flagged in report["flagged"]:
+        print(f"Query {flagged['query_id']} flagged {flagged['flags']}: {flagged['query_text']}")
+    return report["summary"]
@@ -0,0 +1,408 @@
+"""
+Pipeline Run History
+Purpose: Keep health reports, stage durations and row counts in a compact local time-series store
+         (SQLite, indexed by component/metric/time) and flag runs that are slower than their rolling
+         baseline, durations creeping up over weeks, and row counts that collapse or spike
+Usage: store = RunHistoryStore("/opt/airflow/logs/run_history.db")
+       anomalies = store.record_metrics("bronze_data_pipeline", {"load_bronze_tables_seconds": 412.0,
+                                                                 "crm_sales_details_rows": 60398})
+       notify_anomalies(anomalies, SlackNotifier(), AirflowEmailNotifier(["data-team@example.com"]))
+Dependencies: sqlite3 (standard library)
+"""
+
+import json
+import os
+import sqlite3
+import statistics
+import zlib
+from datetime import datetime, timedelta
+
+# Metric kinds follow the metric name: durations grow when something is wrong, volumes collapse or spike
+DURATION_SUFFIXES = ("_seconds", "_hours")
+VOLUME_SUFFIXES = ("_rows",)
+
+DEFAULT_THRESHOLDS = {
+    # Previous points needed before a metric is judged
+    "min_history": 5,
+    # Rolling baseline: median of the previous `window` points
+    "window": 20,
+    # Slow run: above the baseline by this fraction and by more than `robust_z` scaled MADs
+    "duration_tolerance": 0.5,
+    "robust_z": 3.0,
+    # Ignore duration changes smaller than this (in the metric's unit) so millisecond jitter never alerts
+    "min_duration_delta": 1.0,
+    # Creep: median of the last `trend_points` runs vs the median of the runs recorded in the
+    # `trend_baseline_span_days` before `trend_baseline_days` ago; a fixed-age baseline cannot drift
+    # along with a slow ramp the way the previous points do
+    "trend_points": 7,
+    "trend_baseline_days": 30,
+    "trend_baseline_span_days": 7,
+    "trend_ratio": 1.3,
+    # Volumes below (1 - collapse) or above `spike` times the baseline
+    "volume_collapse": 0.5,
+    "volume_spike": 3.0,
+}
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS metrics (
+        component TEXT NOT NULL,
+        metric TEXT NOT NULL,
+        recorded_at TEXT NOT NULL,
+        value REAL,
+        run_id TEXT
+    );
+    CREATE INDEX IF NOT EXISTS idx_metrics_series ON metrics (component, metric, recorded_at);
+    CREATE TABLE IF NOT EXISTS reports (
+        component TEXT NOT NULL,
+        recorded_at TEXT NOT NULL,
+        run_id TEXT,
+        status TEXT,
+        report BLOB
+    );
+    CREATE INDEX IF NOT EXISTS idx_reports_time ON reports (component, recorded_at);
+"""
+
+
+def metric_kind(metric):
+    if metric.endswith(DURATION_SUFFIXES):
+        return "duration"
+    if metric.endswith(VOLUME_SUFFIXES):
+        return "volume"
+    return None
+
+
+def report_metrics(report):
+    """
+    Numeric metrics of a health-check or backup report: total and per-stage durations, freshness per
+    layer and data-quality failure counts
+    """
+    metrics = {}
+    if isinstance(report.get("duration_seconds"), (int, float)):
+        metrics["duration_seconds"] = report["duration_seconds"]
+    for stage, seconds in (report.get("durations") or {}).items():
+        metrics[f"{stage}_seconds"] = seconds
+
+    checks = report.get("checks") or {}
+    for layer, hours in ((checks.get("pipeline_freshness") or {}).get("freshness") or {}).items():
+        metrics[f"{layer}_freshness_hours"] = hours
+    # Failure counts are kept for range queries only; incremental scopes make checked row counts too noisy
+    for name, result in ((checks.get("data_quality") or {}).get("details") or {}).items():
+        if isinstance(result, dict):
+            metrics[f"dq_{name}_failed_count"] = result.get("failed_count")
+    return {name: value for name, value in metrics.items() if isinstance(value, (int, float))}
+
+
+class RunHistoryStore:
+    """
+    Append-only SQLite store of metric points and compressed reports, with rolling statistics
+    """
+
+    def __init__(self, path, thresholds=None):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.thresholds = dict(DEFAULT_THRESHOLDS, **(thresholds or {}))
+        with self._connect() as db:
+            db.executescript(_SCHEMA)
+
+    def _connect(self):
+        db = sqlite3.connect(self.path, timeout=30)
+        # WAL lets the scheduler, health checks and backups append concurrently with readers
+        db.execute("PRAGMA journal_mode=WAL")
+        return db
+
+    def record_metrics(self, component, metrics, recorded_at=None, run_id=None, detect=True):
+        """
+        Append one point per metric and return the anomalies it raises against the stored history
+        """
+        recorded_at = (recorded_at or datetime.now()).isoformat()
+        anomalies = []
+        if detect:
+            for metric, value in metrics.items():
+                anomalies.extend(self.detect(component, metric, value, recorded_at))
+        with self._connect() as db:
+            db.executemany("INSERT INTO metrics VALUES (?, ?, ?, ?, ?)",
+                           [(component, metric, recorded_at, float(value), run_id)
+                            for metric, value in metrics.items() if value is not None])
+        return anomalies
+
+    def record_report(self, component, report, recorded_at=None, run_id=None):
+        """
+        Store a report (zlib-compressed JSON) and its numeric metrics; returns the anomalies
+        """
+        recorded_at = recorded_at or datetime.now()
+        status = report.get("overall_status") or report.get("status")
+        with self._connect() as db:
+            db.execute("INSERT INTO reports VALUES (?, ?, ?, ?, ?)",
+                       (component, recorded_at.isoformat(), run_id, status,
+                        zlib.compress(json.dumps(report, default=str).encode())))
+        return self.record_metrics(component, report_metrics(report), recorded_at, run_id)
+
+    def series(self, component, metric, start=None, end=None, limit=None):
+        """
+        [(recorded_at, value)] in time order; start inclusive, end exclusive (datetimes or ISO strings)
+        """
+        sql = "SELECT recorded_at, value FROM metrics WHERE component = ? AND metric = ?"
+        params = [component, metric]
+        if start is not None:
+            sql += " AND recorded_at >= ?"
+            params.append(start if isinstance(start, str) else start.isoformat())
+        if end is not None:
+            sql += " AND recorded_at < ?"
+            params.append(end if isinstance(end, str) else end.isoformat())
+        if limit:
+            # Latest `limit` points, returned oldest first
+            sql = f"SELECT * FROM ({sql} ORDER BY recorded_at DESC LIMIT {int(limit)}) ORDER BY recorded_at"
+        else:
+            sql += " ORDER BY recorded_at"
+        with self._connect() as db:
+            return db.execute(sql, params).fetchall()
+
+    def reports(self, component, start=None, end=None):
+        rows = []
+        for recorded_at, value in self._report_rows(component, start, end):
+            rows.append((recorded_at, json.loads(zlib.decompress(value))))
+        return rows
+
+    def _report_rows(self, component, start, end):
+        sql = "SELECT recorded_at, report FROM reports WHERE component = ? AND recorded_at >= ? AND recorded_at < ?"
+        params = [component, (start or datetime.min).isoformat(), (end or datetime.max).isoformat()]
+        with self._connect() as db:
+            return db.execute(sql + " ORDER BY recorded_at", params).fetchall()
+
+    def rolling_stats(self, component, metric, window=None, end=None):
+        """
+        Count, mean, median, stdev, p90, min and max of the last `window` points before `end`
+        """
+        values = [value for _, value in self.series(component, metric, end=end,
+                                                     limit=window or self.thresholds["window"])]
+        if not values:
+            return {"count": 0}
+        ordered = sorted(values)
+        return {
+            "count": len(values),
+            "mean": statistics.fmean(values),
+            "median": statistics.median(values),
+            "stdev": statistics.stdev(values) if len(values) > 1 else 0.0,
+            "p90": ordered[min(len(ordered) - 1, int(0.9 * len(ordered)))],
+            "min": ordered[0],
+            "max": ordered[-1],
+        }
+
+    def detect(self, component, metric, value, recorded_at=None):
+        """
+        Anomalies of a new point against the history stored before it
+        """
+        kind = metric_kind(metric)
+        if kind is None or value is None:
+            return []
+        t = self.thresholds
+        history = [v for _, v in self.series(component, metric, end=recorded_at,
+                                             limit=t["window"] + t["trend_points"])]
+        baseline_values = history[-t["window"]:]
+        if len(baseline_values) < t["min_history"]:
+            return []
+
+        baseline = statistics.median(baseline_values)
+        anomalies = []
+
+        def anomaly(anomaly_kind, reference, message):
+            anomalies.append({
+                "component": component, "metric": metric, "kind": anomaly_kind, "value": value,
+                "baseline": round(reference, 4), "ratio": round(value / reference, 3) if reference else None,
+                "recorded_at": recorded_at, "message": message,
+            })
+
+        if kind == "duration":
+            # Robust z-score: median absolute deviation scaled to a standard deviation
+            mad = statistics.median(abs(v - baseline) for v in baseline_values) * 1.4826
+            above = value > baseline * (1 + t["duration_tolerance"]) and value - baseline >= t["min_duration_delta"]
+            if above and (mad == 0 or (value - baseline) / mad > t["robust_z"]):
+                anomaly("slow_run", baseline, f"{metric} took {value:.1f} vs rolling median {baseline:.1f}")
+
+            recent = (history + [value])[-t["trend_points"]:]
+            now = datetime.fromisoformat(recorded_at) if recorded_at else datetime.now()
+            baseline_end = now - timedelta(days=t["trend_baseline_days"])
+            earlier = [v for _, v in self.series(
+                component, metric, start=baseline_end - timedelta(days=t["trend_baseline_span_days"]), end=baseline_end)]
+            if len(recent) == t["trend_points"] and len(earlier) >= t["min_history"]:
+                earlier_median = statistics.median(earlier)
+                recent_median = statistics.median(recent)
+                if (earlier_median and recent_median >= earlier_median * t["trend_ratio"]
+                        and recent_median - earlier_median >= t["min_duration_delta"]):
+                    anomaly("duration_trend", earlier_median,
+                            f"{metric} median of the last {t['trend_points']} runs is "
+                            f"{recent_median / earlier_median - 1:.0%} above its median "
+                            f"{t['trend_baseline_days']} days earlier")
+        else:
+            if value < baseline * (1 - t["volume_collapse"]):
+                anomaly("volume_collapse", baseline, f"{metric} dropped to {value:,.0f} from a median of {baseline:,.0f}")
+            elif baseline and value > baseline * t["volume_spike"]:
+                anomaly("volume_spike", baseline, f"{metric} jumped to {value:,.0f} from a median of {baseline:,.0f}")
+        return anomalies
+
+    def prune(self, older_than_days):
+        cutoff = (datetime.now() - timedelta(days=older_than_days)).isoformat()
+        with self._connect() as db:
+            db.execute("DELETE FROM metrics WHERE recorded_at < ?", (cutoff,))
+            db.execute("DELETE FROM reports WHERE recorded_at < ?", (cutoff,))
+
+
+def anomaly_slack_message(anomalies):
+    """
+    Slack Block Kit message listing anomalies (shared with the monitoring SlackNotifier)
+    """
+    return {
+        "blocks": [
+            {
+                "type": "header",
+                "text": {
+                    "type": "plain_text",
+                    "text": f"⏱️ Pipeline Run Anomalies ({len(anomalies)})"
+                }
+            },
+            {
+                "type": "section",
+                "text": {
+                    "type": "mrkdwn",
+                    "text": "\n".join(
+                        f"*{anomaly['component']}* `{anomaly['kind']}`: {anomaly['message']}"
+                        for anomaly in anomalies
+                    )
+                }
+            }
+        ]
+    }
+
+
+def anomaly_email_html(anomalies):
+    """
+    HTML email body listing anomalies, styled like the monitoring EmailTemplates
+    """
+    rows_html = "".join([
+        f"<tr><td>{anomaly['component']}</td><td>{anomaly['metric']}</td><td>{anomaly['kind']}</td>"
+        f"<td>{anomaly['value']}</td><td>{anomaly['baseline']}</td></tr>"
+        for anomaly in anomalies
+    ])
+
+    return f"""
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <style>
+            body {{ font-family: Arial, sans-serif; margin: 20px; }}
+            .header {{ background-color: #fd7e14; color: white; padding: 10px; border-radius: 5px; }}
+            table {{ border-collapse: collapse; width: 100%; margin: 20px 0; }}
+            th, td {{ border: 1px solid #ddd; padding: 8px; text-align: left; }}
+            th {{ background-color: #f8f9fa; }}
+        </style>
+    </head>
+    <body>
+        <div class="header">
+            <h2>⏱️ Pipeline Run Anomalies</h2>
+        </div>
+
+        <table>
+            <tr><th>Component</th><th>Metric</th><th>Anomaly</th><th>Value</th><th>Rolling Baseline</th></tr>
+            {rows_html}
+        </table>
+
+        <p><small>Baselines are rolling medians from the pipeline run history.</small></p>
+    </body>
+    </html>
+    """
+
+
+class SlackWebhookNotifier:
+    """
+    Posts anomaly alerts to a Slack incoming webhook from inside Airflow tasks, where the monitoring
+    package (and its SlackNotifier) is not deployed
+    """
+
+    def __init__(self, webhook_url, timeout=10):
+        self.webhook_url = webhook_url
+        self.timeout = timeout
+
+    def send_anomaly_alert(self, anomalies):
+        import requests
+        response = requests.post(self.webhook_url, json=anomaly_slack_message(anomalies), timeout=self.timeout)
+        response.raise_for_status()
+
+
+class AirflowEmailNotifier:
+    """
+    Emails anomaly alerts through Airflow's configured email backend (SMTP settings in airflow.cfg)
+    """
+
+    def __init__(self, to):
+        self.to = to
+
+    def send_anomaly_alert(self, anomalies):
+        from airflow.utils.email import send_email
+        send_email(self.to, f"Pipeline Run Anomalies ({len(anomalies)})", anomaly_email_html(anomalies))
+
+
+def notify_anomalies(anomalies, *notifiers):
+    """
+    Send anomalies through each notifier exposing send_anomaly_alert (SlackNotifier,
+    AirflowEmailNotifier); printed otherwise
+    """
+    for anomaly in anomalies:
+        print(f"Run history anomaly [{anomaly['kind']}] {anomaly['component']}: {anomaly['message']}")
+    if not anomalies:
+        return
+    for notifier in notifiers:
+        if notifier is None:
+            continue
+        try:
+            notifier.send_anomaly_alert(anomalies)
+        except Exception as e:
+            print(f"Failed to send anomaly alert through {type(notifier).__name__}: {e}")
+
+
+def record_dag_run_history(history_path, row_count_schemas=None, snowflake_conn_id="snowflake_default",
+                           slack_webhook_variable="slack_webhook_url", email_variable="alert_emails",
+                           selection_tasks=None, dag_run=None, dag=None, **context):
+    """
+    PythonOperator callable: store the durations of this DAG run's finished tasks and, optionally, the
+    row counts of the given schemas' tables (INFORMATION_SCHEMA metadata, no table scans); anomalies
+    are posted to the Slack webhook held in the `slack_webhook_variable` Airflow Variable and emailed
+    to the addresses in the `email_variable` one. `selection_tasks` maps a dbt_selection plan task to
+    the tasks it selects for: on full builds their durations go to `<task_id>_full_seconds`, so the
+    weekly full build is compared with earlier full builds rather than the incremental runs
+    """
+    task_instance = context["task_instance"]
+    full_build_tasks = set()
+    for plan_task_id, task_ids in (selection_tasks or {}).items():
+        plan = task_instance.xcom_pull(task_ids=plan_task_id)
+        if plan and plan.get("mode") == "full":
+            full_build_tasks.update(task_ids)
+
+    metrics = {}
+    for finished in dag_run.get_task_instances():
+        if finished.duration is not None and finished.task_id != task_instance.task_id:
+            suffix = "_full_seconds" if finished.task_id in full_build_tasks else "_seconds"
+            metrics[f"{finished.task_id}{suffix}"] = finished.duration
+
+    if row_count_schemas:
+        from airflow.providers.snowflake.hooks.snowflake import SnowflakeHook
+        hook = SnowflakeHook(snowflake_conn_id=snowflake_conn_id)
+        schemas = ", ".join(f"'{schema.upper()}'" for schema in row_count_schemas)
+        for schema, table, row_count in hook.get_records(
+                f"SELECT table_schema, table_name, row_count FROM information_schema.tables "
+                f"WHERE table_schema IN ({schemas}) AND table_type = 'BASE TABLE'"):
+            metrics[f"{schema.lower()}.{table.lower()}_rows"] = row_count
+
+    anomalies = RunHistoryStore(history_path).record_metrics(dag.dag_id, metrics, run_id=dag_run.run_id)
+    notifiers = []
+    if anomalies and (slack_webhook_variable or email_variable):
+        from airflow.models import Variable
+        webhook_url = Variable.get(slack_webhook_variable, default_var=None) if slack_webhook_variable else None
+        if webhook_url:
+            notifiers.append(SlackWebhookNotifier(webhook_url))
+        recipients = Variable.get(email_variable, default_var=None, deserialize_json=True) if email_variable else None
+        if recipients:
+            notifiers.append(AirflowEmailNotifier(recipients))
+        if not notifiers:
+            print(f"Airflow Variables {slack_webhook_variable} / {email_variable} are not set; anomalies are only logged")
+    notify_anomalies(anomalies, *notifiers)
+    return {"metrics": len(metrics), "anomalies": anomalies}
@@ -0,0 +1,184 @@
+"""
+Sampled / Approximate Data Quality Checks
+Purpose: Estimate tolerance-based checks (failure rates, duplicate-key rates) on very large tables from a
+         block/row sample (duplicates: key collisions within the sample) or, for loose thresholds, a
+         HyperLogLog distinct count, report a confidence interval, and escalate to the exact query only when the interval straddles the
+         check's threshold
+Usage: checker = SampledQualityChecker(hook.get_first, sample_percent=1, method="SYSTEM")
+       result = checker.run({"from": "silver.crm_sales_details",
+                             "failure": "sls_sales != sls_quantity * sls_price",
+                             "max_failure_rate": 0.001})
+Dependencies: Snowflake SAMPLE / APPROX_COUNT_DISTINCT (translated to DuckDB by the local backend)
+"""
+
+import math
+from statistics import NormalDist
+
+# Snowflake documents an average relative error of ~1.62% for APPROX_COUNT_DISTINCT (HyperLogLog)
+HLL_RELATIVE_ERROR = 0.0162
+
+# SYSTEM/BLOCK skips whole micro-partitions (the cheap one); BERNOULLI/ROW still reads every partition
+SAMPLING_METHODS = ("SYSTEM", "BLOCK", "BERNOULLI", "ROW")
+
+
+def sampled_from(from_clause, sample_clause):
+    """
+    Attach a sample clause to the first table of a FROM clause: at its `{sample}` placeholder
+    (needed when the table is joined) or at the end
+    """
+    if "{sample}" in from_clause:
+        return from_clause.replace("{sample}", sample_clause)
+    return f"{from_clause} {sample_clause}".rstrip()
+
+
+def wilson_interval(failures, rows, z):
+    """
+    Wilson score interval of a proportion; stays inside [0, 1] and behaves for rates near zero
+    """
+    if rows <= 0:
+        return 0.0, 1.0
+    rate = failures / rows
+    denominator = 1 + z * z / rows
+    centre = (rate + z * z / (2 * rows)) / denominator
+    half_width = z * math.sqrt(rate * (1 - rate) / rows + z * z / (4 * rows * rows)) / denominator
+    return max(0.0, centre - half_width), min(1.0, centre + half_width)
+
+
+def pair_upper_bound(pairs, variance, z):
+    """
+    Upper score bound of a count of colliding pairs; variance (sum of squared per-key pair counts)
+    covers keys with many copies, and zero observed pairs still bound at z^2
+    """
+    return pairs + z * z / 2 + z * math.sqrt(max(variance, pairs) + z * z / 4)
+
+
+class SampledQualityChecker:
+    """
+    Runs a check dict ({"from", "failure" | "key", "max_failure_rate"}) exactly or approximately
+
+    `run_query(sql, params)` returns the first result row (SnowflakeHook.get_first, LocalHook.get_first
+    or a cursor wrapper). `sample_percent=None` disables approximation; zero-tolerance checks always run
+    exactly since a sample can never prove the absence of failures. `design_effect` > 1 widens the
+    interval for clustered (block) samples, whose rows are not independent
+    """
+
+    def __init__(self, run_query, sample_percent=1.0, method="SYSTEM", confidence=0.95, min_sample_rows=1000,
+                 seed=None, design_effect=1.0, hll_relative_error=HLL_RELATIVE_ERROR):
+        if method.upper() not in SAMPLING_METHODS:
+            raise ValueError(f"Unknown sampling method {method!r}; expected one of {SAMPLING_METHODS}")
+        if sample_percent is not None and not 0 < sample_percent <= 100:
+            raise ValueError(f"sample_percent must be in (0, 100], got {sample_percent}")
+        self.run_query = run_query
+        self.sample_percent = sample_percent
+        self.method = method.upper()
+        self.confidence = confidence
+        self.z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        self.min_sample_rows = min_sample_rows
+        self.seed = seed
+        self.design_effect = design_effect
+        self.hll_relative_error = hll_relative_error
+
+    def sample_clause(self):
+        clause = f"SAMPLE {self.method} ({self.sample_percent:g})"
+        if self.seed is not None:
+            clause += f" SEED ({int(self.seed)})"
+        return clause
+
+    def run(self, check, where=None, params=None, extra_columns=()):
+        """
+        Evaluate one check; returns (result, values of `extra_columns` from the query that decided it)
+        """
+        threshold = check.get("max_failure_rate", 0.0)
+        approximate = self.sample_percent is not None and threshold > 0
+        if "key" in check:
+            return self._duplicate_check(check, threshold, approximate, where, params, extra_columns)
+        return self._rate_check(check, threshold, approximate, where, params, extra_columns)
+
+    def _query(self, select, from_clause, where, params, extra_columns):
+        sql = f"SELECT {', '.join(list(select) + list(extra_columns))} FROM {from_clause}"
+        if where:
+            sql += f" WHERE {where}"
+        row = self.run_query(sql, params)
+        return row[:len(select)], tuple(row[len(select):])
+
+    @staticmethod
+    def _result(method, failed_count, rows_checked, rate, interval, threshold, escalated):
+        return {
+            "method": method,
+            "failed_count": failed_count,
+            "rows_checked": rows_checked,
+            "failure_rate": round(rate, 8),
+            "confidence_interval": [round(interval[0], 8), round(interval[1], 8)],
+            "threshold": threshold,
+            "escalated": escalated,
+            "passed": rate <= threshold if method == "exact" else interval[1] <= threshold,
+        }
+
+    def _rate_check(self, check, threshold, approximate, where, params, extra_columns):
+        select = (f"COUNT(CASE WHEN {check['failure']} THEN 1 END)", "COUNT(*)")
+        escalated = False
+        if approximate:
+            (failures, rows), extras = self._query(
+                select, sampled_from(check["from"], self.sample_clause()), where, params, extra_columns)
+            failures, rows = failures or 0, rows or 0
+            low, high = wilson_interval(failures / self.design_effect, rows / self.design_effect, self.z)
+            # Decided by the sample unless the interval straddles the threshold (or the sample is too small)
+            if rows >= self.min_sample_rows and (low > threshold or high <= threshold):
+                scale = 100.0 / self.sample_percent
+                result = self._result("sampled", round(failures * scale), rows, failures / rows,
+                                      (low, high), threshold, False)
+                result["estimated_rows"] = round(rows * scale)
+                return result, extras
+            escalated = True
+
+        (failures, rows), extras = self._query(select, sampled_from(check["from"], ""), where, params, extra_columns)
+        failures, rows = failures or 0, rows or 0
+        rate = failures / rows if rows else 0.0
+        return self._result("exact", failures, rows, rate, (rate, rate), threshold, escalated), extras
+
+    def _duplicate_check(self, check, threshold, approximate, where, params, extra_columns):
+        key = check["key"]
+        escalated = False
+        from_clause = sampled_from(check["from"], "")
+        # HLL's interval is about z * relative error of the rows wide; it can only decide looser thresholds
+        if approximate and threshold > self.z * self.hll_relative_error:
+            # HyperLogLog reads the whole key column but skips the exact COUNT(DISTINCT) hash aggregate
+            (rows, distinct), extras = self._query(
+                (f"COUNT({key})", f"APPROX_COUNT_DISTINCT({key})"), from_clause, where, params, extra_columns)
+            rows, distinct = rows or 0, distinct or 0
+            margin = self.z * self.hll_relative_error * distinct
+            # A distinct estimate above the row count beyond its error is not evidence of zero duplicates
+            if rows and rows - distinct + margin >= 0:
+                duplicates = max(0, rows - distinct)
+                low = max(0.0, rows - distinct - margin) / rows
+                high = min(float(rows), rows - distinct + margin) / rows
+                if low > threshold or high <= threshold:
+                    return self._result("approximate", duplicates, rows, duplicates / rows, (low, high),
+                                        threshold, False), extras
+        if approximate:
+            # Only the sample is read: a key with s sampled copies adds C(s, 2) colliding pairs. A row sample
+            # keeps a pair with probability p^2 (block samples more often), so pairs / p^2 estimates the
+            # table's pairs, an upper bound on its extra copies. The sample can only clear the check
+            filtered = f" WHERE {where}" if where else ""
+            sampled_rows = (f"(SELECT *, COUNT({key}) OVER (PARTITION BY {key}) AS dq_key_copies "
+                            f"FROM {sampled_from(check['from'], self.sample_clause())}{filtered}) sampled_rows")
+            (pairs, pair_variance, rows), extras = self._query(
+                ("SUM(CASE WHEN dq_key_copies > 1 THEN (dq_key_copies - 1) / 2.0 END)",
+                 "SUM(CASE WHEN dq_key_copies > 1 THEN dq_key_copies * POWER(dq_key_copies - 1, 2) / 4.0 END)",
+                 f"COUNT({key})"), sampled_rows, None, params, extra_columns)
+            pairs, pair_variance, rows = float(pairs or 0), float(pair_variance or 0), rows or 0
+            if rows >= self.min_sample_rows:
+                fraction = self.sample_percent / 100.0
+                high = pair_upper_bound(pairs, pair_variance * self.design_effect, self.z) / (fraction * rows)
+                if high <= threshold:
+                    result = self._result("sampled", round(pairs / fraction ** 2), rows, pairs / (fraction * rows),
+                                          (0.0, min(1.0, high)), threshold, False)
+                    result["estimated_rows"] = round(rows / fraction)
+                    return result, extras
+            escalated = True
+
+        (rows, distinct), extras = self._query(
+            (f"COUNT({key})", f"COUNT(DISTINCT {key})"), from_clause, where, params, extra_columns)
+        rows, distinct = rows or 0, distinct or 0
+        rate = (rows - distinct) / rows if rows else 0.0
+        return self._result("exact", rows - distinct, rows, rate, (rate, rate), threshold, escalated), extras
@@ -0,0 +1,313 @@
+"""
+Adaptive Warehouse Sizing
+Purpose: Pick a warehouse size per task from its run history and data volume, resize (or switch) the
+         warehouse before the task, suspend it afterwards, keep each DAG run within a credit budget (the
+         smallest size once it is spent), and log the decision together with the measured speedup
+Usage: sizer = WarehouseSizer(hook.get_conn, warehouse="DWH_BRONZE_WH", history=SizingHistory(path),
+                              credit_budget=5, run_id=context["run_id"])
+       with sizer.sized("bronze_data_pipeline.load_bronze_tables", target_seconds=900) as decision:
+           ...  # run the task
+       pre_execute, post_execute, cleanup = sizing_callbacks(lambda context: sizer, task_key, bind=bind_task)
+Dependencies: Any DB-API connect() callable; LocalWarehouse(...).connect records the issued statements
+              in its query_history for tests
+"""
+
+import json
+import math
+import os
+import statistics
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+# Credits per hour by warehouse size (standard warehouses)
+WAREHOUSE_SIZES = {
+    "X-SMALL": 1, "SMALL": 2, "MEDIUM": 4, "LARGE": 8,
+    "X-LARGE": 16, "2X-LARGE": 32, "3X-LARGE": 64, "4X-LARGE": 128,
+}
+# A resumed warehouse is billed for at least one minute
+MIN_BILLED_SECONDS = 60
+
+
+def _normalize_size(size):
+    size = size.upper().replace("XSMALL", "X-SMALL").replace("XLARGE", "X-LARGE")
+    if size not in WAREHOUSE_SIZES:
+        raise ValueError(f"Unknown warehouse size {size!r}; expected one of {list(WAREHOUSE_SIZES)}")
+    return size
+
+
+def estimate_credits(size, seconds):
+    return WAREHOUSE_SIZES[size] * max(seconds, MIN_BILLED_SECONDS) / 3600
+
+
+class SizingHistory:
+    """
+    JSON store of past task runs (size, seconds, data volume, credits) and credits spent per DAG run
+    """
+
+    def __init__(self, path=None, max_runs_per_task=50):
+        self.path = path
+        self.max_runs_per_task = max_runs_per_task
+        self.data = {"tasks": {}, "budgets": {}}
+        if path and os.path.exists(path):
+            with open(path) as f:
+                self.data = json.load(f)
+
+    def runs(self, task_key):
+        return self.data["tasks"].get(task_key, [])
+
+    def record(self, task_key, run):
+        runs = self.data["tasks"].setdefault(task_key, [])
+        runs.append(run)
+        del runs[:-self.max_runs_per_task]
+        if run.get("run_id"):
+            budgets = self.data["budgets"]
+            budgets[run["run_id"]] = round(budgets.get(run["run_id"], 0.0) + run["credits"], 6)
+        self.save()
+
+    def spent(self, run_id):
+        return self.data["budgets"].get(run_id, 0.0) if run_id else 0.0
+
+    def save(self):
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        temporary = f"{self.path}.tmp"
+        with open(temporary, "w") as f:
+            json.dump(self.data, f, indent=2)
+        os.replace(temporary, self.path)
+
+
+class WarehouseSizer:
+    """
+    Sizing controller: runtime model fitted from history, decision, resize/switch, suspend, bookkeeping
+
+    Runtime is modelled as seconds = work * data_volume / credits_per_hour ** scaling_efficiency, with
+    the efficiency re-fitted once a task has run on two or more sizes. The chosen size is the cheapest
+    meeting `target_seconds`; without a target, the fastest whose cost is within `cost_tolerance` of the
+    cheapest. With `warehouses` ({size: warehouse name}) the decision names a warehouse to switch the
+    task's session to; otherwise `warehouse` is resized in place (ALTER WAREHOUSE affects every session
+    using it, so shared warehouses should use switching). Suspending is skipped with suspend_after=False
+    """
+
+    def __init__(self, connect, snowflake_config=None, warehouse=None, warehouses=None, history=None,
+                 default_size="X-SMALL", min_size="X-SMALL", max_size="LARGE", scaling_efficiency=0.8,
+                 cost_tolerance=0.1, credit_budget=None, run_id=None, suspend_after=True, restore_size=None):
+        if not warehouse and not warehouses:
+            raise ValueError("Either warehouse (resize mode) or warehouses (switch mode) is required")
+        self.connect = connect
+        self.snowflake_config = snowflake_config or {}
+        self.warehouse = warehouse
+        self.warehouses = {_normalize_size(size): name for size, name in (warehouses or {}).items()}
+        self.history = history or SizingHistory()
+        self.default_size = _normalize_size(default_size)
+        sizes = list(WAREHOUSE_SIZES)
+        self.candidates = sizes[sizes.index(_normalize_size(min_size)):sizes.index(_normalize_size(max_size)) + 1]
+        if self.warehouses:
+            self.candidates = [size for size in self.candidates if size in self.warehouses]
+        self.scaling_efficiency = scaling_efficiency
+        self.cost_tolerance = cost_tolerance
+        self.credit_budget = credit_budget
+        self.run_id = run_id
+        self.suspend_after = suspend_after
+        self.restore_size = _normalize_size(restore_size) if restore_size else None
+
+    def _execute(self, statements):
+        conn = self.connect(**self.snowflake_config)
+        try:
+            cursor = conn.cursor()
+            for statement in statements:
+                try:
+                    cursor.execute(statement)
+                except Exception as e:
+                    # e.g. suspending an already suspended warehouse; sizing must never fail the task
+                    print(f"Warehouse sizing statement failed ({statement}): {e}")
+            cursor.close()
+        finally:
+            conn.close()
+
+    def query_volume(self, sql):
+        """
+        Data volume estimate from a metadata query returning one number, e.g. SUM(row_count) of the
+        INFORMATION_SCHEMA.TABLES feeding the task
+        """
+        conn = self.connect(**self.snowflake_config)
+        try:
+            cursor = conn.cursor()
+            cursor.execute(sql)
+            row = cursor.fetchone()
+            cursor.close()
+        finally:
+            conn.close()
+        return float(row[0]) if row and row[0] is not None else None
+
+    def _model(self, task_key):
+        """
+        (work per unit of volume, scaling efficiency) from recent runs, or None without history
+        """
+        runs = [run for run in self.history.runs(task_key)[-20:] if run.get("seconds")]
+        if not runs:
+            return None
+        efficiency = self.scaling_efficiency
+        if len({run["size"] for run in runs}) >= 2:
+            # Least-squares slope of log(seconds / volume) against log(credits per hour)
+            xs = [math.log(WAREHOUSE_SIZES[run["size"]]) for run in runs]
+            ys = [math.log(run["seconds"] / (run.get("data_volume") or 1)) for run in runs]
+            x_mean, y_mean = statistics.fmean(xs), statistics.fmean(ys)
+            variance = sum((x - x_mean) ** 2 for x in xs)
+            if variance:
+                slope = sum((x - x_mean) * (y - y_mean) for x, y in zip(xs, ys)) / variance
+                efficiency = min(1.0, max(0.0, -slope))
+        work = statistics.median(run["seconds"] * WAREHOUSE_SIZES[run["size"]] ** efficiency /
+                                 (run.get("data_volume") or 1) for run in runs)
+        return work, efficiency
+
+    def estimate_seconds(self, task_key, size, data_volume=None):
+        model = self._model(task_key)
+        if model is None:
+            return None
+        work, efficiency = model
+        return work * (data_volume or 1) / WAREHOUSE_SIZES[size] ** efficiency
+
+    def choose_size(self, task_key, data_volume=None, target_seconds=None):
+        """
+        Decision dict: size, warehouse, reason, per-size estimates and the remaining budget
+        """
+        remaining = None
+        if self.credit_budget is not None:
+            remaining = self.credit_budget - self.history.spent(self.run_id)
+
+        estimates = {}
+        for size in self.candidates:
+            seconds = self.estimate_seconds(task_key, size, data_volume)
+            if seconds is not None:
+                estimates[size] = {"seconds": round(seconds, 2), "credits": round(estimate_credits(size, seconds), 6)}
+
+        if remaining is not None and remaining <= 0:
+            # Failing the task would only fail every retry too; run it as cheaply as possible instead
+            size = self.candidates[0]
+            reason = f"credit budget of {self.credit_budget} exhausted for run {self.run_id}; smallest size"
+            print(f"Warehouse sizing for {task_key}: {reason}")
+        elif not estimates:
+            size = self.default_size if self.default_size in self.candidates else self.candidates[0]
+            reason = "no run history; default size"
+        else:
+            affordable = [s for s in self.candidates if remaining is None or estimates[s]["credits"] <= remaining]
+            if not affordable:
+                size, reason = self.candidates[0], "budget below every estimate; smallest size"
+            elif target_seconds is not None:
+                meeting = [s for s in affordable if estimates[s]["seconds"] <= target_seconds]
+                if meeting:
+                    size = min(meeting, key=lambda s: estimates[s]["credits"])
+                    reason = f"cheapest size meeting the {target_seconds}s target"
+                else:
+                    size = affordable[-1]
+                    reason = f"no affordable size meets the {target_seconds}s target; fastest affordable"
+            else:
+                cheapest = min(estimates[s]["credits"] for s in affordable)
+                size = [s for s in affordable if estimates[s]["credits"] <= cheapest * (1 + self.cost_tolerance)][-1]
+                reason = f"fastest size within {self.cost_tolerance:.0%} of the cheapest cost"
+
+        return {
+            "task_key": task_key,
+            "size": size,
+            "warehouse": self.warehouses.get(size, self.warehouse),
+            "reason": reason,
+            "data_volume": data_volume,
+            "estimates": estimates,
+            "budget_remaining": round(remaining, 6) if remaining is not None else None,
+        }
+
+    def before(self, decision):
+        if not self.warehouses:
+            self._execute([f"ALTER WAREHOUSE {self.warehouse} SET WAREHOUSE_SIZE = '{decision['size']}' "
+                           f"WAIT_FOR_COMPLETION = TRUE"])
+        print(f"Warehouse sizing for {decision['task_key']}: {decision['warehouse']} at {decision['size']} "
+              f"({decision['reason']})")
+        decision["started"] = time.perf_counter()
+
+    def release(self, decision=None):
+        """
+        Suspend the decision's warehouse (the resized one without a decision) and restore its size
+        """
+        statements = []
+        if self.suspend_after:
+            statements.append(f"ALTER WAREHOUSE {decision['warehouse'] if decision else self.warehouse} SUSPEND")
+        if self.restore_size and not self.warehouses:
+            statements.append(f"ALTER WAREHOUSE {self.warehouse} SET WAREHOUSE_SIZE = '{self.restore_size}'")
+        if statements:
+            self._execute(statements)
+
+    def after(self, decision):
+        seconds = time.perf_counter() - decision.pop("started")
+        self.release(decision)
+
+        # Speedup against the default size, from the model fitted before this run
+        baseline = self.estimate_seconds(decision["task_key"], self.default_size, decision["data_volume"])
+        decision.update({
+            "measured_seconds": round(seconds, 3),
+            "credits": round(estimate_credits(decision["size"], seconds), 6),
+            "baseline_size": self.default_size,
+            "speedup": round(baseline / seconds, 2) if baseline and seconds else None,
+        })
+        self.history.record(decision["task_key"], {
+            "size": decision["size"],
+            "seconds": decision["measured_seconds"],
+            "data_volume": decision["data_volume"],
+            "credits": decision["credits"],
+            "run_id": self.run_id,
+            "timestamp": datetime.now().isoformat(),
+        })
+        speedup = f", {decision['speedup']}x vs {self.default_size}" if decision["speedup"] else ""
+        print(f"Warehouse sizing for {decision['task_key']}: ran {decision['measured_seconds']}s on "
+              f"{decision['size']} ({decision['credits']} credits{speedup})")
+        return decision
+
+    @contextmanager
+    def sized(self, task_key, data_volume=None, target_seconds=None):
+        decision = self.choose_size(task_key, data_volume, target_seconds)
+        self.before(decision)
+        try:
+            yield decision
+        finally:
+            self.after(decision)
+
+
+def sizing_callbacks(sizer_factory, task_key, data_volume_sql=None, target_seconds=None, bind=None):
+    """
+    (pre_execute, post_execute, cleanup) operator callbacks; `sizer_factory(context)` builds a
+    WarehouseSizer and `bind(task, warehouse)` points the task's session at the chosen warehouse.
+    post_execute only runs after a successful execute, so cleanup is meant for on_failure_callback and
+    on_retry_callback: it suspends and restores the warehouse without recording the failed run
+    """
+    state = {}
+
+    def pre_execute(context):
+        sizer = sizer_factory(context)
+        data_volume = sizer.query_volume(data_volume_sql) if data_volume_sql else None
+        decision = sizer.choose_size(task_key, data_volume, target_seconds)
+        sizer.before(decision)
+        state.update(sizer=sizer, decision=decision)
+        if bind is not None:
+            bind(context["task"], decision["warehouse"])
+
+    def post_execute(context, result=None):
+        if "decision" not in state:
+            return
+        decision = state["sizer"].after(state.pop("decision"))
+        task_instance = context.get("task_instance") or context.get("ti")
+        if task_instance is not None:
+            task_instance.xcom_push(key="warehouse_sizing", value=decision)
+
+    def cleanup(context):
+        # Also called for tasks failed outside their process (timeouts, zombies), where state is empty
+        decision = state.pop("decision", None)
+        sizer = state.get("sizer") or sizer_factory(context)
+        try:
+            sizer.release(decision)
+            print(f"Warehouse sizing for {task_key}: released {decision['warehouse'] if decision else sizer.warehouse} "
+                  f"after a failed attempt")
+        except Exception as e:
+            print(f"Warehouse sizing for {task_key}: could not release the warehouse: {e}")
+
+    return pre_execute, post_execute, cleanup
@@ -0,0 +1,137 @@
+"""
+DAG Parse-Time Benchmark
+Purpose: Measure how long each DAG file takes to import and how much memory it allocates, the work the
+         Airflow scheduler repeats on every DAG directory scan
+Usage: python dag_parse_benchmark.py --output dag_parse_results.json
+       python dag_parse_benchmark.py --dags-dir /path/to/other/dags --repeat 10 --max-seconds 2
+Dependencies: An Airflow installation (run inside the Airflow image); psutil (optional) for RSS
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from datetime import datetime
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+DEFAULT_DAGS_DIR = os.path.join(REPO_ROOT, "Orchestration", "airflow", "dags")
+DEFAULT_PLUGINS_DIR = os.path.join(REPO_ROOT, "Orchestration", "airflow", "plugins")
+
+# Runs in a fresh interpreter per file and repeat. Airflow itself is imported before timing starts, as it
+# already is in the scheduler's DAG file processors, so only the file's own parse cost is measured
+_PARSE_SCRIPT = r"""
+import json, runpy, sys, time, tracemalloc
+sys.path[:0] = [sys.argv[2], sys.argv[3]]
+try:
+    import psutil
+    process = psutil.Process()
+except ImportError:
+    process = None
+import airflow.models  # noqa: F401
+modules_before = set(sys.modules)
+rss_before = process.memory_info().rss if process else 0
+tracemalloc.start()
+started = time.perf_counter()
+namespace = runpy.run_path(sys.argv[1], run_name="airflow_dag_parse")
+elapsed = time.perf_counter() - started
+_, peak = tracemalloc.get_traced_memory()
+tracemalloc.stop()
+dags = [value for value in namespace.values() if hasattr(value, "dag_id") and hasattr(value, "task_dict")]
+print(json.dumps({
+    "seconds": elapsed,
+    "peak_memory_mb": peak / 1024 / 1024,
+    "rss_delta_mb": ((process.memory_info().rss - rss_before) / 1024 / 1024) if process else None,
+    "modules_imported": len(set(sys.modules) - modules_before),
+    "dags": len(dags),
+    "tasks": sum(len(dag.task_dict) for dag in dags),
+}))
+"""
+
+
+def parse_file(path, dags_dir, plugins_dir, python=sys.executable):
+    """
+    Import one DAG file in a fresh interpreter and return its parse metrics
+    """
+    completed = subprocess.run([python, "-c", _PARSE_SCRIPT, path, dags_dir, plugins_dir],
+                               capture_output=True, text=True)
+    if completed.returncode != 0:
+        lines = completed.stderr.strip().splitlines()
+        return {"error": lines[-1] if lines else f"exit code {completed.returncode}"}
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def benchmark_dags(dags_dir=DEFAULT_DAGS_DIR, plugins_dir=DEFAULT_PLUGINS_DIR, repeat=5):
+    """
+    Median parse metrics per DAG file (files Airflow would consider: *.py mentioning 'airflow' and 'dag')
+    """
+    results = {}
+    for name in sorted(os.listdir(dags_dir)):
+        path = os.path.join(dags_dir, name)
+        if not name.endswith(".py") or not os.path.isfile(path):
+            continue
+        with open(path) as f:
+            source = f.read().lower()
+        if "airflow" not in source or "dag" not in source:
+            continue
+
+        runs = [parse_file(path, dags_dir, plugins_dir) for _ in range(repeat)]
+        errors = [run["error"] for run in runs if "error" in run]
+        if errors:
+            results[name] = {"status": "error", "error": errors[0]}
+            continue
+        results[name] = {
+            "status": "ok",
+            "dags": runs[0]["dags"],
+            "tasks": runs[0]["tasks"],
+            "modules_imported": runs[0]["modules_imported"],
+            "seconds": round(statistics.median(run["seconds"] for run in runs), 4),
+            "max_seconds": round(max(run["seconds"] for run in runs), 4),
+            "peak_memory_mb": round(statistics.median(run["peak_memory_mb"] for run in runs), 2),
+            "rss_delta_mb": (round(statistics.median(run["rss_delta_mb"] for run in runs), 2)
+                             if runs[0]["rss_delta_mb"] is not None else None),
+        }
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "config": {"dags_dir": dags_dir, "plugins_dir": plugins_dir, "repeat": repeat},
+        "results": results,
+        "total_seconds": round(sum(r.get("seconds", 0) for r in results.values()), 4),
+    }
+
+
+def print_summary(report):
+    print(f"{'file':<28}{'dags':>5}{'tasks':>7}{'modules':>9}{'seconds':>10}{'peak MB':>10}{'rss MB':>9}")
+    for name, result in report["results"].items():
+        if result["status"] != "ok":
+            print(f"{name:<28} ERROR {result['error']}")
+            continue
+        rss = f"{result['rss_delta_mb']:.2f}" if result["rss_delta_mb"] is not None else "-"
+        print(f"{name:<28}{result['dags']:>5}{result['tasks']:>7}{result['modules_imported']:>9}"
+              f"{result['seconds']:>10.4f}{result['peak_memory_mb']:>10.2f}{rss:>9}")
+    print(f"Total parse time: {report['total_seconds']:.4f}s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark DAG file import time and memory")
+    parser.add_argument("--dags-dir", default=DEFAULT_DAGS_DIR)
+    parser.add_argument("--plugins-dir", default=DEFAULT_PLUGINS_DIR)
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh-interpreter imports per file; the median is reported")
+    parser.add_argument("--max-seconds", type=float,
+                        help="Exit non-zero when any file's median parse time exceeds this")
+    parser.add_argument("--output", default="dag_parse_results.json")
+    args = parser.parse_args(argv)
+
+    report = benchmark_dags(args.dags_dir, args.plugins_dir, args.repeat)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    print_summary(report)
+    print(f"\nResults saved to: {args.output}")
+    failed = [name for name, result in report["results"].items()
+              if result["status"] != "ok" or (args.max_seconds and result["seconds"] > args.max_seconds)]
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
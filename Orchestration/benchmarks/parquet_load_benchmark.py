@@ -0,0 +1,194 @@
+"""
+CSV vs Parquet Load Benchmark
+Purpose: Compare bytes uploaded and load time of the CSV bronze path against the Parquet path
+Usage: python parquet_load_benchmark.py --scale 10 --report parquet_benchmark.json
+Dependencies: pyarrow; duckdb (optional) is used as an in-process stand-in for COPY INTO
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, os.path.join(REPO_ROOT, "Orchestration", "ingestion"))
+
+from bronze_schema import DEFAULT_DATASETS_DIR, NULL_VALUES, SOURCE_FILES  # noqa: E402
+from parquet_converter import ParquetConverter  # noqa: E402
+
+
+def build_scaled_datasets(datasets_dir, target_dir, scale):
+    """
+    Write copies of the source files with data rows repeated `scale` times
+    """
+    for source in SOURCE_FILES.values():
+        src = os.path.join(datasets_dir, source["path"])
+        dst = os.path.join(target_dir, source["path"])
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+        with open(src, "rb") as f:
+            header = f.readline()
+            body = f.read()
+        newline = b"\r\n" if header.endswith(b"\r\n") else b"\n"
+        if body and not body.endswith(b"\n"):
+            body += newline
+        with open(dst, "wb") as f:
+            f.write(header)
+            for _ in range(scale):
+                f.write(body)
+    return target_dir
+
+
+class _Loader:
+    """
+    Loads a source into an in-process table, timing CSV parsing vs Parquet decoding
+    """
+
+    def __init__(self, threads):
+        try:
+            import duckdb
+            self.conn = duckdb.connect()
+            self.conn.execute(f"SET threads = {threads}")
+            self.engine = "duckdb"
+        except ImportError:
+            self.conn = None
+            self.engine = "pyarrow"
+
+    def load_csv(self, path, schema):
+        start = time.perf_counter()
+        if self.conn is not None:
+            columns = ", ".join(f"'{field.name}': '{_duckdb_type(field.type)}'" for field in schema)
+            nulls = ", ".join(f"'{value}'" for value in NULL_VALUES)
+            self.conn.execute(
+                f"CREATE OR REPLACE TABLE bench AS SELECT * FROM read_csv('{path}', header = true, "
+                f"delim = ',', quote = '\"', columns = {{{columns}}}, nullstr = [{nulls}])"
+            )
+            rows = self.conn.execute("SELECT COUNT(*) FROM bench").fetchone()[0]
+        else:
+            import pyarrow.csv as pa_csv
+            table = pa_csv.read_csv(path, convert_options=pa_csv.ConvertOptions(
+                null_values=NULL_VALUES, strings_can_be_null=True))
+            rows = table.num_rows
+        return rows, time.perf_counter() - start
+
+    def load_parquet(self, directory):
+        start = time.perf_counter()
+        if self.conn is not None:
+            self.conn.execute(
+                f"CREATE OR REPLACE TABLE bench AS SELECT * FROM read_parquet('{directory}/**/*.parquet')"
+            )
+            rows = self.conn.execute("SELECT COUNT(*) FROM bench").fetchone()[0]
+        else:
+            import pyarrow.dataset as ds
+            rows = ds.dataset(directory, format="parquet").to_table().num_rows
+        return rows, time.perf_counter() - start
+
+
+def _duckdb_type(arrow_type):
+    text = str(arrow_type)
+    if text == "int64":
+        return "BIGINT"
+    if text.startswith("date"):
+        return "DATE"
+    if text.startswith("timestamp"):
+        return "TIMESTAMP"
+    return "VARCHAR"
+
+
+def run_benchmark(datasets_dir, scale=1, compression="snappy", target_file_mb=128, threads=1, work_dir=None):
+    """
+    Convert every source and load both representations, returning a comparison report
+    """
+    work_dir = work_dir or tempfile.mkdtemp(prefix="parquet_bench_")
+    if scale > 1:
+        datasets_dir = build_scaled_datasets(datasets_dir, os.path.join(work_dir, "csv"), scale)
+
+    converter = ParquetConverter(
+        datasets_dir=datasets_dir,
+        output_dir=os.path.join(work_dir, "parquet"),
+        compression=compression,
+        target_file_mb=target_file_mb,
+    )
+    loader = _Loader(threads)
+
+    report = {
+        "timestamp": datetime.now().isoformat(),
+        "scale": scale,
+        "compression": compression,
+        "load_engine": loader.engine,
+        "sources": {},
+    }
+
+    for source_name in SOURCE_FILES:
+        conversion = converter.convert_file(source_name)
+        csv_rows, csv_seconds = loader.load_csv(conversion["source_path"], converter.arrow_schema(source_name))
+        parquet_rows, parquet_seconds = loader.load_parquet(conversion["output_dir"])
+
+        report["sources"][source_name] = {
+            "rows": csv_rows,
+            "rows_match": csv_rows == parquet_rows,
+            "csv_bytes": conversion["csv_bytes"],
+            "parquet_bytes": conversion["parquet_bytes"],
+            "parquet_files": conversion["files"],
+            "compression_ratio": round(conversion["csv_bytes"] / max(conversion["parquet_bytes"], 1), 2),
+            "conversion_seconds": conversion["elapsed_seconds"],
+            "csv_load_seconds": round(csv_seconds, 3),
+            "parquet_load_seconds": round(parquet_seconds, 3),
+            "load_speedup": round(csv_seconds / parquet_seconds, 2) if parquet_seconds else None,
+        }
+
+    sources = report["sources"].values()
+    report["totals"] = {
+        "csv_bytes": sum(s["csv_bytes"] for s in sources),
+        "parquet_bytes": sum(s["parquet_bytes"] for s in sources),
+        "csv_load_seconds": round(sum(s["csv_load_seconds"] for s in sources), 3),
+        "parquet_load_seconds": round(sum(s["parquet_load_seconds"] for s in sources), 3),
+        "conversion_seconds": round(sum(s["conversion_seconds"] for s in sources), 3),
+    }
+    report["totals"]["bytes_saved_pct"] = round(
+        100.0 * (1 - report["totals"]["parquet_bytes"] / report["totals"]["csv_bytes"]), 1)
+    return report, work_dir
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark CSV vs Parquet bronze loading on the repo datasets")
+    parser.add_argument("--datasets-dir", default=DEFAULT_DATASETS_DIR)
+    parser.add_argument("--scale", type=int, default=1, help="Repeat source rows N times before converting")
+    parser.add_argument("--compression", default="snappy", choices=["snappy", "zstd", "gzip", "none"])
+    parser.add_argument("--target-file-mb", type=float, default=128)
+    parser.add_argument("--threads", type=int, default=1, help="Load engine threads (1 = per-file COPY cost)")
+    parser.add_argument("--report", help="Write the JSON report to this path")
+    parser.add_argument("--keep-files", action="store_true", help="Keep the generated CSV/Parquet work directory")
+    args = parser.parse_args(argv)
+
+    report, work_dir = run_benchmark(
+        args.datasets_dir,
+        scale=args.scale,
+        compression=args.compression,
+        target_file_mb=args.target_file_mb,
+        threads=args.threads,
+    )
+
+    print(f"{'source':<15}{'rows':>12}{'csv MB':>10}{'parquet MB':>12}{'csv load s':>12}{'pq load s':>11}")
+    for name, s in report["sources"].items():
+        print(f"{name:<15}{s['rows']:>12}{s['csv_bytes'] / 1e6:>10.2f}{s['parquet_bytes'] / 1e6:>12.2f}"
+              f"{s['csv_load_seconds']:>12.3f}{s['parquet_load_seconds']:>11.3f}")
+    totals = report["totals"]
+    print(f"Bytes uploaded: {totals['csv_bytes'] / 1e6:.2f} MB CSV vs {totals['parquet_bytes'] / 1e6:.2f} MB Parquet "
+          f"({totals['bytes_saved_pct']}% saved)")
+
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report saved to: {args.report}")
+
+    if not args.keep_files:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
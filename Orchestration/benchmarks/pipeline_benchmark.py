@@ -0,0 +1,339 @@
+"""
+End-to-End Pipeline Benchmark
+Purpose: Time the bronze load, silver/gold transformations, health checks and backups at several
+         data scales on the local backend, and gate changes against a stored baseline
+Usage: python pipeline_benchmark.py --scales 1,10 --output benchmark_results.json
+       python pipeline_benchmark.py --scales 1,10 --baseline benchmark_baseline.json --threshold wall_time_seconds=0.3
+       python pipeline_benchmark.py --scales 1,10 --save-baseline benchmark_baseline.json
+Dependencies: duckdb, numpy, pandas; psutil (optional) for peak RSS, otherwise tracemalloc
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, os.path.join(REPO_ROOT, "Orchestration", "ingestion"))
+sys.path.insert(0, os.path.join(REPO_ROOT, "Orchestration", "local_backend"))
+sys.path.insert(0, os.path.join(REPO_ROOT, "Orchestration", "monitoring", "scripts"))
+
+from bronze_schema import DEFAULT_DATASETS_DIR  # noqa: E402
+from local_warehouse import LocalWarehouse  # noqa: E402
+from synthetic_data import SyntheticDataGenerator  # noqa: E402
+from health_checks import PipelineHealthChecker  # noqa: E402
+from backup_scripts import PipelineBackupManager  # noqa: E402
+
+try:
+    import psutil
+except ImportError:  # Fall back to Python-heap tracking
+    psutil = None
+
+STAGES = ("bronze_load", "silver_transform", "gold_transform", "health_checks", "backup")
+
+# Allowed relative change before a metric counts as a regression
+# (higher is worse for all metrics except rows_per_second)
+DEFAULT_THRESHOLDS = {
+    "wall_time_seconds": 0.25,
+    "rows_per_second": 0.25,
+    "peak_memory_mb": 0.30,
+    "query_count": 0.0,
+}
+HIGHER_IS_BETTER = {"rows_per_second"}
+
+# Stages below these are dominated by noise; timing / memory metrics are not gated under them
+DEFAULT_MIN_SECONDS = 0.05
+DEFAULT_MIN_MEMORY_MB = 5.0
+
+
+class _PeakMemory:
+    """
+    Tracks peak memory above the starting point while a stage runs
+
+    With psutil the process RSS is sampled from a thread, so DuckDB's native allocations count;
+    without it only Python allocations (tracemalloc) are seen
+    """
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.peak_bytes = 0
+        self._stop = threading.Event()
+
+    def __enter__(self):
+        if psutil is None:
+            tracemalloc.start()
+            return self
+        process = psutil.Process()
+        self._baseline = process.memory_info().rss
+        self._peak = self._baseline
+
+        def sample():
+            while not self._stop.is_set():
+                self._peak = max(self._peak, process.memory_info().rss)
+                self._stop.wait(self.interval)
+
+        self._thread = threading.Thread(target=sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        if psutil is None:
+            self.peak_bytes = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            return
+        self._stop.set()
+        self._thread.join()
+        self._peak = max(self._peak, psutil.Process().memory_info().rss)
+        self.peak_bytes = self._peak - self._baseline
+
+
+class PipelineBenchmark:
+    """
+    Runs each pipeline stage against a fresh LocalWarehouse and collects per-stage metrics
+    """
+
+    def __init__(self, scales=(1, 10), repeat=1, latency_ms=0, workers=None, seed=42,
+                 datasets_dir=DEFAULT_DATASETS_DIR, data_dir=None):
+        self.scales = scales
+        self.repeat = repeat
+        self.latency_ms = latency_ms
+        self.workers = workers
+        self.seed = seed
+        self.datasets_dir = datasets_dir
+        self.data_dir = data_dir
+
+    def prepare_datasets(self, scale, work_dir):
+        """
+        Scale 1 is the repo datasets; larger scales are generated once and reused across repeats
+        """
+        if scale == 1:
+            return self.datasets_dir
+        target = os.path.join(self.data_dir or work_dir, f"scale_{scale}")
+        if not os.path.exists(os.path.join(target, "source_crm", "sales_details.csv")):
+            print(f"Generating scale {scale} datasets in {target}...")
+            SyntheticDataGenerator(target, scale=scale, seed=self.seed, workers=self.workers,
+                                   datasets_dir=self.datasets_dir).generate()
+        return target
+
+    def _stage(self, warehouse, function, rows):
+        queries_before = len(warehouse.query_history)
+        with _PeakMemory() as memory:
+            start = time.perf_counter()
+            function()
+            elapsed = time.perf_counter() - start
+        history = warehouse.query_history[queries_before:]
+        row_count = rows() if rows else sum(query["rows_produced"] for query in history)
+        return {
+            "wall_time_seconds": round(elapsed, 4),
+            "rows": row_count,
+            "rows_per_second": round(row_count / elapsed, 1) if elapsed else 0.0,
+            "peak_memory_mb": round(memory.peak_bytes / 1024 / 1024, 2),
+            "query_count": len(history),
+        }
+
+    def run_once(self, datasets_dir, backup_dir):
+        warehouse = LocalWarehouse(latency_ms=self.latency_ms, datasets_dir=datasets_dir)
+        try:
+            warehouse.seed(layers=())
+            cursor = warehouse.connect().cursor()
+
+            def table_rows(schema):
+                def count():
+                    tables = warehouse.db.execute(
+                        "SELECT table_name FROM information_schema.tables WHERE table_schema = ?", [schema]).fetchall()
+                    return sum(warehouse.db.execute(f"SELECT COUNT(*) FROM {schema}.{table}").fetchone()[0]
+                               for (table,) in tables)
+                return count
+
+            checker = PipelineHealthChecker(snowflake_config={}, connect=warehouse.connect)
+            backups = PipelineBackupManager(snowflake_config={}, local_backup_path=backup_dir,
+                                            connect=warehouse.connect)
+
+            def run_backup():
+                backups.backup_database_schemas()
+                backups.backup_stored_procedures()
+
+            return {
+                "bronze_load": self._stage(warehouse, lambda: cursor.execute("CALL bronze.load_bronze_layer()"),
+                                           table_rows("bronze")),
+                "silver_transform": self._stage(warehouse, lambda: warehouse.build_silver_layer(cursor),
+                                                table_rows("silver")),
+                "gold_transform": self._stage(warehouse, lambda: warehouse.build_gold_layer(cursor),
+                                              table_rows("gold")),
+                "health_checks": self._stage(warehouse, checker.run_comprehensive_health_check, None),
+                "backup": self._stage(warehouse, run_backup, None),
+            }
+        finally:
+            warehouse.close()
+
+    def run(self):
+        """
+        Benchmark every scale and return the results report (median of the repeats per metric)
+        """
+        work_dir = tempfile.mkdtemp(prefix="pipeline_benchmark_")
+        results = {}
+        try:
+            for scale in self.scales:
+                datasets_dir = self.prepare_datasets(scale, work_dir)
+                runs = []
+                for attempt in range(self.repeat):
+                    print(f"Scale {scale}: run {attempt + 1}/{self.repeat}")
+                    backup_dir = os.path.join(work_dir, "backups", f"{scale}_{attempt}")
+                    runs.append(self.run_once(datasets_dir, backup_dir))
+                results[f"scale_{scale}"] = {
+                    stage: {metric: statistics.median_low(run[stage][metric] for run in runs)
+                            for metric in runs[0][stage]}
+                    for stage in STAGES
+                }
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+        return {
+            "timestamp": datetime.now().isoformat(),
+            "environment": {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "cpu_count": os.cpu_count(),
+                "memory_source": "rss" if psutil else "tracemalloc",
+            },
+            "config": {
+                "scales": list(self.scales),
+                "repeat": self.repeat,
+                "latency_ms": self.latency_ms,
+                "seed": self.seed,
+            },
+            "results": results,
+        }
+
+
+def compare_to_baseline(report, baseline, thresholds=None, min_seconds=DEFAULT_MIN_SECONDS,
+                        min_memory_mb=DEFAULT_MIN_MEMORY_MB):
+    """
+    Compare each scale/stage/metric with the baseline and flag changes beyond the thresholds
+    """
+    thresholds = dict(DEFAULT_THRESHOLDS, **(thresholds or {}))
+    comparisons = []
+    for scale, stages in report["results"].items():
+        for stage, metrics in stages.items():
+            base_metrics = baseline.get("results", {}).get(scale, {}).get(stage)
+            if base_metrics is None:
+                continue
+            noise = set()
+            if max(metrics["wall_time_seconds"], base_metrics["wall_time_seconds"]) < min_seconds:
+                noise.update(("wall_time_seconds", "rows_per_second"))
+            if max(metrics["peak_memory_mb"], base_metrics["peak_memory_mb"]) < min_memory_mb:
+                noise.add("peak_memory_mb")
+            for metric, threshold in thresholds.items():
+                if metric not in metrics or metric not in base_metrics:
+                    continue
+                current, previous = metrics[metric], base_metrics[metric]
+                change = (current - previous) / previous if previous else (0.0 if current == previous else 1.0)
+                worse = -change if metric in HIGHER_IS_BETTER else change
+                comparisons.append({
+                    "scale": scale,
+                    "stage": stage,
+                    "metric": metric,
+                    "baseline": previous,
+                    "current": current,
+                    "change_pct": round(change * 100, 2),
+                    "threshold_pct": round(threshold * 100, 2),
+                    "status": "regressed" if metric not in noise and worse > threshold else "passed",
+                })
+
+    regressions = [c for c in comparisons if c["status"] == "regressed"]
+    return {
+        "status": "failed" if regressions else "passed",
+        "baseline_timestamp": baseline.get("timestamp"),
+        "thresholds": thresholds,
+        "regressions": regressions,
+        "comparisons": comparisons,
+    }
+
+
+def print_summary(report):
+    print(f"\n{'scale':<10} {'stage':<18} {'seconds':>9} {'rows/s':>12} {'peak MB':>9} {'queries':>8}")
+    for scale, stages in report["results"].items():
+        for stage, m in stages.items():
+            print(f"{scale:<10} {stage:<18} {m['wall_time_seconds']:>9.3f} {m['rows_per_second']:>12,.0f} "
+                  f"{m['peak_memory_mb']:>9.1f} {m['query_count']:>8}")
+    comparison = report.get("comparison")
+    if comparison:
+        print(f"\nBaseline comparison: {comparison['status'].upper()}")
+        for c in comparison["regressions"]:
+            print(f"  REGRESSION {c['scale']} {c['stage']} {c['metric']}: {c['baseline']} -> {c['current']} "
+                  f"({c['change_pct']:+.1f}%, threshold {c['threshold_pct']:.0f}%)")
+
+
+def _parse_thresholds(values):
+    thresholds = {}
+    for value in values or []:
+        metric, _, limit = value.partition("=")
+        if metric not in DEFAULT_THRESHOLDS:
+            raise ValueError(f"Unknown metric '{metric}' (expected one of {sorted(DEFAULT_THRESHOLDS)})")
+        thresholds[metric] = float(limit)
+    return thresholds
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the pipeline stages on the local backend")
+    parser.add_argument("--scales", default="1,10", help="Comma-separated data scales")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per scale; the median is reported")
+    parser.add_argument("--latency-ms", type=int, default=0, help="Simulated per-query round trip")
+    parser.add_argument("--workers", type=int, default=None, help="Processes for synthetic data generation")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--datasets-dir", default=DEFAULT_DATASETS_DIR)
+    parser.add_argument("--data-dir", help="Keep generated datasets here to reuse them between invocations")
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--baseline", help="Baseline results JSON to gate against")
+    parser.add_argument("--threshold", action="append", metavar="METRIC=FRACTION",
+                        help="Override a regression threshold, e.g. wall_time_seconds=0.3 (repeatable)")
+    parser.add_argument("--min-seconds", type=float, default=DEFAULT_MIN_SECONDS,
+                        help="Do not gate timing metrics for stages faster than this")
+    parser.add_argument("--min-memory-mb", type=float, default=DEFAULT_MIN_MEMORY_MB,
+                        help="Do not gate peak memory for stages using less than this")
+    parser.add_argument("--save-baseline", help="Also write the results to this path as the new baseline")
+    args = parser.parse_args(argv)
+    try:
+        thresholds = _parse_thresholds(args.threshold)
+    except ValueError as e:
+        parser.error(str(e))
+
+    benchmark = PipelineBenchmark(
+        scales=[int(scale) for scale in args.scales.split(",")],
+        repeat=args.repeat,
+        latency_ms=args.latency_ms,
+        workers=args.workers,
+        seed=args.seed,
+        datasets_dir=args.datasets_dir,
+        data_dir=args.data_dir,
+    )
+    report = benchmark.run()
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        report["comparison"] = compare_to_baseline(report, baseline, thresholds,
+                                                   args.min_seconds, args.min_memory_mb)
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump({key: report[key] for key in ("timestamp", "environment", "config", "results")}, f, indent=2)
+        print(f"Baseline saved to: {args.save_baseline}")
+
+    print_summary(report)
+    print(f"\nResults saved to: {args.output}")
+    return 1 if report.get("comparison", {}).get("status") == "failed" else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,484 @@
+"""
+Synthetic Source Data Generator
+Purpose: Generate CRM/ERP source files at 10x-1000x the bundled volumes with the
+         cross-system keys intact, plus optional daily incremental drops
+Usage: python synthetic_data.py --output-dir /tmp/synthetic --scale 100 --workers 8
+       python synthetic_data.py --output-dir /tmp/synthetic --scale 10 --daily-drops 7 --start-date 2014-02-01
+Dependencies: numpy, pandas; distributions are learned from Datasets/source_crm and Datasets/source_erp
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import re
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, os.path.join(REPO_ROOT, "Orchestration", "ingestion"))
+
+from bronze_schema import DEFAULT_DATASETS_DIR, SOURCE_FILES  # noqa: E402
+
+# Independent RNG streams, so a chunk's rows depend only on (seed, stream, chunk index)
+CUSTOMER_STREAM, SALES_STREAM, DROP_STREAM = 1, 2, 3
+
+_VALID_CUSTOMER_KEY = re.compile(r"^AW\d{8}$")
+_VALID_YYYYMMDD = re.compile(r"^(19|20)\d{6}$")
+
+
+def _read_source(datasets_dir, source_name):
+    path = os.path.join(datasets_dir, SOURCE_FILES[source_name]["path"])
+    with open(path, "rb") as f:
+        header = f.readline()
+    newline = "\r\n" if header.endswith(b"\r\n") else "\n"
+    frame = pd.read_csv(path, dtype=str, keep_default_na=False)
+    return frame, header.decode().rstrip("\r\n"), newline
+
+
+class SourceProfile:
+    """
+    Column distributions and key relationships learned from the bundled source files
+
+    Attribute columns keep their raw values (whitespace, 'USA' vs 'US', blanks), so generated
+    files exercise the same cleansing rules and data quality checks as the originals
+    """
+
+    def __init__(self, datasets_dir=DEFAULT_DATASETS_DIR):
+        frames = {}
+        self.headers = {}
+        for source_name in SOURCE_FILES:
+            frames[source_name], header, newline = _read_source(datasets_dir, source_name)
+            self.headers[source_name] = (header, newline)
+        self.columns = {name: list(frame.columns) for name, frame in frames.items()}
+
+        self._learn_customers(frames["cust_info"], frames["CUST_AZ12"], frames["LOC_A101"])
+        self._learn_products(frames["prd_info"], frames["PX_CAT_G1V2"])
+        self._learn_sales(frames["sales_details"])
+
+    def _learn_customers(self, customers, az12, locations):
+        valid = customers["cst_id"].str.fullmatch(r"\d+") & customers["cst_key"].str.match(_VALID_CUSTOMER_KEY)
+        good = customers[valid]
+        ids = good["cst_id"].astype(np.int64)
+
+        self.customer_id_start = int(ids.min())
+        self.customer_count = int(ids.nunique())
+        self.customer_pools = {column: good[column].to_numpy() for column in customers.columns[2:]}
+        # Duplicate business keys and malformed rows are reproduced at the observed rates
+        self.duplicate_rate = float(ids.duplicated().sum()) / self.customer_count
+        self.malformed_rows = customers[~valid].to_numpy()
+        self.malformed_rate = len(self.malformed_rows) / float(self.customer_count)
+
+        # CUST_AZ12.CID is cst_key with or without a 'NAS' prefix; LOC_A101.CID is 'AW-' + digits
+        self.az12_coverage = len(az12) / float(self.customer_count)
+        self.nas_rate = float(az12["CID"].str.startswith("NAS").mean())
+        self.az12_pools = {column: az12[column].to_numpy() for column in az12.columns[1:]}
+        self.location_coverage = len(locations) / float(self.customer_count)
+        self.location_pools = {column: locations[column].to_numpy() for column in locations.columns[1:]}
+
+    def _learn_products(self, products, categories):
+        self.products = products.to_numpy()
+        self.product_columns = list(products.columns)
+        self.categories = categories.to_numpy()
+
+    def _learn_sales(self, sales):
+        self.order_number_start = int(sales["sls_ord_num"].str[2:].astype(np.int64).min())
+        lines = sales.groupby("sls_ord_num", sort=False).size().value_counts(normalize=True).sort_index()
+        self.order_count = int(sales["sls_ord_num"].nunique())
+        self.lines_per_order = (lines.index.to_numpy(), lines.to_numpy())
+
+        # Product popularity over the product numbers sales refer to (prd_key without category prefix)
+        popularity = sales["sls_prd_key"].value_counts(normalize=True)
+        self.sales_products = popularity.index.to_numpy()
+        self.sales_product_weights = popularity.to_numpy()
+
+        numeric = sales[["sls_sales", "sls_quantity", "sls_price"]].apply(pd.to_numeric, errors="coerce")
+        clean = (numeric["sls_price"] > 0) & (numeric["sls_sales"] == numeric["sls_quantity"] * numeric["sls_price"])
+        prices = numeric[clean].groupby(sales.loc[clean, "sls_prd_key"])["sls_price"].median()
+        self.product_prices = prices.reindex(self.sales_products).fillna(prices.median()).astype(np.int64).to_numpy()
+        self.quantities = numeric.loc[clean, "sls_quantity"].astype(np.int64).to_numpy()
+        self.dirty_amounts = sales.loc[~clean, ["sls_sales", "sls_quantity", "sls_price"]].to_numpy()
+        self.dirty_amount_rate = float((~clean).mean())
+
+        valid_dates = sales["sls_order_dt"].str.match(_VALID_YYYYMMDD)
+        order_dates = pd.to_datetime(sales.loc[valid_dates, "sls_order_dt"], format="%Y%m%d")
+        self.order_dates = order_dates.to_numpy(dtype="datetime64[D]")
+        self.invalid_order_dates = sales.loc[~valid_dates, "sls_order_dt"].to_numpy()
+        self.invalid_date_rate = float((~valid_dates).mean())
+        ship = pd.to_datetime(sales.loc[valid_dates, "sls_ship_dt"], format="%Y%m%d", errors="coerce")
+        due = pd.to_datetime(sales.loc[valid_dates, "sls_due_dt"], format="%Y%m%d", errors="coerce")
+        self.ship_offsets = (ship - order_dates).dt.days.dropna().astype(np.int64).to_numpy()
+        self.due_offsets = (due - order_dates).dt.days.dropna().astype(np.int64).to_numpy()
+        self.fallback_dates = sales.loc[~valid_dates, ["sls_ship_dt", "sls_due_dt"]].to_numpy()
+
+    def summary(self):
+        return {
+            "customers": self.customer_count,
+            "orders": self.order_count,
+            "products": len(self.products),
+            "categories": len(self.categories),
+            "nas_prefix_rate": round(self.nas_rate, 4),
+            "duplicate_customer_rate": round(self.duplicate_rate, 6),
+            "dirty_amount_rate": round(self.dirty_amount_rate, 6),
+            "invalid_order_date_rate": round(self.invalid_date_rate, 6),
+        }
+
+
+# ---------------------------------------------------------------------- #
+# Worker side: module-level state and pure chunk functions (picklable)
+# ---------------------------------------------------------------------- #
+_STATE = {}
+
+
+def _init_worker(profile, plan):
+    _STATE["profile"] = profile
+    _STATE["plan"] = plan
+
+
+def _sample(rng, pool, size):
+    return pool[rng.integers(0, len(pool), size=size)]
+
+
+def _to_csv(columns, data, newline):
+    if not len(next(iter(data.values()))):
+        return ""
+    return pd.DataFrame(data, columns=columns).to_csv(header=False, index=False, lineterminator=newline)
+
+
+def _yyyymmdd(days):
+    index = pd.DatetimeIndex(days)
+    return (index.year * 10000 + index.month * 100 + index.day).astype(str).to_numpy()
+
+
+def _customer_rows(rng, profile, ids, create_dates=None):
+    """
+    cust_info, CUST_AZ12 and LOC_A101 rows for the given customer ids
+    """
+    n = len(ids)
+    digits = pd.Series(ids).astype(str).str.zfill(8).to_numpy(dtype=object)
+    keys = "AW" + digits
+    pools = profile.customer_pools
+
+    customers = {"cst_id": ids.astype(str), "cst_key": keys}
+    for column, pool in pools.items():
+        customers[column] = _sample(rng, pool, n)
+    if create_dates is not None:
+        customers["cst_create_date"] = create_dates
+
+    # Re-issued business keys with a later create date, as seen in the source
+    duplicates = np.flatnonzero(rng.random(n) < profile.duplicate_rate)
+    if len(duplicates):
+        extra = {column: values[duplicates] for column, values in customers.items()}
+        for column in ("cst_marital_status", "cst_gndr"):
+            extra[column] = _sample(rng, pools[column], len(duplicates))
+        customers = {column: np.concatenate([customers[column], extra[column]]) for column in customers}
+
+    malformed = rng.binomial(n, profile.malformed_rate) if profile.malformed_rate else 0
+    if malformed:
+        rows = _sample(rng, profile.malformed_rows, malformed)
+        for position, column in enumerate(customers):
+            customers[column] = np.concatenate([customers[column], rows[:, position]])
+
+    in_az12 = rng.random(n) < min(profile.az12_coverage, 1.0)
+    prefix = np.where(rng.random(in_az12.sum()) < profile.nas_rate, "NAS", "")
+    az12 = {"CID": prefix + keys[in_az12]}
+    for column, pool in profile.az12_pools.items():
+        az12[column] = _sample(rng, pool, len(az12["CID"]))
+
+    in_locations = rng.random(n) < min(profile.location_coverage, 1.0)
+    locations = {"CID": "AW-" + digits[in_locations]}
+    for column, pool in profile.location_pools.items():
+        locations[column] = _sample(rng, pool, len(locations["CID"]))
+
+    return {
+        "cust_info": customers,
+        "CUST_AZ12": az12,
+        "LOC_A101": locations,
+    }
+
+
+def _sales_rows(rng, profile, plan, first_order, n_orders, customer_total, order_date=None):
+    """
+    sales_details rows for orders [first_order, first_order + n_orders)
+    """
+    line_values, line_probs = profile.lines_per_order
+    lines = rng.choice(line_values, p=line_probs, size=n_orders)
+    order_index = np.repeat(np.arange(first_order, first_order + n_orders, dtype=np.int64), lines)
+    total = len(order_index)
+
+    # One customer and order date per order, shared by all its lines
+    customers = rng.integers(0, customer_total, size=n_orders) + profile.customer_id_start
+    if order_date is None:
+        ordered = _sample(rng, profile.order_dates, n_orders)
+        invalid = rng.random(n_orders) < profile.invalid_date_rate
+    else:
+        ordered = np.full(n_orders, np.datetime64(order_date, "D"))
+        invalid = np.zeros(n_orders, dtype=bool)
+    ship = ordered + _sample(rng, profile.ship_offsets, n_orders).astype("timedelta64[D]")
+    due = ordered + _sample(rng, profile.due_offsets, n_orders).astype("timedelta64[D]")
+    order_dt, ship_dt, due_dt = _yyyymmdd(ordered), _yyyymmdd(ship), _yyyymmdd(due)
+    if invalid.any():
+        fallback = _sample(rng, profile.fallback_dates, int(invalid.sum()))
+        order_dt[invalid] = _sample(rng, profile.invalid_order_dates, int(invalid.sum()))
+        ship_dt[invalid], due_dt[invalid] = fallback[:, 0], fallback[:, 1]
+
+    # Products follow the learned popularity; lines of one order never repeat a product
+    n_products = len(profile.sales_products) * plan["product_scale"]
+    weights = np.tile(profile.sales_product_weights, plan["product_scale"]) / plan["product_scale"]
+    products = rng.choice(n_products, p=weights, size=total)
+    while True:
+        repeated = pd.DataFrame({"o": order_index, "p": products}).duplicated().to_numpy()
+        if not repeated.any():
+            break
+        products[repeated] = (products[repeated] + 1) % n_products
+    base_products = products % len(profile.sales_products)
+    variants = products // len(profile.sales_products)
+    product_keys = profile.sales_products[base_products].astype(object)
+    if plan["product_scale"] > 1:
+        product_keys = np.where(variants > 0, product_keys + "-V" + variants.astype(str), product_keys)
+
+    quantity = _sample(rng, profile.quantities, total)
+    price = profile.product_prices[base_products]
+    amounts = np.column_stack([(quantity * price).astype(str), quantity.astype(str), price.astype(str)])
+    dirty = np.flatnonzero(rng.random(total) < profile.dirty_amount_rate)
+    if len(dirty):
+        amounts[dirty] = _sample(rng, profile.dirty_amounts, len(dirty))
+
+    per_order = np.repeat(np.arange(n_orders), lines)
+    return {
+        "sls_ord_num": "SO" + (order_index + profile.order_number_start).astype(str).astype(object),
+        "sls_prd_key": product_keys,
+        "sls_cust_id": customers[per_order].astype(str),
+        "sls_order_dt": order_dt[per_order],
+        "sls_ship_dt": ship_dt[per_order],
+        "sls_due_dt": due_dt[per_order],
+        "sls_sales": amounts[:, 0],
+        "sls_quantity": amounts[:, 1],
+        "sls_price": amounts[:, 2],
+    }
+
+
+def _render(profile, source_name, data):
+    header, newline = profile.headers[source_name]
+    return _to_csv(profile.columns[source_name], dict(zip(profile.columns[source_name], data.values())), newline)
+
+
+def _customer_chunk(task):
+    chunk_index, first, count = task
+    profile, plan = _STATE["profile"], _STATE["plan"]
+    rng = np.random.default_rng([plan["seed"], CUSTOMER_STREAM, chunk_index])
+    ids = np.arange(first, first + count, dtype=np.int64) + profile.customer_id_start
+    rows = _customer_rows(rng, profile, ids)
+    return {source_name: _render(profile, source_name, data) for source_name, data in rows.items()}
+
+
+def _sales_chunk(task):
+    chunk_index, first, count = task
+    profile, plan = _STATE["profile"], _STATE["plan"]
+    rng = np.random.default_rng([plan["seed"], SALES_STREAM, chunk_index])
+    rows = _sales_rows(rng, profile, plan, first, count, plan["customers"])
+    return {"sales_details": _render(profile, "sales_details", rows)}
+
+
+def _chunks(total, chunk_size):
+    return [(index, first, min(chunk_size, total - first))
+            for index, first in enumerate(range(0, total, chunk_size))]
+
+
+class SyntheticDataGenerator:
+    """
+    Streams scaled source files to disk using multiple processes and deterministic seeds:
+    the same seed, scale and chunk size produce byte-identical files for any worker count
+    """
+
+    def __init__(self, output_dir, scale=10, product_scale=1, seed=42, workers=None,
+                 chunk_rows=100000, datasets_dir=DEFAULT_DATASETS_DIR, profile=None):
+        self.output_dir = output_dir
+        self.scale = scale
+        self.product_scale = product_scale
+        self.seed = seed
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_rows = chunk_rows
+        self.profile = profile or SourceProfile(datasets_dir)
+        self.plan = {
+            "seed": seed,
+            "product_scale": product_scale,
+            "customers": self.profile.customer_count * scale,
+            "orders": self.profile.order_count * scale,
+        }
+
+    def _open(self, base_dir, source_name):
+        path = os.path.join(base_dir, SOURCE_FILES[source_name]["path"])
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        header, newline = self.profile.headers[source_name]
+        f = open(path, "w", newline="")
+        f.write(header + newline)
+        return f
+
+    def _stream(self, function, tasks, files, counts):
+        if self.workers > 1 and len(tasks) > 1:
+            pool = multiprocessing.Pool(self.workers, initializer=_init_worker, initargs=(self.profile, self.plan))
+            results = pool.imap(function, tasks)
+        else:
+            pool = None
+            _init_worker(self.profile, self.plan)
+            results = map(function, tasks)
+        try:
+            for chunk in results:
+                for source_name, text in chunk.items():
+                    files[source_name].write(text)
+                    counts[source_name] += text.count("\n")
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+
+    def _write_reference_tables(self, base_dir, counts):
+        profile = self.profile
+        products = []
+        next_id = int(max(int(row[0]) for row in profile.products)) + 1
+        for variant in range(self.product_scale):
+            for row in profile.products:
+                row = list(row)
+                if variant:
+                    row[0] = str(next_id)
+                    next_id += 1
+                    row[1] = f"{row[1]}-V{variant}"
+                    row[2] = f"{row[2]} V{variant}"
+                products.append(row)
+        for source_name, rows in (("prd_info", products), ("PX_CAT_G1V2", profile.categories)):
+            with self._open(base_dir, source_name) as f:
+                f.write(_to_csv(profile.columns[source_name],
+                                dict(zip(profile.columns[source_name], np.array(rows, dtype=object).T)),
+                                profile.headers[source_name][1]))
+            counts[source_name] = len(rows)
+
+    def generate(self):
+        """
+        Write all six source files for the configured scale and return a generation report
+        """
+        start = time.perf_counter()
+        counts = {source_name: 0 for source_name in SOURCE_FILES}
+        self._write_reference_tables(self.output_dir, counts)
+
+        customer_files = {name: self._open(self.output_dir, name) for name in ("cust_info", "CUST_AZ12", "LOC_A101")}
+        try:
+            self._stream(_customer_chunk, _chunks(self.plan["customers"], self.chunk_rows), customer_files, counts)
+        finally:
+            for f in customer_files.values():
+                f.close()
+
+        # Chunk orders so a chunk holds roughly chunk_rows lines
+        lines_mean = float(np.dot(*self.profile.lines_per_order))
+        order_chunk = max(1, int(self.chunk_rows / lines_mean))
+        with self._open(self.output_dir, "sales_details") as f:
+            self._stream(_sales_chunk, _chunks(self.plan["orders"], order_chunk), {"sales_details": f}, counts)
+
+        return self._report(self.output_dir, counts, start)
+
+    def generate_daily_drops(self, days, start_date, new_customers_per_day=None, orders_per_day=None,
+                             update_rate=0.001):
+        """
+        Write one directory per day (drops/YYYY-MM-DD/source_crm|source_erp/...) holding that day's
+        new customers, re-sent customer updates and orders, numbered after the base volumes
+        """
+        profile, plan = self.profile, self.plan
+        new_customers_per_day = new_customers_per_day or max(1, plan["customers"] // 365)
+        orders_per_day = orders_per_day or max(1, plan["orders"] // 365)
+        start_day = datetime.strptime(start_date, "%Y-%m-%d").date() if isinstance(start_date, str) else start_date
+        reports = []
+
+        for day in range(days):
+            start = time.perf_counter()
+            drop_date = start_day + timedelta(days=day)
+            drop_dir = os.path.join(self.output_dir, "drops", drop_date.isoformat())
+            rng = np.random.default_rng([self.seed, DROP_STREAM, day])
+            counts = {}
+
+            known = plan["customers"] + day * new_customers_per_day
+            new_ids = np.arange(known, known + new_customers_per_day, dtype=np.int64)
+            updated = rng.choice(known, size=min(known, rng.binomial(known, update_rate)), replace=False)
+            ids = np.concatenate([new_ids, np.sort(updated)]) + profile.customer_id_start
+            create_dates = np.full(len(ids), drop_date.isoformat(), dtype=object)
+            customer_rows = _customer_rows(rng, profile, ids, create_dates)
+
+            first_order = plan["orders"] + day * orders_per_day
+            sales = _sales_rows(rng, profile, plan, first_order, orders_per_day, known + new_customers_per_day,
+                                order_date=drop_date)
+
+            for source_name, data in list(customer_rows.items()) + [("sales_details", sales)]:
+                with self._open(drop_dir, source_name) as f:
+                    text = _render(profile, source_name, data)
+                    f.write(text)
+                counts[source_name] = text.count("\n")
+            report = self._report(drop_dir, counts, start)
+            report["date"] = drop_date.isoformat()
+            report["new_customers"] = int(len(new_ids))
+            report["updated_customers"] = int(len(updated))
+            reports.append(report)
+        return reports
+
+    def _report(self, base_dir, counts, start):
+        files = {}
+        for source_name, rows in counts.items():
+            path = os.path.join(base_dir, SOURCE_FILES[source_name]["path"])
+            files[source_name] = {"path": path, "rows": rows, "bytes": os.path.getsize(path)}
+        return {
+            "timestamp": datetime.now().isoformat(),
+            "output_dir": base_dir,
+            "scale": self.scale,
+            "seed": self.seed,
+            "workers": self.workers,
+            "files": files,
+            "total_rows": sum(f["rows"] for f in files.values()),
+            "total_bytes": sum(f["bytes"] for f in files.values()),
+            "elapsed_seconds": round(time.perf_counter() - start, 3),
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate scaled, referentially consistent source files")
+    parser.add_argument("--datasets-dir", default=DEFAULT_DATASETS_DIR)
+    parser.add_argument("--output-dir", required=True)
+    parser.add_argument("--scale", type=int, default=10, help="Multiply customers and orders by N")
+    parser.add_argument("--product-scale", type=int, default=1, help="Add N-1 variants of every product")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--chunk-rows", type=int, default=100000)
+    parser.add_argument("--daily-drops", type=int, default=0, help="Also write N daily incremental drops")
+    parser.add_argument("--start-date", default=date.today().isoformat(), help="First drop date (YYYY-MM-DD)")
+    parser.add_argument("--skip-base", action="store_true", help="Only write the daily drops")
+    parser.add_argument("--report", help="Write the JSON report to this path")
+    args = parser.parse_args(argv)
+
+    generator = SyntheticDataGenerator(
+        args.output_dir,
+        scale=args.scale,
+        product_scale=args.product_scale,
+        seed=args.seed,
+        workers=args.workers,
+        chunk_rows=args.chunk_rows,
+        datasets_dir=args.datasets_dir,
+    )
+    report = {"profile": generator.profile.summary()}
+    if not args.skip_base:
+        report["base"] = generator.generate()
+        print(f"Wrote {report['base']['total_rows']} rows ({report['base']['total_bytes'] / 1e6:.1f} MB) "
+              f"in {report['base']['elapsed_seconds']}s to {args.output_dir}")
+    if args.daily_drops:
+        report["drops"] = generator.generate_daily_drops(args.daily_drops, args.start_date)
+        print(f"Wrote {len(report['drops'])} daily drops under {os.path.join(args.output_dir, 'drops')}")
+
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report saved to: {args.report}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
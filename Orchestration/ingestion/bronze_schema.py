@@ -0,0 +1,112 @@
+"""
+Bronze Layer Source Schema
+Purpose: Single source of truth for source file -> bronze table mapping used by local ingestion tooling
+Dependencies: Scripts/Bronze/03_table_ddl.sql (parsed at runtime, never duplicated here)
+"""
+
+import os
+import re
+from collections import OrderedDict
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+DEFAULT_DDL_PATH = os.path.join(REPO_ROOT, "Scripts", "Bronze", "03_table_ddl.sql")
+DEFAULT_DATASETS_DIR = os.path.join(REPO_ROOT, "Datasets")
+
+# Same NULL representations as bronze.my_csv_format (01_file_formats.sql)
+NULL_VALUES = ["", "NULL", "null"]
+
+# Columns filled by Snowflake during the load rather than read from source files
+AUDIT_COLUMNS = ("dwh_loaded_at",)
+
+# Source files as delivered to S3, keyed by the name fragment the bronze
+# load procedure matches on (see PATTERN clauses in 04_load_procedure.sql)
+SOURCE_FILES = OrderedDict([
+    ("cust_info", {
+        "path": "source_crm/cust_info.csv",
+        "table": "crm_cust_info",
+        "stage": "crm_stage",
+        "business_key": ["cst_id"],
+    }),
+    ("prd_info", {
+        "path": "source_crm/prd_info.csv",
+        "table": "crm_prd_info",
+        "stage": "crm_stage",
+        "business_key": ["prd_id"],
+    }),
+    ("sales_details", {
+        "path": "source_crm/sales_details.csv",
+        "table": "crm_sales_details",
+        "stage": "crm_stage",
+        "business_key": ["sls_ord_num", "sls_prd_key"],
+    }),
+    ("CUST_AZ12", {
+        "path": "source_erp/CUST_AZ12.csv",
+        "table": "erp_cust_az12",
+        "stage": "erp_stage",
+        "business_key": ["CID"],
+    }),
+    ("LOC_A101", {
+        "path": "source_erp/LOC_A101.csv",
+        "table": "erp_loc_a101",
+        "stage": "erp_stage",
+        "business_key": ["CID"],
+    }),
+    ("PX_CAT_G1V2", {
+        "path": "source_erp/PX_CAT_G1V2.csv",
+        "table": "erp_px_cat_g1v2",
+        "stage": "erp_stage",
+        "business_key": ["ID"],
+    }),
+])
+
+_CREATE_TABLE_RE = re.compile(
+    r"CREATE\s+(?:OR\s+REPLACE\s+)?TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?bronze\.(\w+)\s*\((.*?)\n\)",
+    re.IGNORECASE | re.DOTALL,
+)
+_COLUMN_RE = re.compile(r"^\s*(\w+)\s+([A-Za-z_]+(?:\s*\(\s*\d+(?:\s*,\s*\d+)?\s*\))?)")
+
+
+def parse_table_ddl(ddl_path=DEFAULT_DDL_PATH):
+    """
+    Parse bronze CREATE TABLE statements into {table: [(column, type), ...]},
+    leaving out AUDIT_COLUMNS since source files do not carry them
+    """
+    with open(ddl_path) as f:
+        ddl = f.read()
+
+    tables = OrderedDict()
+    for table_name, body in _CREATE_TABLE_RE.findall(ddl):
+        columns = []
+        for line in body.splitlines():
+            line = line.split("--", 1)[0]
+            match = _COLUMN_RE.match(line)
+            if match and match.group(1).lower() not in AUDIT_COLUMNS:
+                columns.append((match.group(1), re.sub(r"\s+", "", match.group(2).upper())))
+        tables[table_name.lower()] = columns
+    return tables
+
+
+def base_type(column_type):
+    """
+    Strip length/precision from a DDL type, e.g. VARCHAR(50) -> VARCHAR
+    """
+    return column_type.split("(", 1)[0]
+
+
+def type_length(column_type):
+    """
+    Return the declared length of a VARCHAR(n) column, or None
+    """
+    match = re.search(r"\((\d+)", column_type)
+    return int(match.group(1)) if match else None
+
+
+def resolve_source(file_name):
+    """
+    Map a source file name to its SOURCE_FILES entry using the same
+    substring matching as the bronze COPY INTO patterns
+    """
+    for source_name, source in SOURCE_FILES.items():
+        if source_name in os.path.basename(file_name):
+            return source_name, source
+    return None, None
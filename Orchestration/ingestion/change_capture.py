@@ -0,0 +1,313 @@
+"""
+Row-Level Change Capture Between Source File Drops
+Purpose: Compare a new source snapshot with the previous one and emit only inserts, updates and deletes
+Usage: python change_capture.py --state-dir /var/lib/cdc --output-dir /tmp/cdc --source cust_info
+Dependencies: pandas (vectorized row hashing), pyarrow (disk-backed hash index);
+              deltas are applied by bronze.apply_change_capture() (08_change_capture_procedure.sql)
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from bronze_schema import DEFAULT_DATASETS_DIR, SOURCE_FILES
+
+CDC_OP_COLUMN = "cdc_op"
+KEY_SEPARATOR = "\x1f"
+
+# 64-bit key/row hashes; keys are spread over buckets so only one bucket
+# of the old and new index is held in memory at a time
+DEFAULT_BUCKETS = 64
+
+_INDEX_SCHEMA = pa.schema([
+    ("key_hash", pa.uint64()),
+    ("row_hash", pa.uint64()),
+    ("key", pa.string()),
+])
+
+
+class ChangeCapture:
+    """
+    Hashes every row of a source snapshot by business key and diffs it against
+    the partitioned hash index persisted by the previous run
+    """
+
+    def __init__(self, state_dir, output_dir, datasets_dir=DEFAULT_DATASETS_DIR,
+                 buckets=DEFAULT_BUCKETS, chunk_size=500000):
+        self.state_dir = state_dir
+        self.output_dir = output_dir
+        self.datasets_dir = datasets_dir
+        self.buckets = buckets
+        self.chunk_size = chunk_size
+        os.makedirs(self.state_dir, exist_ok=True)
+        os.makedirs(self.output_dir, exist_ok=True)
+
+    def _index_dir(self, source_name):
+        return os.path.join(self.state_dir, source_name)
+
+    def _read_chunks(self, path):
+        # Raw text comparison: any byte-level change in a row counts as an update
+        return pd.read_csv(path, dtype=str, keep_default_na=False, na_filter=False, chunksize=self.chunk_size)
+
+    @staticmethod
+    def _key_strings(chunk, key_columns):
+        keys = chunk[key_columns[0]]
+        for col in key_columns[1:]:
+            keys = keys + KEY_SEPARATOR + chunk[col]
+        return keys
+
+    @staticmethod
+    def _hash_keys(keys):
+        return pd.util.hash_pandas_object(keys, index=False).to_numpy(dtype=np.uint64)
+
+    def _hash_snapshot(self, path, key_columns, work_dir):
+        """
+        Pass 1: hash every row and scatter (key_hash, row_hash, key) into bucket files
+        """
+        writers = {}
+        rows = 0
+        with open(path, newline="") as f:
+            header = f.readline().rstrip("\r\n").split(",")
+
+        for chunk in self._read_chunks(path):
+            keys = self._key_strings(chunk, key_columns)
+            key_hash = self._hash_keys(keys)
+            row_hash = pd.util.hash_pandas_object(chunk, index=False).to_numpy(dtype=np.uint64)
+            bucket = key_hash % np.uint64(self.buckets)
+            key_values = keys.to_numpy(dtype=object)
+
+            order = np.argsort(bucket, kind="stable")
+            bounds = np.searchsorted(bucket[order], np.arange(self.buckets + 1))
+            for b in range(self.buckets):
+                selected = order[bounds[b]:bounds[b + 1]]
+                if not len(selected):
+                    continue
+                if b not in writers:
+                    writers[b] = pa.ipc.new_file(os.path.join(work_dir, f"run-{b:04d}.arrow"), _INDEX_SCHEMA)
+                writers[b].write_batch(pa.record_batch([
+                    pa.array(key_hash[selected], pa.uint64()),
+                    pa.array(row_hash[selected], pa.uint64()),
+                    pa.array(key_values[selected], pa.string()),
+                ], schema=_INDEX_SCHEMA))
+            rows += len(chunk)
+
+        for writer in writers.values():
+            writer.close()
+        return header, rows
+
+    @staticmethod
+    def _aggregate_bucket(table):
+        """
+        Collapse duplicate keys into one entry; the row hashes of a key are
+        summed so the result does not depend on row order
+        """
+        key_hash = table.column("key_hash").to_numpy()
+        row_hash = table.column("row_hash").to_numpy()
+        keys = table.column("key").to_numpy(zero_copy_only=False)
+
+        order = np.argsort(key_hash, kind="stable")
+        key_hash, row_hash, keys = key_hash[order], row_hash[order], keys[order]
+        starts = np.flatnonzero(np.r_[True, key_hash[1:] != key_hash[:-1]]) if len(key_hash) else np.array([], int)
+        agg_hash = np.add.reduceat(row_hash, starts) if len(starts) else row_hash
+        return key_hash[starts], agg_hash.astype(np.uint64), keys[starts]
+
+    @staticmethod
+    def _load_bucket(path):
+        if path is None or not os.path.exists(path):
+            return np.array([], np.uint64), np.array([], np.uint64), np.array([], object)
+        table = feather.read_table(path)
+        return (
+            table.column("key_hash").to_numpy(),
+            table.column("row_hash").to_numpy(),
+            table.column("key").to_numpy(zero_copy_only=False),
+        )
+
+    def _diff_buckets(self, work_dir, old_index_dir, new_index_dir):
+        """
+        Pass 2: compare each bucket of the new snapshot with the old index and
+        write the new index; returns changed key hashes and deleted keys
+        """
+        changed_hashes, changed_ops, deleted_keys = [], [], []
+        unchanged = 0
+
+        for b in range(self.buckets):
+            run_path = os.path.join(work_dir, f"run-{b:04d}.arrow")
+            if os.path.exists(run_path):
+                with pa.memory_map(run_path) as source:
+                    new_keys, new_hash, new_values = self._aggregate_bucket(pa.ipc.open_file(source).read_all())
+            else:
+                new_keys, new_hash, new_values = self._load_bucket(None)
+
+            old_path = os.path.join(old_index_dir, f"bucket-{b:04d}.feather") if old_index_dir else None
+            old_keys, old_hash, old_values = self._load_bucket(old_path)
+
+            in_old = np.isin(new_keys, old_keys, assume_unique=True)
+            inserted = new_keys[~in_old]
+            deleted = ~np.isin(old_keys, new_keys, assume_unique=True)
+
+            _, new_pos, old_pos = np.intersect1d(new_keys, old_keys, assume_unique=True, return_indices=True)
+            modified = new_hash[new_pos] != old_hash[old_pos]
+            updated = new_keys[new_pos][modified]
+            unchanged += int((~modified).sum())
+
+            changed_hashes.extend([inserted, updated])
+            changed_ops.extend([np.full(len(inserted), "I"), np.full(len(updated), "U")])
+            deleted_keys.extend(old_values[deleted].tolist())
+
+            if len(new_keys):
+                feather.write_feather(
+                    pa.table([new_keys, new_hash, pa.array(new_values, pa.string())], schema=_INDEX_SCHEMA),
+                    os.path.join(new_index_dir, f"bucket-{b:04d}.feather"),
+                    compression="zstd",
+                )
+
+        hashes = np.concatenate(changed_hashes) if changed_hashes else np.array([], np.uint64)
+        ops = np.concatenate(changed_ops) if changed_ops else np.array([], "<U1")
+        order = np.argsort(hashes)
+        return hashes[order].astype(np.uint64), ops[order], deleted_keys, unchanged
+
+    def _write_delta(self, path, key_columns, header, changed_hashes, changed_ops, deleted_keys, delta_path):
+        """
+        Pass 3: re-stream the snapshot and write only changed rows, followed by delete markers
+        """
+        columns = header + [CDC_OP_COLUMN]
+        op_rows = {"I": 0, "U": 0, "D": len(deleted_keys)}
+
+        with open(delta_path, "w", newline="") as f:
+            f.write(",".join(columns) + "\n")
+
+            if len(changed_hashes):
+                for chunk in self._read_chunks(path):
+                    key_hash = self._hash_keys(self._key_strings(chunk, key_columns))
+                    pos = np.searchsorted(changed_hashes, key_hash)
+                    pos[pos == len(changed_hashes)] = 0
+                    mask = changed_hashes[pos] == key_hash
+                    if not mask.any():
+                        continue
+                    delta = chunk[mask].copy()
+                    delta[CDC_OP_COLUMN] = changed_ops[pos[mask]]
+                    for op, count in delta[CDC_OP_COLUMN].value_counts().items():
+                        op_rows[op] += int(count)
+                    delta.to_csv(f, header=False, index=False, lineterminator="\n")
+
+            if deleted_keys:
+                deletes = pd.DataFrame("", index=range(len(deleted_keys)), columns=columns)
+                key_parts = pd.Series(deleted_keys).str.split(KEY_SEPARATOR, expand=True)
+                for i, col in enumerate(key_columns):
+                    deletes[col] = key_parts[i].to_numpy()
+                deletes[CDC_OP_COLUMN] = "D"
+                deletes.to_csv(f, header=False, index=False, lineterminator="\n")
+
+        return op_rows
+
+    def capture_changes(self, source_name, snapshot_path=None, commit=True):
+        """
+        Diff one source snapshot against its previous index and write a delta file
+        """
+        source = SOURCE_FILES[source_name]
+        path = snapshot_path or os.path.join(self.datasets_dir, source["path"])
+        key_columns = source["business_key"]
+        start = time.perf_counter()
+
+        index_dir = self._index_dir(source_name)
+        old_index_dir = index_dir if os.path.exists(os.path.join(index_dir, "manifest.json")) else None
+        new_index_dir = index_dir + ".new"
+        shutil.rmtree(new_index_dir, ignore_errors=True)
+        os.makedirs(new_index_dir)
+
+        work_dir = tempfile.mkdtemp(prefix=f"cdc_{source_name}_")
+        try:
+            header, rows = self._hash_snapshot(path, key_columns, work_dir)
+            changed_hashes, changed_ops, deleted_keys, unchanged = self._diff_buckets(
+                work_dir, old_index_dir, new_index_dir)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        delta_path = os.path.join(self.output_dir, f"{source_name}_delta_{timestamp}.csv")
+        op_rows = self._write_delta(path, key_columns, header, changed_hashes, changed_ops, deleted_keys, delta_path)
+
+        report = {
+            "source": source_name,
+            "table": source["table"],
+            "snapshot_path": path,
+            "business_key": key_columns,
+            "initial_load": old_index_dir is None,
+            "rows_scanned": rows,
+            "keys_inserted": int((changed_ops == "I").sum()),
+            "keys_updated": int((changed_ops == "U").sum()),
+            "keys_deleted": len(deleted_keys),
+            "keys_unchanged": unchanged,
+            "delta_rows": op_rows,
+            "delta_file": delta_path,
+            "timestamp": datetime.now().isoformat(),
+            "elapsed_seconds": round(time.perf_counter() - start, 3),
+        }
+
+        with open(os.path.join(new_index_dir, "manifest.json"), "w") as f:
+            json.dump(report, f, indent=2)
+
+        # Swap the index only once the delta file is safely on disk
+        if commit:
+            shutil.rmtree(index_dir, ignore_errors=True)
+            os.rename(new_index_dir, index_dir)
+        else:
+            shutil.rmtree(new_index_dir, ignore_errors=True)
+        return report
+
+    def run_capture(self, sources=None, commit=True):
+        """
+        Capture changes for all (or the selected) sources
+        """
+        return {
+            "timestamp": datetime.now().isoformat(),
+            "sources": {
+                source_name: self.capture_changes(source_name, commit=commit)
+                for source_name in (sources or SOURCE_FILES)
+            },
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Emit row-level deltas between successive source snapshots")
+    parser.add_argument("--datasets-dir", default=DEFAULT_DATASETS_DIR)
+    parser.add_argument("--state-dir", required=True, help="Directory holding the previous snapshot hash indexes")
+    parser.add_argument("--output-dir", required=True, help="Directory for <source>_delta_<timestamp>.csv files")
+    parser.add_argument("--source", action="append", choices=list(SOURCE_FILES), help="Capture only these sources")
+    parser.add_argument("--buckets", type=int, default=DEFAULT_BUCKETS)
+    parser.add_argument("--chunk-size", type=int, default=500000)
+    parser.add_argument("--dry-run", action="store_true", help="Write deltas but keep the previous index")
+    parser.add_argument("--report", help="Write the JSON report to this path")
+    args = parser.parse_args(argv)
+
+    capture = ChangeCapture(
+        state_dir=args.state_dir,
+        output_dir=args.output_dir,
+        datasets_dir=args.datasets_dir,
+        buckets=args.buckets,
+        chunk_size=args.chunk_size,
+    )
+    report = capture.run_capture(args.source, commit=not args.dry_run)
+
+    for name, result in report["sources"].items():
+        print(f"{name}: +{result['keys_inserted']} ~{result['keys_updated']} -{result['keys_deleted']} "
+              f"({result['keys_unchanged']} unchanged) -> {result['delta_file']}")
+
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
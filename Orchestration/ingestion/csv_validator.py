@@ -0,0 +1,341 @@
+"""
+Pre-Ingest Source File Validator
+Purpose: Validate source CSVs locally before upload so COPY INTO (ON_ERROR = 'CONTINUE') never drops rows silently
+Usage: python csv_validator.py --datasets-dir ../../Datasets --report validation_report.json
+Dependencies: pandas (chunked reads keep memory bounded regardless of file size)
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from bronze_schema import (
+    DEFAULT_DATASETS_DIR,
+    DEFAULT_DDL_PATH,
+    NULL_VALUES,
+    SOURCE_FILES,
+    base_type,
+    parse_table_ddl,
+    type_length,
+)
+
+# Integer dates in YYYYMMDD format (converted by convert_int_to_date in silver)
+YYYYMMDD_COLUMNS = {
+    "sales_details": ["sls_order_dt", "sls_ship_dt", "sls_due_dt"],
+}
+
+# Business key formats per source; CRM keys are AW..., ERP adds NAS / '-' variants
+KEY_FORMATS = {
+    "cust_info": {"cst_key": r"AW\d{8}"},
+    "prd_info": {"prd_key": r"[A-Z]{2}-[A-Z]{2}-[A-Z0-9-]+"},
+    "sales_details": {"sls_ord_num": r"SO\d+", "sls_prd_key": r"[A-Z]{2}-[A-Z0-9-]+"},
+    "CUST_AZ12": {"CID": r"(?:NAS)?AW\d{8}"},
+    "LOC_A101": {"CID": r"AW-\d{8}"},
+    "PX_CAT_G1V2": {"ID": r"[A-Z]{2}_[A-Z]{2}"},
+}
+
+INTEGER_TYPES = ("INT", "INTEGER", "NUMBER", "BIGINT")
+
+SEVERITY_RANK = {"passed": 0, "warning": 1, "failed": 2}
+_DAYS_IN_MONTH = np.array([0, 31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+
+
+class _CheckResult:
+    """
+    Running failure count for one check, with a bounded sample of file line numbers
+    """
+
+    def __init__(self, severity, description, sample_size):
+        self.severity = severity
+        self.description = description
+        self.sample_size = sample_size
+        self.failed = 0
+        self.sample_rows = []
+
+    def add(self, mask, first_line):
+        failed = int(mask.sum())
+        if not failed:
+            return
+        self.failed += failed
+        if len(self.sample_rows) < self.sample_size:
+            positions = np.flatnonzero(np.asarray(mask))[: self.sample_size - len(self.sample_rows)]
+            self.sample_rows.extend(int(first_line + p) for p in positions)
+
+    def to_dict(self, total_rows):
+        return {
+            "severity": self.severity if self.failed else "passed",
+            "description": self.description,
+            "failed": self.failed,
+            "failed_rate": round(self.failed / total_rows, 6) if total_rows else 0.0,
+            "sample_rows": self.sample_rows,
+        }
+
+
+class SourceFileValidator:
+    """
+    Streams source CSVs in fixed-size chunks and applies vectorized checks
+    against the bronze DDL and source-specific business rules
+    """
+
+    def __init__(self, datasets_dir=DEFAULT_DATASETS_DIR, ddl_path=DEFAULT_DDL_PATH,
+                 chunk_size=500000, max_null_percentage=5, sample_size=5):
+        self.datasets_dir = datasets_dir
+        self.table_ddl = parse_table_ddl(ddl_path)
+        self.chunk_size = chunk_size
+        self.max_null_percentage = max_null_percentage
+        self.sample_size = sample_size
+
+    def validate_header(self, source_name, header):
+        """
+        Compare the CSV header with the bronze DDL; COPY INTO maps columns
+        by position, so a count mismatch is fatal while a name drift is not
+        """
+        expected = [name for name, _ in self.table_ddl[SOURCE_FILES[source_name]["table"]]]
+        renamed = [
+            {"position": i + 1, "expected": exp, "actual": act}
+            for i, (exp, act) in enumerate(zip(expected, header))
+            if exp.lower() != act.strip().lower()
+        ]
+        if len(header) != len(expected):
+            status = "failed"
+        elif renamed:
+            status = "warning"
+        else:
+            status = "passed"
+
+        return {
+            "status": status,
+            "expected": expected,
+            "actual": header,
+            "renamed": renamed,
+        }
+
+    def _build_checks(self, source_name, header):
+        """
+        Create the check registry for one file
+        """
+        checks = {}
+        columns = self.table_ddl[SOURCE_FILES[source_name]["table"]]
+        for csv_col, (_, col_type) in zip(header, columns):
+            kind = base_type(col_type)
+            if kind in INTEGER_TYPES:
+                checks[f"{csv_col}.type"] = _CheckResult(
+                    "failed", f"{csv_col} is not an integer (row dropped by COPY)", self.sample_size)
+            elif kind in ("DATE", "TIMESTAMP"):
+                checks[f"{csv_col}.type"] = _CheckResult(
+                    "failed", f"{csv_col} is not a valid {kind.lower()} (row dropped by COPY)", self.sample_size)
+            elif kind == "VARCHAR" and type_length(col_type):
+                checks[f"{csv_col}.length"] = _CheckResult(
+                    "failed", f"{csv_col} exceeds {col_type} (row dropped by COPY)", self.sample_size)
+
+        for col in YYYYMMDD_COLUMNS.get(source_name, []):
+            checks[f"{col}.yyyymmdd"] = _CheckResult(
+                "warning", f"{col} is not a valid YYYYMMDD date (nulled in silver)", self.sample_size)
+
+        if source_name == "sales_details":
+            checks["sls_sales.amount"] = _CheckResult(
+                "warning", "sls_sales != sls_quantity * sls_price (recalculated in silver)", self.sample_size)
+
+        for col in KEY_FORMATS.get(source_name, {}):
+            checks[f"{col}.format"] = _CheckResult(
+                "warning", f"{col} does not match {KEY_FORMATS[source_name][col]}", self.sample_size)
+
+        for col in SOURCE_FILES[source_name]["business_key"]:
+            checks[f"{col}.not_null"] = _CheckResult(
+                "failed", f"{col} is a business key and must not be null", self.sample_size)
+
+        return checks
+
+    @staticmethod
+    def _invalid_yyyymmdd(values):
+        """
+        Vectorized calendar validation of YYYYMMDD integers (NaN counts as invalid)
+        """
+        filled = values.fillna(0).to_numpy(dtype="int64")
+        year, month, day = filled // 10000, filled // 100 % 100, filled % 100
+        month_ok = (month >= 1) & (month <= 12)
+        max_day = _DAYS_IN_MONTH[np.where(month_ok, month, 0)]
+        leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+        max_day = np.where((month == 2) & ~leap, 28, max_day)
+        valid = (year >= 1900) & (year <= 2099) & month_ok & (day >= 1) & (day <= max_day)
+        return ~valid
+
+    def _apply_checks(self, source_name, chunk, checks, first_line):
+        """
+        Evaluate every check on one chunk with column-wise operations
+        """
+        columns = self.table_ddl[SOURCE_FILES[source_name]["table"]]
+        numeric = {}
+
+        for csv_col, (_, col_type) in zip(chunk.columns, columns):
+            values = chunk[csv_col]
+            present = values.notna()
+            kind = base_type(col_type)
+
+            if f"{csv_col}.type" in checks and kind in ("DATE", "TIMESTAMP"):
+                fmt = "%Y-%m-%d" if kind == "DATE" else None
+                parsed = pd.to_datetime(values, format=fmt, errors="coerce")
+                checks[f"{csv_col}.type"].add(present & parsed.isna(), first_line)
+            elif f"{csv_col}.type" in checks:
+                # Clean integer columns arrive already parsed by the C reader;
+                # only chunks containing non-numeric text need coercion
+                if pd.api.types.is_numeric_dtype(values.dtype):
+                    parsed = values.astype("float64")
+                else:
+                    parsed = pd.to_numeric(values.astype(str).str.strip(), errors="coerce").where(present)
+                not_integer = parsed.notna() & (parsed % 1 != 0)
+                checks[f"{csv_col}.type"].add((present & parsed.isna()) | not_integer, first_line)
+                numeric[csv_col] = parsed
+            elif f"{csv_col}.length" in checks:
+                checks[f"{csv_col}.length"].add(values.str.len() > type_length(col_type), first_line)
+
+        for col in YYYYMMDD_COLUMNS.get(source_name, []):
+            checks[f"{col}.yyyymmdd"].add(self._invalid_yyyymmdd(numeric[col]), first_line)
+
+        if source_name == "sales_details":
+            expected = numeric["sls_quantity"] * numeric["sls_price"]
+            checks["sls_sales.amount"].add((numeric["sls_sales"] != expected).to_numpy(), first_line)
+
+        for col, pattern in KEY_FORMATS.get(source_name, {}).items():
+            matches = chunk[col].str.fullmatch(pattern)
+            checks[f"{col}.format"].add(chunk[col].notna() & ~matches.fillna(False).astype(bool), first_line)
+
+        for col in SOURCE_FILES[source_name]["business_key"]:
+            checks[f"{col}.not_null"].add(chunk[col].isna(), first_line)
+
+    def validate_file(self, source_name):
+        """
+        Validate a single source file and return its report section
+        """
+        source = SOURCE_FILES[source_name]
+        path = os.path.join(self.datasets_dir, source["path"])
+        start = time.perf_counter()
+
+        with open(path, newline="") as f:
+            header = f.readline().rstrip("\r\n").split(",")
+
+        header_report = self.validate_header(source_name, header)
+        if header_report["status"] == "failed":
+            return {
+                "path": path,
+                "table": source["table"],
+                "status": "failed",
+                "rows": 0,
+                "header": header_report,
+                "checks": {},
+                "null_rates": {},
+                "elapsed_seconds": round(time.perf_counter() - start, 3),
+            }
+
+        checks = self._build_checks(source_name, header)
+        null_counts = dict.fromkeys(header, 0)
+        rows = 0
+
+        # Integer columns are left to the C parser's numeric inference, which
+        # is an order of magnitude faster than coercing strings afterwards
+        columns = self.table_ddl[source["table"]]
+        dtypes = {
+            csv_col: str for csv_col, (_, col_type) in zip(header, columns)
+            if base_type(col_type) not in INTEGER_TYPES
+        }
+        reader = pd.read_csv(
+            path,
+            dtype=dtypes,
+            keep_default_na=False,
+            na_values=NULL_VALUES,
+            chunksize=self.chunk_size,
+        )
+        for chunk in reader:
+            # Line numbers are 1-based and the header occupies line 1
+            self._apply_checks(source_name, chunk, checks, first_line=rows + 2)
+            for col, count in chunk.isna().sum().items():
+                null_counts[col] += int(count)
+            rows += len(chunk)
+
+        check_report = {name: check.to_dict(rows) for name, check in checks.items()}
+
+        null_rates = {}
+        for col, count in null_counts.items():
+            rate = round(100.0 * count / rows, 3) if rows else 0.0
+            null_rates[col] = rate
+            if rate > self.max_null_percentage and col not in source["business_key"]:
+                check_report[f"{col}.null_rate"] = {
+                    "severity": "warning",
+                    "description": f"{col} null rate above {self.max_null_percentage}%",
+                    "failed": count,
+                    "failed_rate": round(count / rows, 6),
+                    "sample_rows": [],
+                }
+
+        statuses = [header_report["status"]] + [c["severity"] for c in check_report.values()]
+        return {
+            "path": path,
+            "table": source["table"],
+            "status": max(statuses, key=SEVERITY_RANK.get),
+            "rows": rows,
+            "header": header_report,
+            "checks": check_report,
+            "null_rates": null_rates,
+            "elapsed_seconds": round(time.perf_counter() - start, 3),
+        }
+
+    def run_validation(self, sources=None):
+        """
+        Validate all (or the selected) source files and return a consolidated report
+        """
+        report = {
+            "timestamp": datetime.now().isoformat(),
+            "datasets_dir": self.datasets_dir,
+            "files": {},
+        }
+
+        for source_name in sources or SOURCE_FILES:
+            path = os.path.join(self.datasets_dir, SOURCE_FILES[source_name]["path"])
+            if not os.path.exists(path):
+                report["files"][source_name] = {"path": path, "status": "failed", "error": "file not found"}
+                continue
+            report["files"][source_name] = self.validate_file(source_name)
+
+        statuses = [f["status"] for f in report["files"].values()] or ["passed"]
+        report["overall_status"] = max(statuses, key=SEVERITY_RANK.get)
+        return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Validate source CSVs against the bronze DDL before upload")
+    parser.add_argument("--datasets-dir", default=DEFAULT_DATASETS_DIR)
+    parser.add_argument("--ddl", default=DEFAULT_DDL_PATH)
+    parser.add_argument("--report", help="Write the JSON report to this path (default: stdout)")
+    parser.add_argument("--source", action="append", choices=list(SOURCE_FILES), help="Validate only these sources")
+    parser.add_argument("--chunk-size", type=int, default=500000)
+    parser.add_argument("--max-null-percentage", type=float, default=5)
+    parser.add_argument("--fail-on", choices=["warning", "failed"], default="failed",
+                        help="Exit non-zero when the overall status reaches this severity")
+    args = parser.parse_args(argv)
+
+    validator = SourceFileValidator(
+        datasets_dir=args.datasets_dir,
+        ddl_path=args.ddl,
+        chunk_size=args.chunk_size,
+        max_null_percentage=args.max_null_percentage,
+    )
+    report = validator.run_validation(args.source)
+
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Validation {report['overall_status']}. Report saved to: {args.report}")
+    else:
+        print(json.dumps(report, indent=2))
+
+    return 1 if SEVERITY_RANK[report["overall_status"]] >= SEVERITY_RANK[args.fail_on] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,382 @@
+"""
+CSV to Parquet Conversion Stage
+Purpose: Stream source CSVs into typed, compressed Parquet before upload to S3
+Usage: python parquet_converter.py --datasets-dir ../../Datasets --output-dir /tmp/parquet
+Dependencies: pyarrow; output is loaded by bronze.load_bronze_layer_parquet() (07_parquet_load_procedure.sql)
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+
+from bronze_schema import (
+    DEFAULT_DATASETS_DIR,
+    DEFAULT_DDL_PATH,
+    NULL_VALUES,
+    SOURCE_FILES,
+    base_type,
+    parse_table_ddl,
+)
+
+# Bronze DDL type -> Arrow type; Parquet logical types map back onto the same Snowflake types
+ARROW_TYPES = {
+    "INT": pa.int64(),
+    "INTEGER": pa.int64(),
+    "NUMBER": pa.int64(),
+    "BIGINT": pa.int64(),
+    "DATE": pa.date32(),
+    "TIMESTAMP": pa.timestamp("us"),
+}
+
+# Sources partitioned on write, with the column and expression used to derive the partition
+PARTITION_COLUMNS = {
+    "sales_details": ("order_month", "sls_order_dt"),
+}
+
+UNKNOWN_PARTITION = "unknown"
+
+# Snowflake recommends 100-250 MB (compressed) files so COPY can spread them across threads
+DEFAULT_TARGET_FILE_MB = 128
+# Arrow bytes buffered across all partition writers before the largest buffers are flushed
+DEFAULT_MAX_BUFFER_MB = 512
+# Rejected rows kept in the report as examples
+REJECTED_SAMPLES = 5
+
+
+def _invalid_positions(column, arrow_type):
+    """
+    Positions of values that do not convert to arrow_type, isolated by bisection
+    so only the failing slices are cast again
+    """
+    invalid = []
+
+    def isolate(offset, length):
+        try:
+            pc.cast(column.slice(offset, length), arrow_type)
+            return
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+            if length == 1:
+                invalid.append(offset)
+                return
+        half = length // 2
+        isolate(offset, half)
+        isolate(offset + half, length - half)
+
+    isolate(0, len(column))
+    return invalid
+
+
+class _Rejections:
+    """
+    Count of rejected rows with the first REJECTED_SAMPLES kept as examples,
+    so a malformed file cannot grow the report without bound
+    """
+
+    def __init__(self, max_samples=REJECTED_SAMPLES):
+        self.max_samples = max_samples
+        self.count = 0
+        self.samples = []
+
+    def wants_sample(self):
+        return len(self.samples) < self.max_samples
+
+    def add(self, sample=None):
+        self.count += 1
+        if sample is not None and self.wants_sample():
+            self.samples.append(sample)
+
+
+class _PartitionWriter:
+    """
+    Buffers record batches for one partition, flushes them as a row group once
+    they reach row_group_rows or row_group_bytes, and rolls over to a new
+    Parquet file once the current one reaches the target size
+    """
+
+    def __init__(self, directory, schema, compression, row_group_rows, row_group_bytes, target_file_bytes):
+        self.directory = directory
+        self.schema = schema
+        self.compression = compression
+        self.row_group_rows = row_group_rows
+        self.row_group_bytes = row_group_bytes
+        self.target_file_bytes = target_file_bytes
+        self.buffer = []
+        self.buffered_rows = 0
+        self.buffered_bytes = 0
+        self.writer = None
+        self.current_path = None
+        self.files = []
+        self.rows = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def write(self, batch):
+        self.buffer.append(batch)
+        self.buffered_rows += batch.num_rows
+        self.buffered_bytes += batch.nbytes
+        if self.buffered_rows >= self.row_group_rows or self.buffered_bytes >= self.row_group_bytes:
+            self.flush()
+
+    def flush(self):
+        if not self.buffered_rows:
+            return
+        if self.writer is None:
+            self.current_path = os.path.join(self.directory, f"part-{len(self.files):05d}.parquet")
+            self.writer = pq.ParquetWriter(self.current_path, self.schema, compression=self.compression)
+            self.files.append(self.current_path)
+
+        self.writer.write_table(pa.Table.from_batches(self.buffer, schema=self.schema))
+        self.rows += self.buffered_rows
+        self.buffer = []
+        self.buffered_rows = 0
+        self.buffered_bytes = 0
+
+        if os.path.getsize(self.current_path) >= self.target_file_bytes:
+            self.writer.close()
+            self.writer = None
+
+    def close(self):
+        self.flush()
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+
+class ParquetConverter:
+    """
+    Converts source CSVs to Parquet using the bronze DDL for column names and types
+
+    Rows that are malformed or hold a value that does not convert to its column
+    type are skipped and counted, like COPY INTO ... ON_ERROR = CONTINUE
+    """
+
+    def __init__(self, datasets_dir=DEFAULT_DATASETS_DIR, output_dir="parquet", ddl_path=DEFAULT_DDL_PATH,
+                 compression="snappy", target_file_mb=DEFAULT_TARGET_FILE_MB, row_group_rows=1000000,
+                 block_size_mb=16, use_threads=True, max_buffer_mb=DEFAULT_MAX_BUFFER_MB):
+        self.datasets_dir = datasets_dir
+        self.output_dir = output_dir
+        self.table_ddl = parse_table_ddl(ddl_path)
+        self.compression = compression
+        self.target_file_bytes = int(target_file_mb * 1024 * 1024)
+        self.row_group_rows = row_group_rows
+        # Uncompressed Arrow bytes per row group; Parquet encoding shrinks them, so a
+        # file still rolls over after a few row groups
+        self.row_group_bytes = self.target_file_bytes
+        self.max_buffer_bytes = int(max_buffer_mb * 1024 * 1024)
+        self.block_size = int(block_size_mb * 1024 * 1024)
+        self.use_threads = use_threads
+
+    def arrow_schema(self, source_name):
+        """
+        Build the Arrow schema for a source from its bronze table DDL
+        """
+        columns = self.table_ddl[SOURCE_FILES[source_name]["table"]]
+        return pa.schema([
+            (name.lower(), ARROW_TYPES.get(base_type(col_type), pa.string()))
+            for name, col_type in columns
+        ])
+
+    def _open_reader(self, source_name, schema, rejected):
+        """
+        Streaming CSV reader that renames columns to the DDL names, since
+        COPY INTO maps CSV columns by position but Parquet by name. Columns are
+        read as strings (typed by _coerce); rows with the wrong number of fields
+        are skipped and counted in `rejected`
+        """
+        path = os.path.join(self.datasets_dir, SOURCE_FILES[source_name]["path"])
+
+        def skip_invalid_row(row):
+            rejected.add({"line": row.number, "error": f"expected {row.expected_columns} fields, "
+                                                       f"got {row.actual_columns}", "text": row.text}
+                         if rejected.wants_sample() else None)
+            return "skip"
+
+        return pa_csv.open_csv(
+            path,
+            read_options=pa_csv.ReadOptions(
+                column_names=schema.names,
+                skip_rows=1,
+                block_size=self.block_size,
+                use_threads=self.use_threads,
+            ),
+            parse_options=pa_csv.ParseOptions(invalid_row_handler=skip_invalid_row),
+            convert_options=pa_csv.ConvertOptions(
+                column_types={field.name: pa.string() for field in schema},
+                null_values=NULL_VALUES,
+                strings_can_be_null=True,
+            ),
+        )
+
+    @staticmethod
+    def _coerce(batch, schema, rejected):
+        """
+        Cast a string batch to the schema, dropping (and counting in `rejected`)
+        rows with a value that does not convert
+        """
+        invalid = {}
+        for field in schema:
+            if field.type == pa.string():
+                continue
+            for position in _invalid_positions(batch.column(field.name), field.type):
+                invalid.setdefault(position, field)
+        if invalid:
+            for position in sorted(invalid):
+                field = invalid[position]
+                rejected.add({"error": f"{field.name}: {batch.column(field.name)[position].as_py()!r} "
+                                       f"is not a valid {field.type}"} if rejected.wants_sample() else None)
+            batch = batch.filter(pa.array([row not in invalid for row in range(batch.num_rows)]))
+        return pa.RecordBatch.from_arrays(
+            [pc.cast(batch.column(field.name), field.type) for field in schema], schema=schema)
+
+    @staticmethod
+    def _split_by_partition(batch, source_column):
+        """
+        Split a batch by YYYYMM derived from a YYYYMMDD integer column;
+        zero, short or null dates land in the 'unknown' partition
+        """
+        dates = batch.column(source_column)
+        months = pc.divide(dates, 100)
+        valid = pc.and_(pc.greater_equal(dates, 19000101), pc.less_equal(dates, 20991231))
+        valid = pc.fill_null(valid, False)
+        keys = pc.if_else(valid, pc.cast(months, pa.string()), pa.scalar(UNKNOWN_PARTITION))
+
+        for key in pc.unique(keys).to_pylist():
+            yield key, batch.filter(pc.equal(keys, key))
+
+    def convert_file(self, source_name):
+        """
+        Convert one source CSV and return a summary of the files written
+        """
+        source = SOURCE_FILES[source_name]
+        system = source["stage"].split("_", 1)[0]
+        csv_path = os.path.join(self.datasets_dir, source["path"])
+        table_dir = os.path.join(self.output_dir, system, source_name)
+        schema = self.arrow_schema(source_name)
+        partition = PARTITION_COLUMNS.get(source_name)
+        start = time.perf_counter()
+
+        writers = {}
+        rejected = _Rejections()
+
+        def writer_for(key):
+            if key not in writers:
+                directory = table_dir if key is None else os.path.join(table_dir, f"{partition[0]}={key}")
+                writers[key] = _PartitionWriter(directory, schema, self.compression, self.row_group_rows,
+                                                self.row_group_bytes, self.target_file_bytes)
+            return writers[key]
+
+        for batch in self._open_reader(source_name, schema, rejected):
+            batch = self._coerce(batch, schema, rejected)
+            if partition:
+                for key, part in self._split_by_partition(batch, partition[1]):
+                    writer_for(key).write(part)
+            else:
+                writer_for(None).write(batch)
+
+            # Many partitions each below their row group budget can still add up
+            buffered = sorted(writers.values(), key=lambda writer: writer.buffered_bytes, reverse=True)
+            total = sum(writer.buffered_bytes for writer in buffered)
+            for writer in buffered:
+                if total <= self.max_buffer_bytes:
+                    break
+                total -= writer.buffered_bytes
+                writer.flush()
+
+        for writer in writers.values():
+            writer.close()
+
+        files = [path for writer in writers.values() for path in writer.files]
+        return {
+            "source_path": csv_path,
+            "output_dir": table_dir,
+            "table": source["table"],
+            "rows": sum(writer.rows for writer in writers.values()),
+            "rejected_rows": rejected.count,
+            "rejected_samples": rejected.samples,
+            "partitions": len(writers) if partition else 0,
+            "files": len(files),
+            "csv_bytes": os.path.getsize(csv_path),
+            "parquet_bytes": sum(os.path.getsize(path) for path in files),
+            "elapsed_seconds": round(time.perf_counter() - start, 3),
+        }
+
+    def run_conversion(self, sources=None):
+        """
+        Convert all (or the selected) source files and return a conversion report
+        """
+        report = {
+            "timestamp": datetime.now().isoformat(),
+            "output_dir": self.output_dir,
+            "compression": self.compression,
+            "files": {},
+        }
+
+        for source_name in sources or SOURCE_FILES:
+            report["files"][source_name] = self.convert_file(source_name)
+
+        report["csv_bytes"] = sum(f["csv_bytes"] for f in report["files"].values())
+        report["parquet_bytes"] = sum(f["parquet_bytes"] for f in report["files"].values())
+        report["rejected_rows"] = sum(f["rejected_rows"] for f in report["files"].values())
+        return report
+
+
+def upload_to_s3(output_dir, s3_bucket, s3_prefix, s3_client):
+    """
+    Upload converted Parquet files, preserving the system/source/partition layout
+    the parquet stages expect
+    """
+    uploaded = 0
+    for root, dirs, files in os.walk(output_dir):
+        for file in files:
+            if not file.endswith(".parquet"):
+                continue
+            local_file_path = os.path.join(root, file)
+            s3_key = f"{s3_prefix}/{os.path.relpath(local_file_path, output_dir)}"
+            s3_client.upload_file(local_file_path, s3_bucket, s3_key)
+            uploaded += 1
+    return uploaded
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert source CSVs to partitioned Parquet for bronze loading")
+    parser.add_argument("--datasets-dir", default=DEFAULT_DATASETS_DIR)
+    parser.add_argument("--output-dir", required=True)
+    parser.add_argument("--ddl", default=DEFAULT_DDL_PATH)
+    parser.add_argument("--source", action="append", choices=list(SOURCE_FILES), help="Convert only these sources")
+    parser.add_argument("--compression", default="snappy", choices=["snappy", "zstd", "gzip", "none"])
+    parser.add_argument("--target-file-mb", type=float, default=DEFAULT_TARGET_FILE_MB)
+    parser.add_argument("--row-group-rows", type=int, default=1000000)
+    parser.add_argument("--max-buffer-mb", type=float, default=DEFAULT_MAX_BUFFER_MB)
+    parser.add_argument("--upload-bucket", help="Upload results to this S3 bucket (requires boto3)")
+    parser.add_argument("--upload-prefix", default="parquet")
+    args = parser.parse_args(argv)
+
+    converter = ParquetConverter(
+        datasets_dir=args.datasets_dir,
+        output_dir=args.output_dir,
+        ddl_path=args.ddl,
+        compression=args.compression,
+        target_file_mb=args.target_file_mb,
+        row_group_rows=args.row_group_rows,
+        max_buffer_mb=args.max_buffer_mb,
+    )
+    report = converter.run_conversion(args.source)
+    print(json.dumps(report, indent=2))
+
+    if args.upload_bucket:
+        import boto3
+        uploaded = upload_to_s3(args.output_dir, args.upload_bucket, args.upload_prefix, boto3.client("s3"))
+        print(f"Uploaded {uploaded} Parquet files to s3://{args.upload_bucket}/{args.upload_prefix}/")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,203 @@
+"""
+Local Airflow REST API Stub
+Purpose: Serve the DAG-run, task-instance and task endpoints of the Airflow REST API (/api/v1) from
+         in-memory records, with limit/offset pagination, so the daily summary can be run and
+         benchmarked without an Airflow deployment
+Usage: stub = AirflowApiStub.synthetic(days=3).start()
+       DailySummaryBuilder(AirflowRunClient(stub.url, "admin", "admin")).build()
+       stub.stop()
+       python airflow_api_stub.py --port 8793 --days 7
+Dependencies: Standard library only
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# Task graphs of the pipelines (pipelines.yaml) with typical task durations in seconds
+PIPELINE_TASKS = {
+    "bronze_data_pipeline": {
+        "validate_s3_files": (5, ["load_bronze_tables"]),
+        "load_bronze_tables": (420, ["profile_bronze_load", "validate_bronze_data"]),
+        "profile_bronze_load": (15, ["record_run_history"]),
+        "validate_bronze_data": (40, ["log_pipeline_completion"]),
+        "log_pipeline_completion": (2, ["record_run_history"]),
+        "record_run_history": (3, []),
+    },
+    "silver_data_pipeline": {
+        "parse_silver_project": (20, ["plan_silver_selection"]),
+        "plan_silver_selection": (15, ["run_silver_models"]),
+        "run_silver_models": (300, ["test_silver_models"]),
+        "test_silver_models": (90, ["commit_silver_selection", "generate_documentation"]),
+        "commit_silver_selection": (2, []),
+        "generate_documentation": (45, []),
+    },
+    "gold_data_pipeline": {
+        "parse_gold_project": (20, ["plan_gold_selection"]),
+        "plan_gold_selection": (5, ["run_gold_models"]),
+        "run_gold_models": (360, ["test_gold_models", "reconcile_layer_chains"]),
+        "test_gold_models": (60, ["commit_gold_selection", "validate_business_metrics"]),
+        "commit_gold_selection": (2, []),
+        "validate_business_metrics": (20, ["record_run_history"]),
+        "reconcile_layer_chains": (120, ["record_run_history"]),
+        "record_run_history": (3, []),
+    },
+    "full_data_pipeline": {
+        "start_pipeline": (1, ["trigger_bronze_pipeline"]),
+        "trigger_bronze_pipeline": (500, ["trigger_silver_pipeline"]),
+        "trigger_silver_pipeline": (480, ["trigger_gold_pipeline"]),
+        "trigger_gold_pipeline": (570, ["end_pipeline"]),
+        "end_pipeline": (1, []),
+    },
+}
+
+
+def _iso(value):
+    return value.isoformat() if value else None
+
+
+class AirflowApiStub:
+    """
+    Threaded HTTP server answering a subset of the Airflow REST API; requests are logged in `requests`
+    """
+
+    def __init__(self, dag_runs, task_instances, tasks, host="127.0.0.1", port=0, latency_ms=0):
+        # dag_runs: [run]; task_instances: {(dag_id, run_id): [ti]}; tasks: {dag_id: [task]}
+        self.dag_runs = dag_runs
+        self.task_instances = task_instances
+        self.tasks = tasks
+        self.latency_ms = latency_ms
+        self.requests = []
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer((host, port), self._handler())
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @classmethod
+    def synthetic(cls, days=1, runs_per_day=1, failure_rate=0.1, seed=7, end=None, **kwargs):
+        """
+        Stub populated with `days` of runs of every pipeline, tasks chained per PIPELINE_TASKS
+        """
+        rng = random.Random(seed)
+        end = end or datetime.now(timezone.utc)
+        dag_runs, task_instances = [], {}
+        tasks = {dag_id: [{"task_id": task_id, "downstream_task_ids": downstream}
+                          for task_id, (_, downstream) in graph.items()]
+                 for dag_id, graph in PIPELINE_TASKS.items()}
+
+        for day in range(days, 0, -1):
+            for number in range(runs_per_day):
+                run_start = end - timedelta(days=day) + timedelta(hours=2, minutes=number)
+                for dag_id, graph in PIPELINE_TASKS.items():
+                    run_id = f"scheduled__{run_start.strftime('%Y-%m-%dT%H:%M:%S')}+00:00"
+                    failed_task = rng.choice(list(graph)) if rng.random() < failure_rate else None
+                    finished, instances = {}, []
+                    # Graph order is topological: a task starts when its last upstream ends
+                    for task_id, (seconds, _) in graph.items():
+                        upstream = [finished[t] for t, (_, down) in graph.items() if task_id in down and t in finished]
+                        start = max(upstream, default=run_start)
+                        duration = seconds * rng.uniform(0.8, 1.3)
+                        state = "failed" if task_id == failed_task else "success"
+                        finished[task_id] = start + timedelta(seconds=duration)
+                        instances.append({"task_id": task_id, "dag_id": dag_id, "dag_run_id": run_id,
+                                          "state": state, "start_date": _iso(start),
+                                          "end_date": _iso(finished[task_id]), "duration": duration})
+                    task_instances[(dag_id, run_id)] = instances
+                    dag_runs.append({"dag_id": dag_id, "dag_run_id": run_id,
+                                     "state": "failed" if failed_task else "success",
+                                     "execution_date": _iso(run_start), "start_date": _iso(run_start),
+                                     "end_date": _iso(max(finished.values()))})
+        return cls(dag_runs, task_instances, tasks, **kwargs)
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _list_dag_runs(self, dag_id, query):
+        runs = [run for run in self.dag_runs if run["dag_id"] == dag_id]
+        if "state" in query:
+            runs = [run for run in runs if run["state"] in query["state"]]
+        for field in ("start_date", "end_date", "execution_date"):
+            if f"{field}_gte" in query:
+                runs = [run for run in runs if run[field] and run[field] >= query[f"{field}_gte"][0]]
+            if f"{field}_lte" in query:
+                runs = [run for run in runs if run[field] and run[field] <= query[f"{field}_lte"][0]]
+        order_by = query.get("order_by", ["execution_date"])[0]
+        runs.sort(key=lambda run: run[order_by.lstrip("-")] or "", reverse=order_by.startswith("-"))
+        return runs
+
+    def _route(self, path, query):
+        parts = path.strip("/").split("/")[2:]   # drop api/v1
+        if len(parts) == 3 and parts[0] == "dags" and parts[2] == "dagRuns":
+            return "dag_runs", self._list_dag_runs(parts[1], query)
+        if len(parts) == 5 and parts[0] == "dags" and parts[4] == "taskInstances":
+            return "task_instances", self.task_instances.get((parts[1], parts[3]))
+        if len(parts) == 3 and parts[0] == "dags" and parts[2] == "tasks":
+            return "tasks", self.tasks.get(parts[1])
+        return None, None
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                query = parse_qs(parsed.query)
+                with stub._lock:
+                    stub.requests.append(self.path)
+                if stub.latency_ms:
+                    time.sleep(stub.latency_ms / 1000)
+
+                key, items = stub._route(parsed.path, query)
+                if items is None:
+                    self._reply(404, {"title": "Not Found", "status": 404})
+                    return
+                offset = int(query.get("offset", [0])[0])
+                limit = int(query.get("limit", [100])[0])
+                body = {key: items if key == "tasks" else items[offset:offset + limit], "total_entries": len(items)}
+                self._reply(200, body)
+
+            def _reply(self, status, body):
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve synthetic pipeline runs over the Airflow REST API")
+    parser.add_argument("--port", type=int, default=8793)
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--runs-per-day", type=int, default=1)
+    parser.add_argument("--latency-ms", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    stub = AirflowApiStub.synthetic(days=args.days, runs_per_day=args.runs_per_day, port=args.port,
+                                    latency_ms=args.latency_ms)
+    print(f"Airflow API stub serving {len(stub.dag_runs)} DAG runs at {stub.url}/api/v1")
+    stub.server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
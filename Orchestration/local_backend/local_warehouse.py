@@ -0,0 +1,598 @@
+"""
+Embedded Local Warehouse Backend
+Purpose: In-process, DuckDB-backed stand-in for Snowflake so monitoring code, operators and
+         the bronze load logic can run (and be benchmarked) without a Snowflake account
+Usage: warehouse = LocalWarehouse(latency_ms=50).seed()
+       PipelineHealthChecker(snowflake_config={}, connect=warehouse.connect)
+       SnowflakeDataQualityOperator(..., hook=LocalHook(warehouse))
+       python local_warehouse.py --database /tmp/local.duckdb --seed --query "SELECT COUNT(*) FROM gold.fct_sales"
+Dependencies: duckdb; schemas are built from Scripts/Bronze/03_table_ddl.sql and Datasets/
+"""
+
+import argparse
+import glob
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime
+
+import duckdb
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, os.path.join(REPO_ROOT, "Orchestration", "ingestion"))
+
+from bronze_schema import (  # noqa: E402
+    AUDIT_COLUMNS,
+    DEFAULT_DATASETS_DIR,
+    DEFAULT_DDL_PATH,
+    NULL_VALUES,
+    SOURCE_FILES,
+    parse_table_ddl,
+)
+
+DEFAULT_PROCEDURE_SQL = os.path.join(REPO_ROOT, "Scripts", "Bronze", "*.sql")
+LOCAL_VERSION = f"local-duckdb-{duckdb.__version__}"
+
+SCHEMAS = ("bronze", "silver", "gold")
+
+# Snowflake-only syntax rewritten before statements reach DuckDB
+_REWRITES = [
+    (re.compile(r"\bCURRENT_TIMESTAMP\s*\(\s*\)", re.IGNORECASE), "CAST(now() AS TIMESTAMP)"),
+    (re.compile(r"\bCURRENT_DATE\s*\(\s*\)", re.IGNORECASE), "CURRENT_DATE"),
+    (re.compile(r"\bCURRENT_VERSION\s*\(\s*\)", re.IGNORECASE), f"'{LOCAL_VERSION}'"),
+    (re.compile(r"\bTIMESTAMP_(?:NTZ|LTZ|TZ)\b", re.IGNORECASE), "TIMESTAMP"),
+    (re.compile(r"\bIFF\s*\(", re.IGNORECASE), "IF("),
+    # SAMPLE SYSTEM (1) SEED (7) -> TABLESAMPLE system (1%) REPEATABLE (7)
+    (re.compile(r"\b(?:TABLE)?SAMPLE\s+(?:SYSTEM|BLOCK)\s*\(\s*([\d.]+)\s*\)", re.IGNORECASE),
+     r"TABLESAMPLE system (\1%)"),
+    (re.compile(r"\b(?:TABLE)?SAMPLE\s+(?:BERNOULLI|ROW)\s*\(\s*([\d.]+)\s*\)", re.IGNORECASE),
+     r"TABLESAMPLE bernoulli (\1%)"),
+    (re.compile(r"(TABLESAMPLE \w+ \([\d.]+%\))\s+SEED\s*\(", re.IGNORECASE), r"\1 REPEATABLE ("),
+    # HASH_AGG(* EXCLUDE (c)) -> order-independent sum of row hashes
+    (re.compile(r"\bHASH_AGG\s*\(\s*\*\s*(EXCLUDE\s*\([^)]*\))?\s*\)", re.IGNORECASE),
+     r"SUM(HASH(*COLUMNS(* \1)))"),
+]
+
+_SHOW_SCHEMAS_RE = re.compile(r"^\s*SHOW\s+SCHEMAS\b", re.IGNORECASE)
+_SHOW_TABLES_RE = re.compile(r"^\s*SHOW\s+TABLES(?:\s+IN\s+(?:SCHEMA\s+)?([\w.]+))?", re.IGNORECASE)
+_SHOW_PROCEDURES_RE = re.compile(r"^\s*SHOW\s+(?:USER\s+)?PROCEDURES\b", re.IGNORECASE)
+_GET_DDL_RE = re.compile(r"^\s*SELECT\s+GET_DDL\s*\(\s*'(\w+)'\s*,\s*'([\w.]+)'\s*\)\s*;?\s*$", re.IGNORECASE)
+_CALL_RE = re.compile(r"^\s*CALL\s+([\w.]+)\s*\(\s*\)\s*;?\s*$", re.IGNORECASE)
+# Session and warehouse statements are accepted (and recorded in query_history) without effect
+_SESSION_RE = re.compile(r"^\s*(?:USE\s+\w+|ALTER\s+(?:SESSION|WAREHOUSE))\b", re.IGNORECASE)
+_QUERY_TAG_RE = re.compile(r"QUERY_TAG\s*=\s*'((?:[^']|'')*)'", re.IGNORECASE)
+_PROCEDURE_RE = re.compile(
+    r"CREATE\s+OR\s+REPLACE\s+PROCEDURE\s+(\w+)\.(\w+)\s*\(.*?\$\$\s*;", re.IGNORECASE | re.DOTALL)
+
+# Silver/gold seed transformations: DuckDB translations of the dbt staging and core models
+SILVER_SQL = {
+    "crm_cust_info": """
+        SELECT cst_id, cst_key,
+               trim(cst_first_name) AS cst_firstname,
+               trim(cst_last_name) AS cst_lastname,
+               CASE upper(trim(cst_marital_status)) WHEN 'S' THEN 'Single' WHEN 'M' THEN 'Married' ELSE 'n/a' END
+                   AS cst_marital_status,
+               CASE upper(trim(cst_gndr)) WHEN 'F' THEN 'Female' WHEN 'M' THEN 'Male' ELSE 'n/a' END AS cst_gndr,
+               cst_create_date, dwh_loaded_at, CAST(now() AS TIMESTAMP) AS dwh_create_date
+        FROM bronze.crm_cust_info
+        WHERE cst_id IS NOT NULL
+        QUALIFY row_number() OVER (PARTITION BY cst_id ORDER BY cst_create_date DESC) = 1
+    """,
+    "crm_prd_info": """
+        SELECT prd_id,
+               replace(substring(prd_key, 1, 5), '-', '_') AS cat_id,
+               substring(prd_key, 7) AS prd_key,
+               prd_nm,
+               coalesce(prd_cost, 0) AS prd_cost,
+               CASE upper(trim(prd_line)) WHEN 'M' THEN 'Mountain' WHEN 'R' THEN 'Road'
+                    WHEN 'S' THEN 'Other Sales' WHEN 'T' THEN 'Touring' ELSE 'n/a' END AS prd_line,
+               CAST(prd_start_dt AS DATE) AS prd_start_dt,
+               CAST(lead(prd_start_dt) OVER (PARTITION BY prd_key ORDER BY prd_start_dt) - INTERVAL 1 DAY AS DATE)
+                   AS prd_end_dt,
+               dwh_loaded_at, CAST(now() AS TIMESTAMP) AS dwh_create_date
+        FROM bronze.crm_prd_info
+    """,
+    "crm_sales_details": """
+        SELECT sls_ord_num, sls_prd_key, sls_cust_id,
+               {order_dt} AS sls_order_dt,
+               {ship_dt} AS sls_ship_dt,
+               {due_dt} AS sls_due_dt,
+               CASE WHEN sls_sales IS NULL OR sls_sales <= 0 OR sls_sales != sls_quantity * abs(sls_price)
+                    THEN sls_quantity * abs(sls_price) ELSE sls_sales END AS sls_sales,
+               sls_quantity,
+               CASE WHEN sls_price IS NULL OR sls_price <= 0
+                    THEN sls_sales / nullif(sls_quantity, 0) ELSE sls_price END AS sls_price,
+               dwh_loaded_at, CAST(now() AS TIMESTAMP) AS dwh_create_date
+        FROM bronze.crm_sales_details
+    """,
+    "erp_cust_az12": """
+        SELECT CASE WHEN cid LIKE 'NAS%' THEN substring(cid, 4) ELSE cid END AS cid,
+               CASE WHEN bdate > CURRENT_DATE THEN NULL ELSE bdate END AS bdate,
+               CASE WHEN upper(trim(gen)) IN ('F', 'FEMALE') THEN 'Female'
+                    WHEN upper(trim(gen)) IN ('M', 'MALE') THEN 'Male' ELSE 'n/a' END AS gen,
+               dwh_loaded_at, CAST(now() AS TIMESTAMP) AS dwh_create_date
+        FROM bronze.erp_cust_az12
+    """,
+    "erp_loc_a101": """
+        SELECT replace(cid, '-', '') AS cid,
+               CASE WHEN trim(cntry) = 'DE' THEN 'Germany'
+                    WHEN trim(cntry) IN ('US', 'USA') THEN 'United States'
+                    WHEN trim(cntry) = '' OR cntry IS NULL THEN 'n/a'
+                    ELSE trim(cntry) END AS cntry,
+               dwh_loaded_at, CAST(now() AS TIMESTAMP) AS dwh_create_date
+        FROM bronze.erp_loc_a101
+    """,
+    "erp_px_cat_g1v2": """
+        SELECT id, cat, subcat, maintenance, dwh_loaded_at, CAST(now() AS TIMESTAMP) AS dwh_create_date
+        FROM bronze.erp_px_cat_g1v2
+    """,
+}
+
+GOLD_SQL = {
+    "dim_customers": """
+        SELECT row_number() OVER (ORDER BY sc.cst_id) AS customer_key,
+               sc.cst_id AS customer_id,
+               sc.cst_key AS customer_number,
+               sc.cst_firstname AS first_name,
+               sc.cst_lastname AS last_name,
+               el.cntry AS country,
+               sc.cst_marital_status AS marital_status,
+               CASE WHEN sc.cst_gndr != 'n/a' THEN sc.cst_gndr ELSE coalesce(ec.gen, 'n/a') END AS gender,
+               ec.bdate AS birthdate,
+               sc.cst_create_date AS create_date,
+               sc.dwh_create_date AS silver_loaded_at,
+               CAST(now() AS TIMESTAMP) AS dwh_created_at
+        FROM silver.crm_cust_info sc
+        LEFT JOIN silver.erp_cust_az12 ec ON sc.cst_key = ec.cid
+        LEFT JOIN silver.erp_loc_a101 el ON sc.cst_key = el.cid
+    """,
+    "dim_products": """
+        SELECT row_number() OVER (ORDER BY sp.prd_start_dt, sp.prd_key) AS product_key,
+               sp.prd_id AS product_id,
+               sp.prd_key AS product_number,
+               sp.prd_nm AS product_name,
+               sp.cat_id AS category_id,
+               ec.cat AS category,
+               ec.subcat AS subcategory,
+               ec.maintenance AS maintenance,
+               sp.prd_cost AS cost,
+               sp.prd_line AS product_line,
+               sp.prd_start_dt AS start_date,
+               sp.prd_end_dt AS end_date,
+               sp.dwh_create_date AS silver_loaded_at,
+               CAST(now() AS TIMESTAMP) AS dwh_created_at
+        FROM silver.crm_prd_info sp
+        LEFT JOIN silver.erp_px_cat_g1v2 ec ON sp.cat_id = ec.id
+        WHERE sp.prd_end_dt IS NULL
+    """,
+    "fct_sales": """
+        SELECT ss.sls_ord_num AS order_number,
+               dp.product_key,
+               dc.customer_key,
+               ss.sls_order_dt AS order_date,
+               ss.sls_ship_dt AS shipping_date,
+               ss.sls_due_dt AS due_date,
+               ss.sls_sales AS sales_amount,
+               ss.sls_quantity AS quantity,
+               ss.sls_price AS price,
+               ss.dwh_create_date AS silver_loaded_at,
+               CAST(now() AS TIMESTAMP) AS dwh_created_at
+        FROM silver.crm_sales_details ss
+        LEFT JOIN gold.dim_products dp ON ss.sls_prd_key = dp.product_number
+        LEFT JOIN gold.dim_customers dc ON ss.sls_cust_id = dc.customer_id
+    """,
+}
+
+
+def _int_to_date(column):
+    """
+    DuckDB version of the convert_int_to_date silver macro
+    """
+    return (f"CASE WHEN {column} = 0 OR length(CAST({column} AS VARCHAR)) != 8 THEN NULL "
+            f"ELSE CAST(strptime(CAST({column} AS VARCHAR), '%Y%m%d') AS DATE) END")
+
+
+def translate_sql(sql):
+    """
+    Rewrite the Snowflake-specific functions used by the pipeline into DuckDB syntax
+    """
+    for pattern, replacement in _REWRITES:
+        sql = pattern.sub(replacement, sql)
+    return sql
+
+
+class LocalWarehouse:
+    """
+    Embedded DuckDB database exposing a DB-API connect() compatible with snowflake.connector.connect
+    """
+
+    def __init__(self, database=":memory:", latency_ms=0, connect_latency_ms=0,
+                 datasets_dir=DEFAULT_DATASETS_DIR, ddl_path=DEFAULT_DDL_PATH):
+        self.database = database
+        self.latency = latency_ms / 1000.0
+        self.connect_latency = connect_latency_ms / 1000.0
+        self.datasets_dir = datasets_dir
+        self.ddl_path = ddl_path
+        self.db = duckdb.connect(database)
+        self.procedures = {}
+        self.query_history = []
+        self._lock = threading.Lock()
+        self._register_procedures()
+
+    # ------------------------------------------------------------------ #
+    # DB-API entry points
+    # ------------------------------------------------------------------ #
+    def connect(self, **snowflake_config):
+        """
+        Drop-in for snowflake.connector.connect; connection parameters are accepted and ignored
+        """
+        if self.connect_latency:
+            time.sleep(self.connect_latency)
+        return LocalConnection(self, snowflake_config)
+
+    def record_query(self, query_id, sql, query_tag, start, elapsed, rows, status):
+        with self._lock:
+            self.query_history.append({
+                "query_id": query_id,
+                "query_text": sql,
+                "query_tag": query_tag,
+                "start_time": start.isoformat(),
+                "total_elapsed_time": round(elapsed * 1000, 3),
+                "rows_produced": rows,
+                "execution_status": status,
+            })
+
+    # ------------------------------------------------------------------ #
+    # Seeding
+    # ------------------------------------------------------------------ #
+    def seed(self, layers=SCHEMAS):
+        """
+        Create the bronze tables from the DDL, load Datasets/ and build silver/gold from bronze
+        """
+        for schema in SCHEMAS:
+            self.db.execute(f"CREATE SCHEMA IF NOT EXISTS {schema}")
+        self.create_bronze_tables()
+        if "bronze" in layers:
+            self.load_bronze_layer()
+        if "silver" in layers:
+            self.build_silver_layer()
+        if "gold" in layers:
+            self.build_gold_layer()
+        return self
+
+    def create_bronze_tables(self):
+        for table, columns in parse_table_ddl(self.ddl_path).items():
+            column_sql = ",\n    ".join(f"{name} {col_type}" for name, col_type in columns)
+            audit_sql = ",\n    ".join(f"{name} TIMESTAMP DEFAULT CAST(now() AS TIMESTAMP)" for name in AUDIT_COLUMNS)
+            self.db.execute(f"CREATE TABLE IF NOT EXISTS bronze.{table} (\n    {column_sql},\n    {audit_sql}\n)")
+
+    def load_bronze_layer(self):
+        """
+        Same semantics as bronze.load_bronze_layer(): truncate, positional CSV load, skip bad rows
+        """
+        start = time.perf_counter()
+        table_ddl = parse_table_ddl(self.ddl_path)
+        for source in SOURCE_FILES.values():
+            table = source["table"]
+            columns = table_ddl[table]
+            path = os.path.join(self.datasets_dir, source["path"]).replace("'", "''")
+            column_types = ", ".join(f"'{name}': '{col_type}'" for name, col_type in columns)
+            nulls = ", ".join(f"'{value}'" for value in NULL_VALUES)
+            self.db.execute(f"DELETE FROM bronze.{table}")
+            self.db.execute(
+                f"INSERT INTO bronze.{table} ({', '.join(name for name, _ in columns)}) "
+                f"SELECT * FROM read_csv('{path}', header = true, delim = ',', quote = '\"', "
+                f"columns = {{{column_types}}}, nullstr = [{nulls}], ignore_errors = true)"
+            )
+        return (f"SUCCESS: Bronze layer load completed. {len(SOURCE_FILES)} tables loaded in "
+                f"{int(time.perf_counter() - start)} seconds.")
+
+    def build_silver_layer(self, cursor=None):
+        """
+        Rebuild silver from bronze; pass a LocalCursor to record the statements in query_history
+        """
+        execute = (cursor or self.db).execute
+        dates = {name: _int_to_date(f"sls_{name}") for name in ("order_dt", "ship_dt", "due_dt")}
+        for table, select_sql in SILVER_SQL.items():
+            execute(f"CREATE OR REPLACE TABLE silver.{table} AS {select_sql.format(**dates)}")
+
+    def build_gold_layer(self, cursor=None):
+        """
+        Rebuild the gold dimensions and facts from silver
+        """
+        execute = (cursor or self.db).execute
+        for table, select_sql in GOLD_SQL.items():
+            execute(f"CREATE OR REPLACE TABLE gold.{table} AS {select_sql}")
+
+    # ------------------------------------------------------------------ #
+    # Snowflake metadata commands
+    # ------------------------------------------------------------------ #
+    def _register_procedures(self, pattern=DEFAULT_PROCEDURE_SQL):
+        for path in sorted(glob.glob(pattern)):
+            with open(path) as f:
+                for match in _PROCEDURE_RE.finditer(f.read()):
+                    schema, name = match.group(1).upper(), match.group(2).upper()
+                    self.procedures[(schema, name)] = match.group(0)
+
+    def show_schemas(self):
+        rows = self.db.execute(
+            "SELECT schema_name FROM information_schema.schemata "
+            "WHERE catalog_name = current_database() ORDER BY schema_name").fetchall()
+        created = datetime.now()
+        return [(created, name.upper(), "N", "N", self.database_name, "LOCAL", "", "", "1") for (name,) in rows]
+
+    def show_tables(self, schema=None):
+        schema = schema.split(".")[-1] if schema else None
+        query = ("SELECT table_schema, table_name FROM information_schema.tables "
+                 "WHERE table_catalog = current_database() AND table_type = 'BASE TABLE'")
+        params = []
+        if schema:
+            query += " AND lower(table_schema) = lower(?)"
+            params.append(schema)
+        rows = self.db.execute(query + " ORDER BY 1, 2", params).fetchall()
+        created = datetime.now()
+        return [(created, table.upper(), self.database_name, table_schema.upper(), "TABLE")
+                for table_schema, table in rows]
+
+    def show_procedures(self):
+        created = datetime.now()
+        return [(created, name, schema, "N", "N", "N", 0, 0, f"{name}() RETURN VARCHAR", "")
+                for (schema, name) in sorted(self.procedures)]
+
+    def get_ddl(self, object_type, name):
+        parts = name.split(".")
+        schema, object_name = (parts[-2], parts[-1]) if len(parts) > 1 else ("main", parts[-1])
+        if object_type.upper() == "PROCEDURE":
+            return self.procedures[(schema.upper(), object_name.upper())]
+
+        columns = self.db.execute(
+            "SELECT column_name, data_type, column_default FROM information_schema.columns "
+            "WHERE lower(table_schema) = lower(?) AND lower(table_name) = lower(?) ORDER BY ordinal_position",
+            [schema, object_name]).fetchall()
+        if not columns:
+            raise duckdb.CatalogException(f"Table '{name}' does not exist or not authorized.")
+        body = ",\n\t".join(
+            f"{column.upper()} {data_type}" + (f" DEFAULT {default}" if default else "")
+            for column, data_type, default in columns)
+        return f"create or replace TABLE {object_name.upper()} (\n\t{body}\n);"
+
+    def call(self, procedure):
+        if procedure.lower() == "bronze.load_bronze_layer":
+            return self.load_bronze_layer()
+        raise duckdb.CatalogException(f"Procedure '{procedure}' is not emulated by the local backend")
+
+    @property
+    def database_name(self):
+        return self.db.execute("SELECT current_database()").fetchone()[0].upper()
+
+    def close(self):
+        self.db.close()
+
+
+class LocalConnection:
+    """
+    DB-API connection over a shared LocalWarehouse (one DuckDB cursor per connection)
+    """
+
+    def __init__(self, warehouse, config=None):
+        self.warehouse = warehouse
+        self.config = config or {}
+        self.db = warehouse.db.cursor()
+        self.query_tag = self.config.get("session_parameters", {}).get("QUERY_TAG", "")
+        self.closed = False
+
+    def cursor(self):
+        return LocalCursor(self)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        if not self.closed:
+            self.db.close()
+            self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class LocalCursor:
+    """
+    DB-API cursor adding configurable round-trip latency and Snowflake metadata commands
+    """
+
+    arraysize = 1
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.warehouse = connection.warehouse
+        self.description = None
+        self.rowcount = -1
+        self.sfqid = None
+        self._rows = []
+        self._position = 0
+
+    def execute(self, sql, params=None):
+        if self.warehouse.latency:
+            time.sleep(self.warehouse.latency)
+
+        self.sfqid = str(uuid.uuid4())
+        start = datetime.now()
+        started = time.perf_counter()
+        status = "SUCCESS"
+        try:
+            self._rows, self.description = self._run(sql, params)
+        except Exception:
+            status = "FAIL"
+            raise
+        finally:
+            self.rowcount = len(self._rows) if status == "SUCCESS" else -1
+            self.warehouse.record_query(self.sfqid, sql, self.connection.query_tag, start,
+                                        time.perf_counter() - started, max(self.rowcount, 0), status)
+        self._position = 0
+        return self
+
+    def executemany(self, sql, seq_of_params):
+        for params in seq_of_params:
+            self.execute(sql, params)
+        return self
+
+    def _run(self, sql, params):
+        warehouse = self.warehouse
+
+        if _SHOW_SCHEMAS_RE.match(sql):
+            return warehouse.show_schemas(), _describe("created_on", "name", "is_default", "is_current",
+                                                       "database_name", "owner", "comment", "options",
+                                                       "retention_time")
+        match = _SHOW_TABLES_RE.match(sql)
+        if match:
+            return warehouse.show_tables(match.group(1)), _describe("created_on", "name", "database_name",
+                                                                    "schema_name", "kind")
+        if _SHOW_PROCEDURES_RE.match(sql):
+            return warehouse.show_procedures(), _describe("created_on", "name", "schema_name", "is_builtin",
+                                                          "is_aggregate", "is_ansi", "min_num_arguments",
+                                                          "max_num_arguments", "arguments", "description")
+        match = _GET_DDL_RE.match(sql)
+        if match:
+            return [(warehouse.get_ddl(match.group(1), match.group(2)),)], _describe("GET_DDL")
+        match = _CALL_RE.match(sql)
+        if match:
+            return [(warehouse.call(match.group(1)),)], _describe(match.group(1).split(".")[-1].upper())
+        if _SESSION_RE.match(sql):
+            tag = _QUERY_TAG_RE.search(sql)
+            if tag:
+                self.connection.query_tag = tag.group(1).replace("''", "'")
+            return [("Statement executed successfully.",)], _describe("status")
+
+        db = self.connection.db
+        sql = translate_sql(sql)
+        if isinstance(params, dict):
+            sql = re.sub(r"%\((\w+)\)s", r"$\1", sql)
+            db.execute(sql, params)
+        elif params:
+            db.execute(sql.replace("%s", "?"), list(params))
+        else:
+            db.execute(sql)
+        description = db.description
+        rows = db.fetchall() if description else []
+        return rows, description
+
+    def fetchone(self):
+        if self._position >= len(self._rows):
+            return None
+        row = self._rows[self._position]
+        self._position += 1
+        return row
+
+    def fetchmany(self, size=None):
+        size = size or self.arraysize
+        rows = self._rows[self._position:self._position + size]
+        self._position += len(rows)
+        return rows
+
+    def fetchall(self):
+        rows = self._rows[self._position:]
+        self._position = len(self._rows)
+        return rows
+
+    def fetch_pandas_all(self):
+        import pandas as pd
+        return pd.DataFrame(self.fetchall(), columns=[column[0] for column in self.description or []])
+
+    def close(self):
+        self._rows = []
+
+    def __iter__(self):
+        return iter(self.fetchall())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _describe(*names):
+    return [(name, None, None, None, None, None, None) for name in names]
+
+
+class LocalHook:
+    """
+    Minimal SnowflakeHook stand-in (get_conn / get_first / get_records / run) over a LocalWarehouse
+    """
+
+    def __init__(self, warehouse, query_tag=None):
+        self.warehouse = warehouse
+        self.query_tag = query_tag
+
+    def get_conn(self):
+        config = {"session_parameters": {"QUERY_TAG": self.query_tag}} if self.query_tag else {}
+        return self.warehouse.connect(**config)
+
+    def get_first(self, sql, parameters=None):
+        with self.get_conn() as conn:
+            cursor = conn.cursor()
+            cursor.execute(sql, parameters)
+            return cursor.fetchone()
+
+    def get_records(self, sql, parameters=None):
+        with self.get_conn() as conn:
+            cursor = conn.cursor()
+            cursor.execute(sql, parameters)
+            return cursor.fetchall()
+
+    def get_pandas_df(self, sql, parameters=None):
+        with self.get_conn() as conn:
+            return conn.cursor().execute(sql, parameters).fetch_pandas_all()
+
+    def run(self, sql, autocommit=False, parameters=None, handler=None):
+        statements = [sql] if isinstance(sql, str) else sql
+        results = []
+        with self.get_conn() as conn:
+            cursor = conn.cursor()
+            for statement in statements:
+                cursor.execute(statement, parameters)
+                if handler is not None:
+                    results.append(handler(cursor))
+        return results if handler is not None else None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Seed and query the embedded local warehouse")
+    parser.add_argument("--database", default=":memory:", help="DuckDB file (default: in-memory)")
+    parser.add_argument("--datasets-dir", default=DEFAULT_DATASETS_DIR)
+    parser.add_argument("--seed", action="store_true", help="Load Datasets/ into bronze and build silver/gold")
+    parser.add_argument("--latency-ms", type=float, default=0, help="Simulated round trip per statement")
+    parser.add_argument("--query", action="append", default=[], help="Statement to run after seeding")
+    args = parser.parse_args(argv)
+
+    warehouse = LocalWarehouse(args.database, latency_ms=args.latency_ms, datasets_dir=args.datasets_dir)
+    if args.seed:
+        warehouse.seed()
+
+    conn = warehouse.connect()
+    cursor = conn.cursor()
+    if args.seed:
+        for row in warehouse.show_tables():
+            count = cursor.execute(f"SELECT COUNT(*) FROM {row[3]}.{row[1]}").fetchone()[0]
+            print(f"{row[3]}.{row[1]:<20}{count:>10} rows")
+    for query in args.query:
+        cursor.execute(query)
+        for row in cursor.fetchall():
+            print(row)
+    conn.close()
+    warehouse.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
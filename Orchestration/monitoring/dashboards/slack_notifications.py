@@ -5,10 +5,16 @@ Dependencies: Slack webhook URL, airflow connections
 """
 
 import json
+import os
+import sys
 import requests
 from airflow.models import Variable
 from airflow.hooks.base_hook import BaseHook
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "airflow", "plugins"))
+from pipeline_tracing import tracer  # noqa: E402
+from run_history import anomaly_slack_message  # noqa: E402
+
 class SlackNotifier:
     """
     Handles Slack notifications for pipeline monitoring
@@ -111,9 +117,11 @@ class SlackNotifier:
         
         self._send_slack_message(message)
     
-    def send_daily_summary(self, success_count, failed_count, total_duration, data_freshness):
+    def send_daily_summary(self, success_count, failed_count, total_duration, data_freshness, pipelines=None,
+                           slowest_tasks=None):
         """
-        Send daily pipeline summary to Slack
+        Send daily pipeline summary to Slack; pipelines / slowest_tasks come from
+        monitoring/scripts/daily_summary.py
         """
         message = {
             "blocks": [
@@ -148,8 +156,38 @@ class SlackNotifier:
             ]
         }
         
+        if pipelines:
+            message["blocks"].append({
+                "type": "section",
+                "text": {
+                    "type": "mrkdwn",
+                    "text": "\n".join(
+                        f"*{dag_id}:* {p['success']}/{p['runs']} succeeded, {p['total_minutes']}min total, "
+                        f"critical path {p['critical_path_minutes']}min ({' → '.join(p['critical_path'])})"
+                        for dag_id, p in pipelines.items()
+                    )
+                }
+            })
+        if slowest_tasks:
+            message["blocks"].append({
+                "type": "section",
+                "text": {
+                    "type": "mrkdwn",
+                    "text": "*Slowest Tasks:*\n" + "\n".join(
+                        f"{task['dag_id']}.{task['task_id']}: {task['seconds'] / 60:.1f}min"
+                        for task in slowest_tasks
+                    )
+                }
+            })
+        
         self._send_slack_message(message)
     
+    def send_anomaly_alert(self, anomalies):
+        """
+        Send run-history anomalies (slow runs, duration trends, row count collapses) to Slack
+        """
+        self._send_slack_message(anomaly_slack_message(anomalies))
+    
     def _send_slack_message(self, message):
         """
         Internal method to send message to Slack
@@ -159,11 +197,15 @@ class SlackNotifier:
             return
         
         try:
-            response = requests.post(
-                self.webhook_url,
-                data=json.dumps(message),
-                headers={'Content-Type': 'application/json'}
-            )
-            response.raise_for_status()
+            with tracer.span("webhook.post", target="slack") as span:
+                response = requests.post(
+                    self.webhook_url,
+                    data=json.dumps(message),
+                    headers={'Content-Type': 'application/json'}
+                )
+                span.set_attribute("status_code", response.status_code)
+                response.raise_for_status()
+            tracer.increment("pipeline_webhook_posts_total", target="slack", result="success")
         except Exception as e:
+            tracer.increment("pipeline_webhook_posts_total", target="slack", result="failed")
             print(f"Failed to send Slack message: {e}")
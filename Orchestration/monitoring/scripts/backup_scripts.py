@@ -1,24 +1,54 @@
 """
 Data Pipeline Backup Scripts
 Purpose: Backup critical pipeline components and configurations
-Usage: Scheduled backups for disaster recovery
+Usage: Scheduled backups for disaster recovery; pass connect=LocalWarehouse(...).connect
+       (Orchestration/local_backend) to back up the embedded local warehouse.
+       Queries carry a DAG/task QUERY_TAG; profile_queries=True adds their QUERY_HISTORY profile.
+       history_store=RunHistoryStore(path) keeps every report and flags backups slower than usual
 """
 
 import os
+import sys
 import shutil
 import json
-import snowflake.connector
-from datetime import datetime
-import boto3
-from botocore.exceptions import ClientError
+import time
+from datetime import datetime, timezone
+
+try:
+    import snowflake.connector
+except ImportError:  # Only the local backend is available
+    snowflake = None
+
+
+def _default_connect():
+    if snowflake is None:
+        raise ImportError("snowflake-connector-python is not installed: install it, or pass connect= "
+                          "(e.g. LocalWarehouse().connect from Orchestration/local_backend)")
+    return snowflake.connector.connect
+
+
+# Shared tracing / query profiling layers live with the Airflow plugins (mounted into the Airflow containers)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "airflow", "plugins"))
+from pipeline_tracing import instrument_connect, tracer  # noqa: E402
+from query_profiling import QueryProfiler, SnowflakeQueryHistory, query_tag_from_env, with_query_tag  # noqa: E402
+from run_history import notify_anomalies  # noqa: E402
 
 class PipelineBackupManager:
     """
     Manages backups for data pipeline components
     """
     
-    def __init__(self, snowflake_config, s3_config=None, local_backup_path="/backups"):
-        self.snowflake_config = snowflake_config
+    def __init__(self, snowflake_config, s3_config=None, local_backup_path="/backups", connect=None,
+                 query_tag=None, profile_queries=False, history_source=None, history_store=None, notifier=None):
+        self.query_tag = query_tag or query_tag_from_env(component="backup")
+        self.snowflake_config = with_query_tag(snowflake_config, self.query_tag)
+        # Any DB-API connect(**config) callable; defaults to the Snowflake connector
+        self.connect = instrument_connect(connect or _default_connect())
+        self.profile_queries_enabled = profile_queries
+        self.history_source = history_source
+        # Run history (plugins/run_history.py) and an optional SlackNotifier for its anomalies
+        self.history_store = history_store
+        self.notifier = notifier
         self.s3_config = s3_config
         self.local_backup_path = local_backup_path
         self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -26,12 +56,23 @@ class PipelineBackupManager:
         # Create backup directory
         os.makedirs(self.local_backup_path, exist_ok=True)
     
+    def profile_queries(self, start_time):
+        """
+        QUERY_HISTORY profile of every query this manager issued since start_time
+        """
+        try:
+            history_source = self.history_source or SnowflakeQueryHistory(self.connect, self.snowflake_config)
+            return QueryProfiler(history_source).profile(self.query_tag, start_time)
+        except Exception as e:
+            return {"status": "error", "error": str(e), "timestamp": datetime.now().isoformat()}
+    
+    @tracer.traced("backup.database_schemas")
     def backup_database_schemas(self):
         """
         Backup database schema definitions
         """
         try:
-            conn = snowflake.connector.connect(**self.snowflake_config)
+            conn = self.connect(**self.snowflake_config)
             cursor = conn.cursor()
             
             # Get all schemas
@@ -68,12 +109,13 @@ class PipelineBackupManager:
             print(f"Schema backup failed: {e}")
             return None
     
+    @tracer.traced("backup.stored_procedures")
     def backup_stored_procedures(self):
         """
         Backup Snowflake stored procedures
         """
         try:
-            conn = snowflake.connector.connect(**self.snowflake_config)
+            conn = self.connect(**self.snowflake_config)
             cursor = conn.cursor()
             
             # Get stored procedures
@@ -105,6 +147,7 @@ class PipelineBackupManager:
             print(f"Stored procedure backup failed: {e}")
             return None
     
+    @tracer.traced("backup.airflow_dags")
     def backup_airflow_dags(self, dags_path):
         """
         Backup Airflow DAG files
@@ -120,6 +163,7 @@ class PipelineBackupManager:
             print(f"Airflow DAGs backup failed: {e}")
             return None
     
+    @tracer.traced("backup.dbt_projects")
     def backup_dbt_projects(self, dbt_projects):
         """
         Backup dbt project files
@@ -139,6 +183,7 @@ class PipelineBackupManager:
             print(f"dbt projects backup failed: {e}")
             return None
     
+    @tracer.traced("backup.upload_to_s3")
     def upload_to_s3(self, local_path, s3_bucket, s3_prefix):
         """
         Upload backup files to S3
@@ -147,13 +192,21 @@ class PipelineBackupManager:
             print("S3 configuration not provided")
             return False
         
+        import boto3
+        from botocore.exceptions import ClientError
+        
+        def upload_file(file_path, s3_key):
+            with tracer.span("s3.upload", bucket=s3_bucket, key=s3_key, bytes=os.path.getsize(file_path)):
+                s3_client.upload_file(file_path, s3_bucket, s3_key)
+            tracer.increment("pipeline_s3_uploaded_bytes_total", os.path.getsize(file_path), bucket=s3_bucket)
+        
         try:
             s3_client = boto3.client('s3', **self.s3_config)
             
             if os.path.isfile(local_path):
                 # Upload single file
                 s3_key = f"{s3_prefix}/{os.path.basename(local_path)}"
-                s3_client.upload_file(local_path, s3_bucket, s3_key)
+                upload_file(local_path, s3_key)
                 return True
             elif os.path.isdir(local_path):
                 # Upload directory
@@ -161,51 +214,62 @@ class PipelineBackupManager:
                     for file in files:
                         local_file_path = os.path.join(root, file)
                         s3_key = f"{s3_prefix}/{os.path.basename(local_path)}/{os.path.relpath(local_file_path, local_path)}"
-                        s3_client.upload_file(local_file_path, s3_bucket, s3_key)
+                        upload_file(local_file_path, s3_key)
                 return True
                 
         except ClientError as e:
             print(f"S3 upload failed: {e}")
             return False
     
+    @tracer.traced("backup.complete")
     def run_complete_backup(self, dags_path, dbt_projects, upload_to_s3=False):
         """
         Run complete backup of all pipeline components
         """
+        started_at = datetime.now(timezone.utc)
+        started = time.perf_counter()
         backup_report = {
             "timestamp": self.timestamp,
-            "backups": {}
+            "backups": {},
+            "durations": {}
         }
         
+        def timed(stage, function, *args):
+            stage_started = time.perf_counter()
+            result = function(*args)
+            backup_report["durations"][stage] = round(time.perf_counter() - stage_started, 3)
+            return result
+        
         print("Starting comprehensive pipeline backup...")
         
         # Backup database schemas
         print("Backing up database schemas...")
-        schema_backup = self.backup_database_schemas()
+        schema_backup = timed("schemas", self.backup_database_schemas)
         if schema_backup:
             backup_report["backups"]["schemas"] = schema_backup
         
         # Backup stored procedures
         print("Backing up stored procedures...")
-        procedure_backup = self.backup_stored_procedures()
+        procedure_backup = timed("procedures", self.backup_stored_procedures)
         if procedure_backup:
             backup_report["backups"]["procedures"] = procedure_backup
         
         # Backup Airflow DAGs
         print("Backing up Airflow DAGs...")
-        dags_backup = self.backup_airflow_dags(dags_path)
+        dags_backup = timed("airflow_dags", self.backup_airflow_dags, dags_path)
         if dags_backup:
             backup_report["backups"]["airflow_dags"] = dags_backup
         
         # Backup dbt projects
         print("Backing up dbt projects...")
-        dbt_backup = self.backup_dbt_projects(dbt_projects)
+        dbt_backup = timed("dbt_projects", self.backup_dbt_projects, dbt_projects)
         if dbt_backup:
             backup_report["backups"]["dbt_projects"] = dbt_backup
         
         # Upload to S3 if requested
         if upload_to_s3 and self.s3_config:
             print("Uploading backups to S3...")
+            s3_started = time.perf_counter()
             for backup_type, backup_path in backup_report["backups"].items():
                 if backup_path:
                     success = self.upload_to_s3(
@@ -214,6 +278,15 @@ class PipelineBackupManager:
                         f"backups/{self.timestamp}/{backup_type}"
                     )
                     backup_report["backups"][f"{backup_type}_s3_upload"] = success
+            backup_report["durations"]["s3_upload"] = round(time.perf_counter() - s3_started, 3)
+        
+        if self.profile_queries_enabled:
+            backup_report["query_profile"] = self.profile_queries(started_at)
+        backup_report["duration_seconds"] = round(time.perf_counter() - started, 3)
+        
+        if self.history_store is not None:
+            backup_report["anomalies"] = self.history_store.record_report("backup", backup_report)
+            notify_anomalies(backup_report["anomalies"], self.notifier)
         
         # Save backup report
         report_file = f"{self.local_backup_path}/backup_report_{self.timestamp}.json"
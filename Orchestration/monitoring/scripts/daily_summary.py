@@ -0,0 +1,322 @@
+"""
+Daily Pipeline Summary
+Purpose: Compute the daily summary (run counts, durations, critical path, slowest tasks, freshness)
+         from DAG-run and task-instance records of the Airflow REST API and send it to Slack / email
+Usage: client = AirflowRunClient("http://localhost:8080", "admin", "admin")
+       summary = DailySummaryBuilder(client, cache=RunCache("/opt/airflow/logs/daily_summary_cache.json")).build()
+       send_daily_summary(summary, SlackNotifier())
+       python daily_summary.py --airflow-url http://localhost:8080 --cache /opt/airflow/logs/daily_summary_cache.json \
+           --slack --html /tmp/daily_summary.html   (password from AIRFLOW_PASSWORD)
+       Pass the URL of an AirflowApiStub (Orchestration/local_backend) to run it without Airflow
+Dependencies: requests; Airflow REST API with basic auth (api.auth_backends = basic_auth)
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "airflow", "plugins"))
+from pipeline_tracing import tracer  # noqa: E402
+
+PIPELINE_DAG_IDS = ("bronze_data_pipeline", "silver_data_pipeline", "gold_data_pipeline", "full_data_pipeline")
+# Layer DAGs whose last success defines data freshness (full_data_pipeline only triggers them)
+FRESHNESS_DAG_IDS = ("bronze_data_pipeline", "silver_data_pipeline", "gold_data_pipeline")
+FINISHED_STATES = ("success", "failed")
+
+
+def _parse_time(value):
+    if not value:
+        return None
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def _seconds(start, end):
+    start, end = _parse_time(start), _parse_time(end)
+    return (end - start).total_seconds() if start and end else None
+
+
+class AirflowRunClient:
+    """
+    Airflow REST API reader: one pooled, retrying session; list pages fetched concurrently
+
+    Per-DAG / per-run calls (map) and the pages inside them use separate thread pools, so a call
+    waiting on its pages never holds the workers those pages need
+    """
+
+    def __init__(self, base_url, username, password, max_workers=8, page_size=100, timeout=30):
+        self.base_url = base_url.rstrip("/")
+        self.page_size = page_size
+        self.timeout = timeout
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.page_executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.session = requests.Session()
+        self.session.auth = (username, password)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=2 * max_workers,
+                              max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=(502, 503, 504)))
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def close(self):
+        self.executor.shutdown()
+        self.page_executor.shutdown()
+        self.session.close()
+
+    def get(self, path, params=None):
+        url = f"{self.base_url}/api/v1/{path}"
+        with tracer.span("http.request", method="GET", url=url) as span:
+            response = self.session.get(url, params=params, timeout=self.timeout)
+            span.set_attribute("status_code", response.status_code)
+        response.raise_for_status()
+        return response.json()
+
+    def get_all(self, path, key, params=None):
+        """
+        Every item of a paginated collection: the first page gives total_entries, the rest are
+        requested in parallel
+        """
+        params = dict(params or {}, limit=self.page_size)
+        first = self.get(path, dict(params, offset=0))
+        items = list(first[key])
+        offsets = range(len(items), first.get("total_entries", len(items)), self.page_size)
+        pages = self.page_executor.map(lambda offset: self.get(path, dict(params, offset=offset))[key], offsets)
+        for page in pages:
+            items.extend(page)
+        return items
+
+    def map(self, function, iterable):
+        return list(self.executor.map(function, iterable))
+
+    def dag_runs(self, dag_id, start, end):
+        """
+        Runs started in [start, end)
+        """
+        runs = self.get_all(f"dags/{dag_id}/dagRuns", "dag_runs", {
+            "start_date_gte": start.isoformat(), "start_date_lte": end.isoformat(), "order_by": "start_date",
+        })
+        return [run for run in runs if _parse_time(run["start_date"]) < end]
+
+    def last_success(self, dag_id):
+        runs = self.get(f"dags/{dag_id}/dagRuns", {"state": "success", "order_by": "-end_date", "limit": 1})
+        return runs["dag_runs"][0] if runs["dag_runs"] else None
+
+    def task_instances(self, dag_id, run_id):
+        return self.get_all(f"dags/{dag_id}/dagRuns/{run_id}/taskInstances", "task_instances")
+
+    def tasks(self, dag_id):
+        return self.get(f"dags/{dag_id}/tasks")["tasks"]
+
+
+class RunCache:
+    """
+    JSON cache of finished DAG runs with their task instances, so each day only fetches new runs
+    """
+
+    def __init__(self, path=None, retention_days=14):
+        self.path = path
+        self.retention_days = retention_days
+        self.runs = {}
+        if path and os.path.exists(path):
+            with open(path) as f:
+                self.runs = json.load(f)
+
+    def get(self, dag_id, run_id):
+        return self.runs.get(f"{dag_id}/{run_id}")
+
+    def put(self, run):
+        if run["state"] in FINISHED_STATES:
+            self.runs[f"{run['dag_id']}/{run['dag_run_id']}"] = run
+
+    def save(self, now=None):
+        cutoff = (now or datetime.now(timezone.utc)) - timedelta(days=self.retention_days)
+        self.runs = {key: run for key, run in self.runs.items() if _parse_time(run["start_date"]) >= cutoff}
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        temporary = f"{self.path}.tmp"
+        with open(temporary, "w") as f:
+            json.dump(self.runs, f)
+        os.replace(temporary, self.path)
+
+
+def critical_path(task_instances, downstream):
+    """
+    (seconds, task ids) of the longest duration-weighted dependency chain among the run's tasks
+    """
+    durations = {ti["task_id"]: ti.get("duration") or 0.0 for ti in task_instances}
+    longest = {}
+
+    def visit(task_id):
+        # Longest chain starting at task_id; DAGs are acyclic, so memoised recursion terminates
+        if task_id not in longest:
+            tails = [visit(child) for child in downstream.get(task_id, ()) if child in durations]
+            seconds, path = max(tails, default=(0.0, []))
+            longest[task_id] = (durations[task_id] + seconds, [task_id] + path)
+        return longest[task_id]
+
+    return max((visit(task_id) for task_id in durations), default=(0.0, []))
+
+
+class DailySummaryBuilder:
+    """
+    Aggregates the pipelines' runs of one day into the daily summary
+    """
+
+    def __init__(self, client, dag_ids=PIPELINE_DAG_IDS, cache=None, slowest_tasks=5):
+        self.client = client
+        self.dag_ids = dag_ids
+        self.cache = cache or RunCache()
+        self.slowest_tasks = slowest_tasks
+
+    def _with_task_instances(self, run):
+        cached = self.cache.get(run["dag_id"], run["dag_run_id"])
+        if cached is not None:
+            return cached, True
+        run = dict(run, task_instances=self.client.task_instances(run["dag_id"], run["dag_run_id"]))
+        self.cache.put(run)
+        return run, False
+
+    @tracer.traced("daily_summary.build")
+    def build(self, day=None):
+        """
+        Summary of runs started on `day` (UTC date; defaults to the last 24 hours)
+        """
+        now = datetime.now(timezone.utc)
+        if day is None:
+            start, end = now - timedelta(days=1), now
+        else:
+            start = datetime.combine(day, datetime.min.time(), tzinfo=timezone.utc)
+            end = start + timedelta(days=1)
+
+        runs = [run for runs in self.client.map(lambda dag_id: self.client.dag_runs(dag_id, start, end), self.dag_ids)
+                for run in runs]
+        fetched = self.client.map(self._with_task_instances, runs)
+        downstream = dict(zip(self.dag_ids, self.client.map(
+            lambda dag_id: {task["task_id"]: task.get("downstream_task_ids", []) for task in self.client.tasks(dag_id)},
+            self.dag_ids)))
+        last_successes = dict(zip(FRESHNESS_DAG_IDS, self.client.map(self.client.last_success, FRESHNESS_DAG_IDS)))
+        self.cache.save(now)
+
+        pipelines = {}
+        all_tasks = []
+        top_issues = []
+        for run, from_cache in fetched:
+            pipeline = pipelines.setdefault(run["dag_id"], {"runs": 0, "success": 0, "failed": 0, "running": 0,
+                                                            "durations": [], "critical_paths": []})
+            pipeline["runs"] += 1
+            state = run["state"] if run["state"] in FINISHED_STATES else "running"
+            pipeline[state] += 1
+            duration = _seconds(run["start_date"], run.get("end_date"))
+            if duration is not None:
+                pipeline["durations"].append(duration)
+
+            seconds, path = critical_path(run["task_instances"], downstream.get(run["dag_id"], {}))
+            pipeline["critical_paths"].append({"run_id": run["dag_run_id"], "seconds": round(seconds, 1), "tasks": path})
+            for ti in run["task_instances"]:
+                if ti.get("duration"):
+                    all_tasks.append({"dag_id": run["dag_id"], "task_id": ti["task_id"], "run_id": run["dag_run_id"],
+                                      "seconds": round(ti["duration"], 1), "state": ti["state"]})
+                if ti["state"] == "failed":
+                    top_issues.append(f"{run['dag_id']}.{ti['task_id']} failed in {run['dag_run_id']}")
+
+        for dag_id, pipeline in pipelines.items():
+            durations = pipeline.pop("durations")
+            paths = pipeline.pop("critical_paths")
+            slowest_path = max(paths, key=lambda p: p["seconds"])
+            pipeline.update({
+                "total_minutes": round(sum(durations) / 60, 1),
+                "median_minutes": round(statistics.median(durations) / 60, 1) if durations else None,
+                "max_minutes": round(max(durations) / 60, 1) if durations else None,
+                "critical_path_minutes": round(slowest_path["seconds"] / 60, 1),
+                "critical_path": slowest_path["tasks"],
+            })
+
+        freshness = {}
+        for dag_id, run in last_successes.items():
+            if run and run.get("end_date"):
+                freshness[dag_id] = round((now - _parse_time(run["end_date"])).total_seconds() / 3600, 1)
+        slowest = sorted(all_tasks, key=lambda task: task["seconds"], reverse=True)[:self.slowest_tasks]
+        top_issues.extend(f"Slow task {task['dag_id']}.{task['task_id']}: {task['seconds'] / 60:.1f}min"
+                          for task in slowest[:3])
+
+        return {
+            "window": {"start": start.isoformat(), "end": end.isoformat()},
+            "success_count": sum(p["success"] for p in pipelines.values()),
+            "failed_count": sum(p["failed"] for p in pipelines.values()),
+            # full_data_pipeline only waits on the layer DAGs, so it is not added to the total
+            "total_duration": round(sum(p["total_minutes"] for dag_id, p in pipelines.items()
+                                        if dag_id in FRESHNESS_DAG_IDS), 1),
+            # Stalest layer: hours since its last successful run finished
+            "data_freshness": max(freshness.values()) if freshness else None,
+            "freshness": freshness,
+            "pipelines": pipelines,
+            "slowest_tasks": slowest,
+            "top_issues": top_issues,
+            "runs_fetched": sum(1 for _, from_cache in fetched if not from_cache),
+            "runs_cached": sum(1 for _, from_cache in fetched if from_cache),
+            "timestamp": datetime.now().isoformat(),
+        }
+
+
+def send_daily_summary(summary, notifier):
+    """
+    Feed a computed summary into SlackNotifier.send_daily_summary
+    """
+    notifier.send_daily_summary(
+        summary["success_count"],
+        summary["failed_count"],
+        summary["total_duration"],
+        summary["data_freshness"],
+        pipelines=summary["pipelines"],
+        slowest_tasks=summary["slowest_tasks"],
+    )
+
+
+def daily_summary_email(summary):
+    """
+    HTML body of the computed summary (EmailTemplates.daily_summary_template)
+    """
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "alerts"))
+    from email_templates import EmailTemplates
+    return EmailTemplates.daily_summary_template(summary["success_count"], summary["failed_count"],
+                                                 summary["total_duration"], summary["data_freshness"],
+                                                 summary["top_issues"])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compute the daily pipeline summary from the Airflow REST API")
+    parser.add_argument("--airflow-url", default="http://localhost:8080")
+    parser.add_argument("--username", default=os.environ.get("AIRFLOW_USERNAME", "admin"))
+    parser.add_argument("--password", default=os.environ.get("AIRFLOW_PASSWORD", "admin"))
+    parser.add_argument("--cache", help="RunCache JSON file, so finished runs are only fetched once")
+    parser.add_argument("--day", type=date.fromisoformat, help="UTC date (YYYY-MM-DD); defaults to the last 24 hours")
+    parser.add_argument("--slack", action="store_true", help="Send the summary with SlackNotifier")
+    parser.add_argument("--html", help="Write the email body (EmailTemplates.daily_summary_template) to this file")
+    args = parser.parse_args(argv)
+
+    client = AirflowRunClient(args.airflow_url, args.username, args.password)
+    try:
+        summary = DailySummaryBuilder(client, cache=RunCache(args.cache)).build(args.day)
+    finally:
+        client.close()
+    print(json.dumps(summary, indent=2))
+
+    if args.html:
+        with open(args.html, "w") as f:
+            f.write(daily_summary_email(summary))
+    if args.slack:
+        sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "dashboards"))
+        from slack_notifications import SlackNotifier
+        send_daily_summary(summary, SlackNotifier())
+    return summary
+
+
+if __name__ == "__main__":
+    main()
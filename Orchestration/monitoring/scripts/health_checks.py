@@ -1,28 +1,129 @@
 """
 Data Pipeline Health Checks
 Purpose: Comprehensive health checks for all pipeline components
-Usage: Can be run manually or scheduled via Airflow
+Usage: Can be run manually or scheduled via Airflow; pass connect=LocalWarehouse(...).connect
+       (Orchestration/local_backend) to run the checks without a Snowflake account.
+       Queries carry a DAG/task QUERY_TAG; profile_queries=True adds their QUERY_HISTORY profile.
+       history_store=RunHistoryStore(path) keeps every report and flags slow checks and stale layers
 """
 
-import snowflake.connector
+import os
+import sys
 import requests
 import json
-from datetime import datetime, timedelta
+import time
+from datetime import datetime, timedelta, timezone
+
+try:
+    import snowflake.connector
+except ImportError:  # Only the local backend is available
+    snowflake = None
+
+
+def _default_connect():
+    if snowflake is None:
+        raise ImportError("snowflake-connector-python is not installed: install it, or pass connect= "
+                          "(e.g. LocalWarehouse().connect from Orchestration/local_backend)")
+    return snowflake.connector.connect
+
+
+# Shared tracing / query profiling layers live with the Airflow plugins (mounted into the Airflow containers)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "airflow", "plugins"))
+from pipeline_tracing import instrument_connect, tracer  # noqa: E402
+from query_profiling import QueryProfiler, SnowflakeQueryHistory, query_tag_from_env, with_query_tag  # noqa: E402
+from sampled_quality import SampledQualityChecker  # noqa: E402
+from run_history import notify_anomalies  # noqa: E402
+
+# Data quality checks: rows matching `failure` (or repeating `key`) are counted; `watermark_column` is the
+# load timestamp that scopes incremental runs to newly loaded rows. Checks with a `max_failure_rate`
+# tolerate that share of failing rows and may be estimated from a sample (dq_sample_percent)
+DATA_QUALITY_CHECKS = {
+    # Null primary keys
+    "null_customer_ids": {
+        "from": "bronze.crm_cust_info",
+        "failure": "cst_id IS NULL",
+        "watermark_column": "dwh_loaded_at",
+    },
+    # Negative sales
+    "negative_sales": {
+        "from": "silver.crm_sales_details",
+        "failure": "sls_sales < 0",
+        "watermark_column": "dwh_create_date",
+    },
+    # Referential integrity
+    "orphaned_customers": {
+        "from": "gold.fct_sales fs LEFT JOIN gold.dim_customers dc ON fs.customer_key = dc.customer_key",
+        "failure": "dc.customer_key IS NULL",
+        "watermark_column": "fs.dwh_created_at",
+    },
+    # Raw sales amounts not matching quantity * price (repaired in silver; a rising rate means a bad feed)
+    "sales_amount_mismatch_rate": {
+        "from": "bronze.crm_sales_details",
+        "failure": "sls_sales IS NULL OR sls_sales != sls_quantity * ABS(sls_price)",
+        "watermark_column": "dwh_loaded_at",
+        "max_failure_rate": 0.01,
+    },
+    # Missing customer attributes
+    "customer_name_null_rate": {
+        "from": "bronze.crm_cust_info",
+        "failure": "cst_first_name IS NULL OR cst_last_name IS NULL",
+        "watermark_column": "dwh_loaded_at",
+        "max_failure_rate": 0.01,
+    },
+    # Repeated customer ids in the raw feed (deduplicated in silver)
+    "duplicate_customer_id_rate": {
+        "from": "bronze.crm_cust_info",
+        "key": "cst_id",
+        "watermark_column": "dwh_loaded_at",
+        "max_failure_rate": 0.01,
+    },
+}
 
 class PipelineHealthChecker:
     """
     Comprehensive health checks for data pipeline components
     """
     
-    def __init__(self, snowflake_config):
-        self.snowflake_config = snowflake_config
+    def __init__(self, snowflake_config, connect=None, query_tag=None, profile_queries=False, history_source=None,
+                 dq_mode="incremental", dq_full_sweep_hours=168, dq_overlap_minutes=60,
+                 dq_state_table="control.dq_check_watermarks", dq_sample_percent=None, dq_sample_method="SYSTEM",
+                 dq_confidence=0.95, history_store=None, notifier=None):
+        self.query_tag = query_tag or query_tag_from_env(component="health_checks")
+        self.snowflake_config = with_query_tag(snowflake_config, self.query_tag)
+        # Any DB-API connect(**config) callable; defaults to the Snowflake connector
+        self.connect = instrument_connect(connect or _default_connect())
+        self.profile_queries_enabled = profile_queries
+        self.history_source = history_source
+        # "incremental" (watermarked, periodic full sweeps) or "full" (every run scans everything)
+        self.dq_mode = dq_mode
+        self.dq_full_sweep_hours = dq_full_sweep_hours
+        self.dq_overlap_minutes = dq_overlap_minutes
+        self.dq_state_table = dq_state_table
+        # Percent of blocks/rows read by tolerance-based checks; None runs every check exactly
+        self.dq_sample_percent = dq_sample_percent
+        self.dq_sample_method = dq_sample_method
+        self.dq_confidence = dq_confidence
+        # Run history (plugins/run_history.py) and an optional SlackNotifier for its anomalies
+        self.history_store = history_store
+        self.notifier = notifier
     
+    def profile_queries(self, start_time):
+        """
+        QUERY_HISTORY profile of every query this checker issued since start_time
+        """
+        try:
+            history_source = self.history_source or SnowflakeQueryHistory(self.connect, self.snowflake_config)
+            return QueryProfiler(history_source).profile(self.query_tag, start_time)
+        except Exception as e:
+            return {"status": "error", "error": str(e), "timestamp": datetime.now().isoformat()}
+    
+    @tracer.traced("health_check.snowflake_connectivity")
     def check_snowflake_connectivity(self):
         """
         Verify Snowflake database connectivity
         """
         try:
-            conn = snowflake.connector.connect(**self.snowflake_config)
+            conn = self.connect(**self.snowflake_config)
             cursor = conn.cursor()
             cursor.execute("SELECT CURRENT_VERSION()")
             version = cursor.fetchone()
@@ -41,6 +142,7 @@ class PipelineHealthChecker:
                 "timestamp": datetime.now().isoformat()
             }
     
+    @tracer.traced("health_check.pipeline_freshness")
     def check_pipeline_freshness(self):
         """
         Check data freshness across all layers
@@ -48,7 +150,7 @@ class PipelineHealthChecker:
         checks = {}
         
         try:
-            conn = snowflake.connector.connect(**self.snowflake_config)
+            conn = self.connect(**self.snowflake_config)
             cursor = conn.cursor()
             
             # Check bronze layer freshness
@@ -94,43 +196,114 @@ class PipelineHealthChecker:
                 "timestamp": datetime.now().isoformat()
             }
     
+    def _load_dq_state(self, cursor):
+        """
+        Per-check watermark and last full sweep from the DQ state table (created if missing)
+        """
+        schema = self.dq_state_table.rsplit(".", 1)[0]
+        cursor.execute(f"CREATE SCHEMA IF NOT EXISTS {schema}")
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS {self.dq_state_table} (
+                check_name VARCHAR,
+                watermark_column VARCHAR,
+                watermark_value TIMESTAMP_NTZ,
+                last_full_sweep_at TIMESTAMP_NTZ,
+                updated_at TIMESTAMP_NTZ
+            )
+        """)
+        cursor.execute(f"SELECT check_name, watermark_value, last_full_sweep_at FROM {self.dq_state_table}")
+        return {row[0]: {"watermark": row[1], "last_full_sweep_at": row[2]} for row in cursor.fetchall()}
+    
+    def _save_dq_state(self, cursor, check_name, watermark_column, watermark, last_full_sweep_at, now):
+        cursor.execute(f"DELETE FROM {self.dq_state_table} WHERE check_name = %(check_name)s",
+                       {"check_name": check_name})
+        cursor.execute(f"""
+            INSERT INTO {self.dq_state_table}
+                (check_name, watermark_column, watermark_value, last_full_sweep_at, updated_at)
+            VALUES (%(check_name)s, %(watermark_column)s, %(watermark)s, %(last_full_sweep_at)s, %(now)s)
+        """, {"check_name": check_name, "watermark_column": watermark_column, "watermark": watermark,
+              "last_full_sweep_at": last_full_sweep_at, "now": now})
+    
+    def _run_quality_check(self, checker, check, state, now):
+        """
+        Evaluate one check over rows loaded since its watermark or the full table
+        """
+        previous = state or {}
+        sweep_due = (previous.get("last_full_sweep_at") is None or
+                     now - previous["last_full_sweep_at"] >= timedelta(hours=self.dq_full_sweep_hours))
+        incremental = (self.dq_mode == "incremental" and not sweep_due and
+                       previous.get("watermark") is not None)
+        since = previous["watermark"] - timedelta(minutes=self.dq_overlap_minutes) if incremental else None
+        
+        result, (max_loaded_at,) = checker.run(
+            check,
+            where=f"{check['watermark_column']} > %(since)s" if incremental else None,
+            params={"since": since} if incremental else None,
+            extra_columns=[f"MAX({check['watermark_column']})"],
+        )
+        result.update({
+            "scope": "incremental" if incremental else "full",
+            "since": since.isoformat() if since else None,
+            "max_loaded_at": max_loaded_at.isoformat() if max_loaded_at else None,
+        })
+        return result, max_loaded_at
+    
+    @tracer.traced("health_check.data_quality")
     def check_data_quality_metrics(self):
         """
         Run comprehensive data quality checks
+
+        In incremental mode each check only reads rows loaded since the watermark it last validated
+        (minus an overlap) and sweeps the full table every dq_full_sweep_hours. A failing check keeps
+        its watermark and runs over the full table until it passes. With dq_sample_percent,
+        tolerance-based checks are estimated from a sample (or HyperLogLog for loose duplicate-key
+        thresholds) and only re-run exactly when the confidence interval straddles their threshold
         """
         quality_checks = {}
         
         try:
-            conn = snowflake.connector.connect(**self.snowflake_config)
+            conn = self.connect(**self.snowflake_config)
             cursor = conn.cursor()
+            now = datetime.now(timezone.utc).replace(tzinfo=None)
+            state = self._load_dq_state(cursor) if self.dq_mode == "incremental" else {}
             
-            # Check for null primary keys
-            cursor.execute("SELECT COUNT(*) FROM bronze.crm_cust_info WHERE cst_id IS NULL")
-            quality_checks['null_customer_ids'] = cursor.fetchone()[0]
+            def run_query(sql, params=None):
+                cursor.execute(sql, params)
+                return cursor.fetchone()
             
-            # Check for negative sales
-            cursor.execute("SELECT COUNT(*) FROM silver.crm_sales_details WHERE sls_sales < 0")
-            quality_checks['negative_sales'] = cursor.fetchone()[0]
+            checker = SampledQualityChecker(run_query, sample_percent=self.dq_sample_percent,
+                                            method=self.dq_sample_method, confidence=self.dq_confidence)
             
-            # Check referential integrity
-            cursor.execute("""
-                SELECT COUNT(*) 
-                FROM gold.fct_sales fs 
-                LEFT JOIN gold.dim_customers dc ON fs.customer_key = dc.customer_key 
-                WHERE dc.customer_key IS NULL
-            """)
-            quality_checks['orphaned_customers'] = cursor.fetchone()[0]
+            for check_name, check in DATA_QUALITY_CHECKS.items():
+                result, max_loaded_at = self._run_quality_check(checker, check, state.get(check_name), now)
+                quality_checks[check_name] = result
+                
+                if self.dq_mode == "incremental":
+                    previous = state.get(check_name) or {}
+                    watermark = previous.get("watermark")
+                    if not result["passed"]:
+                        # Keep the watermark and clear the sweep, so the next run (or retry) re-checks the
+                        # whole table instead of only rows loaded after the failing ones
+                        last_full_sweep_at = None
+                    else:
+                        if max_loaded_at is not None:
+                            watermark = max(watermark, max_loaded_at) if watermark else max_loaded_at
+                        last_full_sweep_at = now if result["scope"] == "full" else previous.get("last_full_sweep_at")
+                    self._save_dq_state(cursor, check_name, check["watermark_column"], watermark,
+                                        last_full_sweep_at, now)
             
             cursor.close()
             conn.close()
             
             # Evaluate overall quality status
-            failed_checks = sum(1 for count in quality_checks.values() if count > 0)
+            failed_checks = sum(1 for result in quality_checks.values() if not result["passed"])
             status = "healthy" if failed_checks == 0 else "degraded"
             
             return {
                 "status": status,
                 "failed_checks": failed_checks,
+                "mode": self.dq_mode,
+                "sample_percent": self.dq_sample_percent,
                 "details": quality_checks,
                 "timestamp": datetime.now().isoformat()
             }
@@ -142,16 +315,19 @@ class PipelineHealthChecker:
                 "timestamp": datetime.now().isoformat()
             }
     
+    @tracer.traced("health_check.airflow")
     def check_airflow_health(self, airflow_url, username, password):
         """
         Check Airflow web server health
         """
         try:
             # Get Airflow health endpoint
-            response = requests.get(
-                f"{airflow_url}/health",
-                auth=(username, password)
-            )
+            with tracer.span("http.request", method="GET", url=f"{airflow_url}/health") as span:
+                response = requests.get(
+                    f"{airflow_url}/health",
+                    auth=(username, password)
+                )
+                span.set_attribute("status_code", response.status_code)
             response.raise_for_status()
             
             health_data = response.json()
@@ -170,19 +346,26 @@ class PipelineHealthChecker:
                 "timestamp": datetime.now().isoformat()
             }
     
+    @tracer.traced("health_check.comprehensive")
     def run_comprehensive_health_check(self):
         """
         Run all health checks and return consolidated report
         """
+        started_at = datetime.now(timezone.utc)
+        started = time.perf_counter()
         report = {
             "timestamp": datetime.now().isoformat(),
-            "checks": {}
+            "checks": {},
+            "durations": {}
         }
         
         # Run all health checks
-        report["checks"]["snowflake_connectivity"] = self.check_snowflake_connectivity()
-        report["checks"]["pipeline_freshness"] = self.check_pipeline_freshness()
-        report["checks"]["data_quality"] = self.check_data_quality_metrics()
+        for name, check in (("snowflake_connectivity", self.check_snowflake_connectivity),
+                            ("pipeline_freshness", self.check_pipeline_freshness),
+                            ("data_quality", self.check_data_quality_metrics)):
+            check_started = time.perf_counter()
+            report["checks"][name] = check()
+            report["durations"][name] = round(time.perf_counter() - check_started, 3)
         
         # Determine overall status
         all_statuses = [check["status"] for check in report["checks"].values()]
@@ -193,4 +376,14 @@ class PipelineHealthChecker:
         else:
             report["overall_status"] = "healthy"
         
+        for check in report["checks"].values():
+            tracer.increment("pipeline_health_checks_total", status=check["status"])
+        
+        if self.profile_queries_enabled:
+            report["query_profile"] = self.profile_queries(started_at)
+        report["duration_seconds"] = round(time.perf_counter() - started, 3)
+        
+        if self.history_store is not None:
+            report["anomalies"] = self.history_store.record_report("health_checks", report)
+            notify_anomalies(report["anomalies"], self.notifier)
         return report
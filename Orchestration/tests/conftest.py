@@ -0,0 +1,11 @@
+"""
+Test setup: the plugins and the local warehouse backend are imported the way the monitoring scripts
+import them, from their directories
+"""
+
+import os
+import sys
+
+ORCHESTRATION_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+for directory in ("airflow/plugins", "local_backend", "monitoring/scripts"):
+    sys.path.insert(0, os.path.join(ORCHESTRATION_DIR, directory))
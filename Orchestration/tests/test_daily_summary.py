@@ -0,0 +1,77 @@
+"""
+Daily summary against the local Airflow REST API stub: pagination, the run cache and critical paths
+"""
+
+from datetime import datetime, time, timedelta, timezone
+
+import pytest
+
+from airflow_api_stub import PIPELINE_TASKS, AirflowApiStub
+from daily_summary import AirflowRunClient, DailySummaryBuilder, RunCache, critical_path
+
+# Recent runs: RunCache drops runs older than its retention window
+END = datetime.combine(datetime.now(timezone.utc).date(), time(), tzinfo=timezone.utc)
+DAY = (END - timedelta(days=1)).date()
+
+
+@pytest.fixture
+def stub():
+    stub = AirflowApiStub.synthetic(days=3, runs_per_day=4, failure_rate=0.0, end=END).start()
+    yield stub
+    stub.stop()
+
+
+@pytest.fixture
+def client(stub):
+    client = AirflowRunClient(stub.url, "admin", "admin", page_size=3)
+    yield client
+    client.close()
+
+
+def _longest_chain(graph, durations):
+    def chains(task_id):
+        children = [child for child in graph[task_id][1] if child in durations]
+        tails = [chain for child in children for chain in chains(child)] or [[]]
+        return [[task_id] + tail for tail in tails]
+    every = [chain for task_id in graph for chain in chains(task_id)]
+    return max((sum(durations[t] for t in chain), chain) for chain in every)
+
+
+def test_paginated_fetch_returns_every_run(stub, client):
+    runs = client.dag_runs("bronze_data_pipeline", END - timedelta(days=3), END)
+    assert len(runs) == 12
+    assert len({run["dag_run_id"] for run in runs}) == 12
+    pages = [path for path in stub.requests if path.startswith("/api/v1/dags/bronze_data_pipeline/dagRuns")]
+    assert sorted(int(path.split("offset=")[1].split("&")[0]) for path in pages) == [0, 3, 6, 9]
+
+
+def test_second_build_reads_finished_runs_from_cache(stub, client, tmp_path):
+    cache_path = str(tmp_path / "cache.json")
+    first = DailySummaryBuilder(client, cache=RunCache(cache_path)).build(DAY)
+    assert (first["runs_fetched"], first["runs_cached"]) == (16, 0)
+    assert first["success_count"] == 16
+
+    stub.requests.clear()
+    second = DailySummaryBuilder(client, cache=RunCache(cache_path)).build(DAY)
+    assert (second["runs_fetched"], second["runs_cached"]) == (0, 16)
+    assert not [path for path in stub.requests if "/taskInstances" in path]
+    assert second["pipelines"] == first["pipelines"]
+
+
+def test_critical_path_is_longest_duration_chain(stub, client):
+    summary = DailySummaryBuilder(client).build(DAY)
+    for dag_id, pipeline in summary["pipelines"].items():
+        graph = PIPELINE_TASKS[dag_id]
+        expected = max(_longest_chain(graph, {ti["task_id"]: ti["duration"] for ti in instances})
+                       for (run_dag_id, run_id), instances in stub.task_instances.items()
+                       if run_dag_id == dag_id and run_id.startswith(f"scheduled__{DAY.isoformat()}"))
+        assert pipeline["critical_path"] == expected[1]
+        assert pipeline["critical_path_minutes"] == round(round(expected[0], 1) / 60, 1)
+
+
+def test_critical_path_skips_tasks_missing_from_the_run():
+    downstream = {"a": ["b", "c"], "b": ["d"], "c": ["d"], "d": []}
+    task_instances = [{"task_id": "a", "duration": 1.0}, {"task_id": "b", "duration": 5.0},
+                      {"task_id": "c", "duration": 2.0}]
+    assert critical_path(task_instances, downstream) == (6.0, ["a", "b"])
+    assert critical_path([], downstream) == (0.0, [])
@@ -0,0 +1,103 @@
+"""
+Warehouse sizing against the local backend: the issued ALTER WAREHOUSE statements are read back from
+LocalWarehouse.query_history
+"""
+
+from local_warehouse import LocalWarehouse
+from warehouse_sizing import SizingHistory, WarehouseSizer, sizing_callbacks
+
+TASK_KEY = "bronze_data_pipeline.load_bronze_tables"
+
+
+def _statements(warehouse):
+    return [query["query_text"] for query in warehouse.query_history]
+
+
+def _sizer(local, history=None, **kwargs):
+    kwargs.setdefault("warehouse", "DWH_BRONZE_WH")
+    return WarehouseSizer(local.connect, history=history or SizingHistory(), **kwargs)
+
+
+def _history(runs, spent=None, run_id="run_1"):
+    history = SizingHistory()
+    history.data["tasks"][TASK_KEY] = runs
+    if spent is not None:
+        history.data["budgets"][run_id] = spent
+    return history
+
+
+def test_sized_resizes_suspends_and_restores():
+    warehouse = LocalWarehouse()
+    sizer = _sizer(warehouse, restore_size="X-SMALL", run_id="run_1")
+    with sizer.sized(TASK_KEY) as decision:
+        assert decision["size"] == "X-SMALL"
+        assert decision["reason"] == "no run history; default size"
+    assert _statements(warehouse) == [
+        "ALTER WAREHOUSE DWH_BRONZE_WH SET WAREHOUSE_SIZE = 'X-SMALL' WAIT_FOR_COMPLETION = TRUE",
+        "ALTER WAREHOUSE DWH_BRONZE_WH SUSPEND",
+        "ALTER WAREHOUSE DWH_BRONZE_WH SET WAREHOUSE_SIZE = 'X-SMALL'",
+    ]
+    assert [run["size"] for run in sizer.history.runs(TASK_KEY)] == ["X-SMALL"]
+    assert sizer.history.spent("run_1") == decision["credits"]
+
+
+def test_history_picks_cheapest_size_meeting_target():
+    warehouse = LocalWarehouse()
+    runs = [{"size": "X-SMALL", "seconds": 3600, "credits": 1.0}, {"size": "SMALL", "seconds": 1800, "credits": 1.0}]
+    sizer = _sizer(warehouse, history=_history(runs))
+    with sizer.sized(TASK_KEY, target_seconds=900) as decision:
+        pass
+    assert decision["size"] == "MEDIUM"
+    assert decision["estimates"]["MEDIUM"]["seconds"] == 900
+    assert _statements(warehouse)[0] == (
+        "ALTER WAREHOUSE DWH_BRONZE_WH SET WAREHOUSE_SIZE = 'MEDIUM' WAIT_FOR_COMPLETION = TRUE")
+
+
+def test_exhausted_budget_falls_back_to_smallest_size():
+    warehouse = LocalWarehouse()
+    runs = [{"size": "LARGE", "seconds": 600, "credits": 1.33}]
+    sizer = _sizer(warehouse, history=_history(runs, spent=10.5), credit_budget=10, run_id="run_1",
+                   min_size="SMALL", default_size="MEDIUM")
+    with sizer.sized(TASK_KEY, target_seconds=60) as decision:
+        pass
+    assert decision["size"] == "SMALL"
+    assert decision["reason"] == "credit budget of 10 exhausted for run run_1; smallest size"
+    assert decision["budget_remaining"] == -0.5
+    assert _statements(warehouse)[0] == (
+        "ALTER WAREHOUSE DWH_BRONZE_WH SET WAREHOUSE_SIZE = 'SMALL' WAIT_FOR_COMPLETION = TRUE")
+
+
+def test_budget_skips_sizes_that_would_exceed_it():
+    runs = [{"size": "X-SMALL", "seconds": 600, "credits": 0.166667}]
+    sizer = _sizer(LocalWarehouse(), history=_history(runs, spent=9.7), credit_budget=10, run_id="run_1",
+                   scaling_efficiency=0.5)
+    decision = sizer.choose_size(TASK_KEY, target_seconds=60)
+    assert decision["estimates"]["SMALL"]["credits"] <= 0.3 < decision["estimates"]["MEDIUM"]["credits"]
+    assert decision["size"] == "SMALL"
+    assert decision["reason"] == "no affordable size meets the 60s target; fastest affordable"
+
+
+def test_switch_mode_suspends_chosen_warehouse_without_resizing():
+    warehouse = LocalWarehouse()
+    sizer = _sizer(warehouse, warehouse=None, warehouses={"X-SMALL": "DWH_XS_WH", "LARGE": "DWH_L_WH"},
+                   default_size="LARGE", restore_size="X-SMALL")
+    with sizer.sized(TASK_KEY) as decision:
+        assert decision["warehouse"] == "DWH_L_WH"
+    assert _statements(warehouse) == ["ALTER WAREHOUSE DWH_L_WH SUSPEND"]
+
+
+def test_cleanup_releases_warehouse_without_recording_the_failed_run():
+    warehouse = LocalWarehouse()
+    sizer = _sizer(warehouse, restore_size="X-SMALL")
+    bound = []
+    pre_execute, post_execute, cleanup = sizing_callbacks(
+        lambda context: sizer, TASK_KEY, bind=lambda task, name: bound.append((task, name)))
+    pre_execute({"task": "load_bronze_tables"})
+    cleanup({"task": "load_bronze_tables"})
+    post_execute({"task": "load_bronze_tables"})
+    assert bound == [("load_bronze_tables", "DWH_BRONZE_WH")]
+    assert _statements(warehouse)[1:] == [
+        "ALTER WAREHOUSE DWH_BRONZE_WH SUSPEND",
+        "ALTER WAREHOUSE DWH_BRONZE_WH SET WAREHOUSE_SIZE = 'X-SMALL'",
+    ]
+    assert sizer.history.runs(TASK_KEY) == []
@@ -18,3 +18,17 @@ CREATE OR REPLACE FILE FORMAT bronze.my_csv_format
     EMPTY_FIELD_AS_NULL = TRUE          -- Treat empty fields as NULL values
     NULL_IF = ('NULL', 'null', '')      -- Standardize NULL representations
     COMMENT = 'Standard CSV format for bronze layer data ingestion from S3';
+
+-- =================================================================================
+-- PARQUET FORMAT FOR BRONZE LAYER
+-- 
+-- Used for files produced by Orchestration/ingestion/parquet_converter.py
+-- Features: Typed columns named after the bronze DDL, compressed (Snappy/ZSTD),
+--           loaded with MATCH_BY_COLUMN_NAME instead of positional parsing
+-- =================================================================================
+CREATE OR REPLACE FILE FORMAT bronze.my_parquet_format
+    TYPE = PARQUET                      -- Columnar, typed source files
+    COMPRESSION = AUTO                  -- Detect Snappy/ZSTD/GZIP from file metadata
+    BINARY_AS_TEXT = FALSE              -- Strings are written as UTF8 logical type
+    USE_LOGICAL_TYPE = TRUE             -- Map Parquet DATE/TIMESTAMP to Snowflake types
+    COMMENT = 'Parquet format for bronze layer data ingestion from converted source files';
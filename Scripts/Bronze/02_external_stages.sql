@@ -32,6 +32,44 @@ CREATE OR REPLACE STAGE bronze.erp_stage
   FILE_FORMAT = bronze.my_csv_format             -- Apply standardized CSV parsing
   COMMENT = 'External stage for ERP source files (customer, location, product category data)';
 
+-- =================================================================================
+-- PARQUET DATA STAGES
+-- 
+-- Point to Parquet files produced by the pre-upload conversion stage
+-- Layout: parquet/<system>/<source>/[order_month=YYYYMM/]part-NNNNN.parquet
+-- Used by: bronze.load_bronze_layer_parquet() (07_parquet_load_procedure.sql)
+-- =================================================================================
+CREATE OR REPLACE STAGE bronze.crm_parquet_stage
+  URL = 's3://robel-data-lake/parquet/crm/'      -- S3 path for converted CRM files
+  CREDENTIALS = (AWS_KEY_ID = ' ' AWS_SECRET_KEY = ' ')
+  FILE_FORMAT = bronze.my_parquet_format         -- Apply Parquet parsing
+  COMMENT = 'External stage for CRM source files converted to Parquet';
+
+CREATE OR REPLACE STAGE bronze.erp_parquet_stage
+  URL = 's3://robel-data-lake/parquet/erp/'      -- S3 path for converted ERP files
+  CREDENTIALS = (AWS_KEY_ID = ' ' AWS_SECRET_KEY = ' ')
+  FILE_FORMAT = bronze.my_parquet_format         -- Apply Parquet parsing
+  COMMENT = 'External stage for ERP source files converted to Parquet';
+
+-- =================================================================================
+-- CHANGE CAPTURE (CDC) DELTA STAGES
+-- 
+-- Point to <source>_delta_<timestamp>.csv files produced by
+-- Orchestration/ingestion/change_capture.py (source columns + trailing cdc_op)
+-- Kept apart from raw/ so full-load PATTERNs never pick up delta files
+-- =================================================================================
+CREATE OR REPLACE STAGE bronze.crm_cdc_stage
+  URL = 's3://robel-data-lake/cdc/crm/'          -- S3 path for CRM delta files
+  CREDENTIALS = (AWS_KEY_ID = ' ' AWS_SECRET_KEY = ' ')
+  FILE_FORMAT = bronze.my_csv_format             -- Deltas keep the source CSV layout
+  COMMENT = 'External stage for CRM change capture delta files';
+
+CREATE OR REPLACE STAGE bronze.erp_cdc_stage
+  URL = 's3://robel-data-lake/cdc/erp/'          -- S3 path for ERP delta files
+  CREDENTIALS = (AWS_KEY_ID = ' ' AWS_SECRET_KEY = ' ')
+  FILE_FORMAT = bronze.my_csv_format             -- Deltas keep the source CSV layout
+  COMMENT = 'External stage for ERP change capture delta files';
+
 -- =================================================================================
 -- STAGE VALIDATION QUERIES
 -- 
@@ -45,5 +83,13 @@ LIST @bronze.crm_stage;
 -- Verify ERP stage configuration and list files  
 LIST @bronze.erp_stage;
 
+-- Verify Parquet stages (one directory per source, sales partitioned by month)
+LIST @bronze.crm_parquet_stage;
+LIST @bronze.erp_parquet_stage;
+
+-- Verify CDC delta stages
+LIST @bronze.crm_cdc_stage;
+LIST @bronze.erp_cdc_stage;
+
 -- Expected output: Should show CSV files for each data source
 */
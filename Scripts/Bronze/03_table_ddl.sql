@@ -22,7 +22,8 @@ CREATE TABLE IF NOT EXISTS bronze.crm_cust_info (
     cst_last_name VARCHAR(50),      -- Customer last name (raw)
     cst_marital_status VARCHAR(50), -- Marital status indicator
     cst_gndr VARCHAR(50),           -- Gender code (raw format)
-    cst_create_date DATE            -- Customer creation date
+    cst_create_date DATE,           -- Customer creation date
+    dwh_loaded_at TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP()  -- Load time (watermark for silver incremental models)
 )
 COMMENT = 'Raw CRM customer information - preserved exactly as received from source';
 
@@ -35,7 +36,8 @@ CREATE TABLE IF NOT EXISTS bronze.crm_prd_info (
     prd_cost INT,                   -- Product cost amount
     prd_line VARCHAR(50),           -- Product line/category
     prd_start_dt TIMESTAMP,         -- Product effective start date
-    prd_end_dt TIMESTAMP            -- Product effective end date
+    prd_end_dt TIMESTAMP,           -- Product effective end date
+    dwh_loaded_at TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP()  -- Load time (watermark for silver incremental models)
 )
 COMMENT = 'Raw CRM product information - preserved exactly as received from source';
 
@@ -50,7 +52,8 @@ CREATE TABLE IF NOT EXISTS bronze.crm_sales_details (
     sls_due_dt INT,                 -- Due date (raw integer format)
     sls_sales INT,                  -- Sales amount
     sls_quantity INT,               -- Quantity sold
-    sls_price INT                   -- Unit price
+    sls_price INT,                  -- Unit price
+    dwh_loaded_at TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP()  -- Load time (watermark for silver incremental models)
 )
 COMMENT = 'Raw CRM sales transaction details - preserved exactly as received from source';
 
@@ -66,7 +69,8 @@ COMMENT = 'Raw CRM sales transaction details - preserved exactly as received fro
 CREATE TABLE IF NOT EXISTS bronze.erp_cust_az12 (
     CID VARCHAR(50),                -- Customer identifier (ERP format)
     BDATE DATE,                     -- Birth date
-    GEN VARCHAR(50)                 -- Gender code (ERP format)
+    GEN VARCHAR(50),                -- Gender code (ERP format)
+    dwh_loaded_at TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP()  -- Load time (watermark for silver incremental models)
 )
 COMMENT = 'Raw ERP customer data from AZ12 system - preserved exactly as received';
 
@@ -74,7 +78,8 @@ COMMENT = 'Raw ERP customer data from AZ12 system - preserved exactly as receive
 -- Source: Customer geographic data from ERP system
 CREATE TABLE IF NOT EXISTS bronze.erp_loc_a101 (
     cid VARCHAR(50),                -- Customer identifier (matches ERP CID)
-    cntry VARCHAR(50)               -- Country code
+    cntry VARCHAR(50),              -- Country code
+    dwh_loaded_at TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP()  -- Load time (watermark for silver incremental models)
 )
 COMMENT = 'Raw ERP location data from A101 system - preserved exactly as received';
 
@@ -84,10 +89,24 @@ CREATE TABLE IF NOT EXISTS bronze.erp_px_cat_g1v2 (
     id VARCHAR(50),                 -- Product category identifier
     cat VARCHAR(50),                -- Main category
     subcat VARCHAR(50),             -- Sub-category
-    maintenance VARCHAR(50)         -- Maintenance indicator
+    maintenance VARCHAR(50),        -- Maintenance indicator
+    dwh_loaded_at TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP()  -- Load time (watermark for silver incremental models)
 )
 COMMENT = 'Raw ERP product category data from G1V2 system - preserved exactly as received';
 
+-- =================================================================================
+-- LOAD TIMESTAMP COLUMN
+-- 
+-- dwh_loaded_at is not part of the source files: COPY INTO lists the source
+-- columns explicitly and the column takes its default, and CDC deltas applied by
+-- apply_change_capture() get a fresh timestamp. Silver models filter on it
+-- against their stored watermark (Silver/dbt/macros/incremental_strategy.sql).
+-- 
+-- Existing tables: the column default cannot be added to non-empty tables, so
+-- recreate them once (bronze is a full refresh, nothing is lost):
+--   CREATE OR REPLACE TABLE ... using the definitions above, then CALL bronze.load_bronze_layer();
+-- =================================================================================
+
 -- =================================================================================
 -- TABLE VALIDATION QUERIES
 -- 
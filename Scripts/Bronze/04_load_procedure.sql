@@ -49,7 +49,8 @@ BEGIN
     BEGIN
         TRUNCATE TABLE bronze.crm_cust_info;  -- Clear existing data for idempotent reload
         COPY INTO bronze.crm_cust_info        -- Load data from S3 stage to table
-        FROM @bronze.crm_stage                -- Use CRM external stage
+            (cst_id, cst_key, cst_first_name, cst_last_name, cst_marital_status, cst_gndr, cst_create_date)  -- dwh_loaded_at takes its default
+        FROM (SELECT $1, $2, $3, $4, $5, $6, $7 FROM @bronze.crm_stage)  -- Use CRM external stage
         PATTERN = '.*cust_info.*\\.csv'       -- Match files containing 'cust_info' in name
         ON_ERROR = 'CONTINUE';                -- Skip problematic rows but continue processing
         
@@ -73,7 +74,8 @@ BEGIN
     BEGIN
         TRUNCATE TABLE bronze.crm_prd_info;   -- Clear existing data
         COPY INTO bronze.crm_prd_info         -- Load product data
-        FROM @bronze.crm_stage                -- Use CRM external stage
+            (prd_id, prd_key, prd_nm, prd_cost, prd_line, prd_start_dt, prd_end_dt)  -- dwh_loaded_at takes its default
+        FROM (SELECT $1, $2, $3, $4, $5, $6, $7 FROM @bronze.crm_stage)  -- Use CRM external stage
         PATTERN = '.*prd_info.*\\.csv'        -- Match product information files
         ON_ERROR = 'CONTINUE';                -- Tolerant error handling
         
@@ -97,7 +99,8 @@ BEGIN
     BEGIN
         TRUNCATE TABLE bronze.crm_sales_details;  -- Clear existing sales data
         COPY INTO bronze.crm_sales_details        -- Load sales transaction data
-        FROM @bronze.crm_stage                    -- Use CRM external stage
+            (sls_ord_num, sls_prd_key, sls_cust_id, sls_order_dt, sls_ship_dt, sls_due_dt, sls_sales, sls_quantity, sls_price)  -- dwh_loaded_at takes its default
+        FROM (SELECT $1, $2, $3, $4, $5, $6, $7, $8, $9 FROM @bronze.crm_stage)  -- Use CRM external stage
         PATTERN = '.*sales_details.*\\.csv'       -- Match sales detail files
         ON_ERROR = 'CONTINUE';                    -- Continue on non-fatal errors
         
@@ -126,7 +129,8 @@ BEGIN
     BEGIN
         TRUNCATE TABLE bronze.erp_cust_az12;  -- Clear existing ERP customer data
         COPY INTO bronze.erp_cust_az12        -- Load ERP customer information
-        FROM @bronze.erp_stage                -- Use ERP external stage
+            (CID, BDATE, GEN)  -- dwh_loaded_at takes its default
+        FROM (SELECT $1, $2, $3 FROM @bronze.erp_stage)  -- Use ERP external stage
         PATTERN = '.*CUST_AZ12.*\\.csv'       -- Match ERP customer files
         ON_ERROR = 'CONTINUE';                -- Error tolerance for data variances
         
@@ -150,7 +154,8 @@ BEGIN
     BEGIN
         TRUNCATE TABLE bronze.erp_loc_a101;   -- Clear existing location data
         COPY INTO bronze.erp_loc_a101         -- Load customer location information
-        FROM @bronze.erp_stage                -- Use ERP external stage
+            (cid, cntry)  -- dwh_loaded_at takes its default
+        FROM (SELECT $1, $2 FROM @bronze.erp_stage)  -- Use ERP external stage
         PATTERN = '.*LOC_A101.*\\.csv'        -- Match location data files
         ON_ERROR = 'CONTINUE';                -- Handle data quality issues gracefully
         
@@ -174,7 +179,8 @@ BEGIN
     BEGIN
         TRUNCATE TABLE bronze.erp_px_cat_g1v2;  -- Clear existing category data
         COPY INTO bronze.erp_px_cat_g1v2        -- Load product category information
-        FROM @bronze.erp_stage                  -- Use ERP external stage
+            (id, cat, subcat, maintenance)  -- dwh_loaded_at takes its default
+        FROM (SELECT $1, $2, $3, $4 FROM @bronze.erp_stage)  -- Use ERP external stage
         PATTERN = '.*PX_CAT_G1V2.*\\.csv'       -- Match product category files
         ON_ERROR = 'CONTINUE';                  -- Continue on partial failures
         
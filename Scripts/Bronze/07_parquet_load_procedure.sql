@@ -0,0 +1,200 @@
+-- =================================================================================
+-- BRONZE LAYER PARQUET INGESTION PIPELINE
+-- 
+-- Purpose: Load converted Parquet files from S3 into the bronze layer tables
+-- Description: Alternative to load_bronze_layer() for files produced by
+--              Orchestration/ingestion/parquet_converter.py. Files are typed and
+--              compressed, so fewer bytes cross the wire and COPY skips CSV parsing
+-- Architecture: CSV → Parquet (local) → S3 → Parquet Stages → Bronze Tables
+-- =================================================================================
+-- LOADING STRATEGY DOCUMENTATION: refer bronze/00_strategy_documentation.md
+-- =================================================================================
+-- PARQUET LOADING PROCEDURE: load_bronze_layer_parquet
+-- 
+-- Purpose: Same full refresh semantics as load_bronze_layer(), Parquet source
+-- Features: 
+--   - Column mapping by name (MATCH_BY_COLUMN_NAME) instead of by position
+--   - sales_details is split into order_month partitions sized for parallel COPY
+--   - Identical logging and return message format as the CSV loader
+-- =================================================================================
+CREATE OR REPLACE PROCEDURE bronze.load_bronze_layer_parquet()
+RETURNS STRING
+LANGUAGE SQL
+EXECUTE AS OWNER
+AS
+$$
+DECLARE
+    load_start_time TIMESTAMP;      -- Track procedure start time for performance monitoring
+    procedure_result STRING;        -- Final result message to return to caller
+    rows_loaded INTEGER DEFAULT 0;  -- Track rows loaded for each table (for logging)
+    files_processed INTEGER DEFAULT 0; -- Count of successfully processed tables
+    error_message STRING;           -- Capture error details for exception handling
+BEGIN
+    load_start_time := CURRENT_TIMESTAMP();
+    SYSTEM$LOG('INFO', 'Starting bronze layer Parquet load procedure');
+
+    -- TABLE: CRM Customer Information
+    BEGIN
+        TRUNCATE TABLE bronze.crm_cust_info;
+        COPY INTO bronze.crm_cust_info
+        FROM @bronze.crm_parquet_stage
+        PATTERN = '.*cust_info/.*[.]parquet'
+        MATCH_BY_COLUMN_NAME = CASE_INSENSITIVE   -- Parquet columns carry the DDL names
+        INCLUDE_METADATA = (dwh_loaded_at = METADATA$START_SCAN_TIME)  -- Load timestamp for watermarks
+        ON_ERROR = 'CONTINUE';
+        
+        LET c1 CURSOR FOR SELECT COUNT(*) AS row_count FROM bronze.crm_cust_info;
+        OPEN c1;
+        FETCH c1 INTO rows_loaded;
+        CLOSE c1;
+        
+        SYSTEM$LOG('INFO', 'Loaded ' || rows_loaded || ' rows into crm_cust_info from Parquet');
+        files_processed := files_processed + 1;
+    EXCEPTION
+        WHEN OTHER THEN
+            error_message := 'Failed to load crm_cust_info from Parquet: ' || SQLERRM;
+            SYSTEM$LOG('ERROR', error_message);
+            RAISE;
+    END;
+
+    -- TABLE: CRM Product Information
+    BEGIN
+        TRUNCATE TABLE bronze.crm_prd_info;
+        COPY INTO bronze.crm_prd_info
+        FROM @bronze.crm_parquet_stage
+        PATTERN = '.*prd_info/.*[.]parquet'
+        MATCH_BY_COLUMN_NAME = CASE_INSENSITIVE   -- Parquet columns carry the DDL names
+        INCLUDE_METADATA = (dwh_loaded_at = METADATA$START_SCAN_TIME)  -- Load timestamp for watermarks
+        ON_ERROR = 'CONTINUE';
+        
+        LET c2 CURSOR FOR SELECT COUNT(*) AS row_count FROM bronze.crm_prd_info;
+        OPEN c2;
+        FETCH c2 INTO rows_loaded;
+        CLOSE c2;
+        
+        SYSTEM$LOG('INFO', 'Loaded ' || rows_loaded || ' rows into crm_prd_info from Parquet');
+        files_processed := files_processed + 1;
+    EXCEPTION
+        WHEN OTHER THEN
+            error_message := 'Failed to load crm_prd_info from Parquet: ' || SQLERRM;
+            SYSTEM$LOG('ERROR', error_message);
+            RAISE;
+    END;
+
+    -- TABLE: CRM Sales Details (partitioned by order_month=YYYYMM)
+    BEGIN
+        TRUNCATE TABLE bronze.crm_sales_details;
+        COPY INTO bronze.crm_sales_details
+        FROM @bronze.crm_parquet_stage
+        PATTERN = '.*sales_details/.*[.]parquet'
+        MATCH_BY_COLUMN_NAME = CASE_INSENSITIVE   -- Parquet columns carry the DDL names
+        INCLUDE_METADATA = (dwh_loaded_at = METADATA$START_SCAN_TIME)  -- Load timestamp for watermarks
+        ON_ERROR = 'CONTINUE';
+        
+        LET c3 CURSOR FOR SELECT COUNT(*) AS row_count FROM bronze.crm_sales_details;
+        OPEN c3;
+        FETCH c3 INTO rows_loaded;
+        CLOSE c3;
+        
+        SYSTEM$LOG('INFO', 'Loaded ' || rows_loaded || ' rows into crm_sales_details from Parquet');
+        files_processed := files_processed + 1;
+    EXCEPTION
+        WHEN OTHER THEN
+            error_message := 'Failed to load crm_sales_details from Parquet: ' || SQLERRM;
+            SYSTEM$LOG('ERROR', error_message);
+            RAISE;
+    END;
+
+    -- TABLE: ERP Customer Data (AZ12 System)
+    BEGIN
+        TRUNCATE TABLE bronze.erp_cust_az12;
+        COPY INTO bronze.erp_cust_az12
+        FROM @bronze.erp_parquet_stage
+        PATTERN = '.*CUST_AZ12/.*[.]parquet'
+        MATCH_BY_COLUMN_NAME = CASE_INSENSITIVE   -- Parquet columns carry the DDL names
+        INCLUDE_METADATA = (dwh_loaded_at = METADATA$START_SCAN_TIME)  -- Load timestamp for watermarks
+        ON_ERROR = 'CONTINUE';
+        
+        LET c4 CURSOR FOR SELECT COUNT(*) AS row_count FROM bronze.erp_cust_az12;
+        OPEN c4;
+        FETCH c4 INTO rows_loaded;
+        CLOSE c4;
+        
+        SYSTEM$LOG('INFO', 'Loaded ' || rows_loaded || ' rows into erp_cust_az12 from Parquet');
+        files_processed := files_processed + 1;
+    EXCEPTION
+        WHEN OTHER THEN
+            error_message := 'Failed to load erp_cust_az12 from Parquet: ' || SQLERRM;
+            SYSTEM$LOG('ERROR', error_message);
+            RAISE;
+    END;
+
+    -- TABLE: ERP Location Data (A101 System)
+    BEGIN
+        TRUNCATE TABLE bronze.erp_loc_a101;
+        COPY INTO bronze.erp_loc_a101
+        FROM @bronze.erp_parquet_stage
+        PATTERN = '.*LOC_A101/.*[.]parquet'
+        MATCH_BY_COLUMN_NAME = CASE_INSENSITIVE   -- Parquet columns carry the DDL names
+        INCLUDE_METADATA = (dwh_loaded_at = METADATA$START_SCAN_TIME)  -- Load timestamp for watermarks
+        ON_ERROR = 'CONTINUE';
+        
+        LET c5 CURSOR FOR SELECT COUNT(*) AS row_count FROM bronze.erp_loc_a101;
+        OPEN c5;
+        FETCH c5 INTO rows_loaded;
+        CLOSE c5;
+        
+        SYSTEM$LOG('INFO', 'Loaded ' || rows_loaded || ' rows into erp_loc_a101 from Parquet');
+        files_processed := files_processed + 1;
+    EXCEPTION
+        WHEN OTHER THEN
+            error_message := 'Failed to load erp_loc_a101 from Parquet: ' || SQLERRM;
+            SYSTEM$LOG('ERROR', error_message);
+            RAISE;
+    END;
+
+    -- TABLE: ERP Product Category Data (G1V2 System)
+    BEGIN
+        TRUNCATE TABLE bronze.erp_px_cat_g1v2;
+        COPY INTO bronze.erp_px_cat_g1v2
+        FROM @bronze.erp_parquet_stage
+        PATTERN = '.*PX_CAT_G1V2/.*[.]parquet'
+        MATCH_BY_COLUMN_NAME = CASE_INSENSITIVE   -- Parquet columns carry the DDL names
+        INCLUDE_METADATA = (dwh_loaded_at = METADATA$START_SCAN_TIME)  -- Load timestamp for watermarks
+        ON_ERROR = 'CONTINUE';
+        
+        LET c6 CURSOR FOR SELECT COUNT(*) AS row_count FROM bronze.erp_px_cat_g1v2;
+        OPEN c6;
+        FETCH c6 INTO rows_loaded;
+        CLOSE c6;
+        
+        SYSTEM$LOG('INFO', 'Loaded ' || rows_loaded || ' rows into erp_px_cat_g1v2 from Parquet');
+        files_processed := files_processed + 1;
+    EXCEPTION
+        WHEN OTHER THEN
+            error_message := 'Failed to load erp_px_cat_g1v2 from Parquet: ' || SQLERRM;
+            SYSTEM$LOG('ERROR', error_message);
+            RAISE;
+    END;
+
+    procedure_result := 'SUCCESS: Bronze layer Parquet load completed. ' || 
+                       files_processed || ' tables loaded in ' || 
+                       DATEDIFF('second', load_start_time, CURRENT_TIMESTAMP()) || ' seconds.';
+    
+    SYSTEM$LOG('INFO', procedure_result);
+    RETURN procedure_result;
+    
+END;
+$$;
+
+-- =================================================================================
+-- USAGE INSTRUCTIONS:
+-- 
+-- 1. Convert sources: python Orchestration/ingestion/parquet_converter.py --output-dir parquet --upload-bucket robel-data-lake
+-- 2. Execute the loader: CALL bronze.load_bronze_layer_parquet();
+-- 3. Validate results: Use bronze validation procedures (unchanged)
+-- 4. Compare with CSV path: python Orchestration/benchmarks/parquet_load_benchmark.py
+-- 
+-- EXPECTED OUTPUT: 
+-- 'SUCCESS: Bronze layer Parquet load completed. 6 tables loaded in X seconds.'
+-- =================================================================================
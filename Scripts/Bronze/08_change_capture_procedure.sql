@@ -0,0 +1,141 @@
+-- =================================================================================
+-- BRONZE LAYER CHANGE CAPTURE (CDC) APPLY PROCEDURE
+-- 
+-- Purpose: Apply row-level deltas to bronze tables instead of reloading full snapshots
+-- Description: Upstream systems re-export complete snapshots even when only a few
+--              rows changed. Orchestration/ingestion/change_capture.py diffs each
+--              snapshot against the previous one and emits only I/U/D rows
+-- Architecture: Snapshot → change_capture.py → S3 (cdc/) → CDC Stages → Bronze Tables
+-- =================================================================================
+-- LOADING STRATEGY DOCUMENTATION: refer bronze/00_strategy_documentation.md
+-- =================================================================================
+-- PROCEDURE: apply_change_capture
+-- 
+-- Purpose: Merge one delta file set into a bronze table
+-- Parameters:
+--   target_table  - bronze table name, e.g. 'crm_cust_info'
+--   stage_name    - CDC stage, e.g. 'bronze.crm_cdc_stage'
+--   file_pattern  - delta file pattern, e.g. '.*cust_info_delta_.*[.]csv'
+--   key_columns   - business key columns, e.g. ARRAY_CONSTRUCT('cst_id')
+-- Semantics:
+--   - Delta rows are staged in a persistent transient table bronze.<target>_delta, so
+--     COPY load metadata (kept 64 days per table) skips delta files already applied
+--   - The staging table is emptied with DELETE, never TRUNCATE or CREATE OR REPLACE:
+--     both drop that load metadata and would re-apply every historical delta file
+--   - When several files carry the same business key, only the newest file's rows for
+--     that key are applied. File names end in _<YYYYMMDD_HHMMSS>, so they sort in capture
+--     order, and change_capture.py always re-emits a changed key in full
+--   - Every key of that newest version deletes its bronze rows; its 'I' and 'U' rows are
+--     then inserted (a key may carry several rows), so 'D' keys stay deleted
+--   - Keys compare with EQUAL_NULL so rows with a NULL key stay consistent
+--   - Inserted rows get a fresh dwh_loaded_at, so silver watermarks pick them up
+-- =================================================================================
+CREATE OR REPLACE PROCEDURE bronze.apply_change_capture(
+    target_table STRING,
+    stage_name STRING,
+    file_pattern STRING,
+    key_columns ARRAY
+)
+RETURNS STRING
+LANGUAGE SQL
+EXECUTE AS OWNER
+AS
+$$
+DECLARE
+    delta_table STRING;             -- Persistent transient table holding staged delta rows
+    latest_table STRING;            -- Newest version of each changed key in this batch
+    column_list STRING;             -- Source columns of the target in ordinal order
+    column_count INTEGER;           -- Source column count (positional $n in the delta files)
+    select_list STRING DEFAULT '';  -- $1, $2, ... of the COPY transformation
+    key_list STRING DEFAULT '';     -- Business key columns for PARTITION BY
+    key_predicate STRING DEFAULT '';-- Null-safe join on the business key
+    rows_staged INTEGER DEFAULT 0;
+    rows_deleted INTEGER DEFAULT 0;
+    rows_inserted INTEGER DEFAULT 0;
+    procedure_result STRING;
+    error_message STRING;
+BEGIN
+    delta_table := 'bronze.' || target_table || '_delta';
+    latest_table := 'bronze.' || target_table || '_delta_latest';
+
+    SELECT LISTAGG(column_name, ', ') WITHIN GROUP (ORDER BY ordinal_position), COUNT(*)
+      INTO :column_list, :column_count
+      FROM information_schema.columns
+     WHERE table_schema = 'BRONZE'
+       AND table_name = UPPER(:target_table)
+       AND column_name != 'DWH_LOADED_AT';  -- Set by its default on insert, not present in delta files
+
+    -- Source columns plus the trailing cdc_op flag
+    FOR i IN 1 TO column_count + 1 DO
+        select_list := select_list || '$' || i || ', ';
+    END FOR;
+
+    FOR i IN 0 TO ARRAY_SIZE(key_columns) - 1 DO
+        key_list := key_list || IFF(i > 0, ', ', '') || key_columns[i]::STRING;
+        key_predicate := key_predicate || IFF(i > 0, ' AND ', '') ||
+            'EQUAL_NULL(t.' || key_columns[i]::STRING || ', d.' || key_columns[i]::STRING || ')';
+    END FOR;
+
+    -- Staging table: the target's source columns plus cdc_op and the file each row came from.
+    -- Created once and kept, so its load metadata survives between calls
+    EXECUTE IMMEDIATE 'CREATE TRANSIENT TABLE IF NOT EXISTS ' || delta_table ||
+        ' AS SELECT ' || column_list || ' FROM bronze.' || target_table || ' WHERE 1 = 0';
+    EXECUTE IMMEDIATE 'ALTER TABLE ' || delta_table || ' ADD COLUMN IF NOT EXISTS cdc_op VARCHAR(1)';
+    EXECUTE IMMEDIATE 'ALTER TABLE ' || delta_table || ' ADD COLUMN IF NOT EXISTS source_file VARCHAR';
+
+    -- Files already loaded into the staging table are skipped by COPY
+    EXECUTE IMMEDIATE 'COPY INTO ' || delta_table || ' (' || column_list || ', cdc_op, source_file)' ||
+        ' FROM (SELECT ' || select_list || 'METADATA$FILENAME FROM @' || stage_name || ')' ||
+        ' PATTERN = ''' || file_pattern || ''' ON_ERROR = ''ABORT_STATEMENT''';
+
+    -- The newest file per key wins, with all of that file's rows for the key
+    EXECUTE IMMEDIATE 'CREATE OR REPLACE TEMPORARY TABLE ' || latest_table || ' AS SELECT * FROM ' || delta_table ||
+        ' QUALIFY source_file = MAX(source_file) OVER (PARTITION BY ' || key_list || ')';
+    SELECT COUNT(*) INTO :rows_staged FROM IDENTIFIER(:latest_table);
+
+    BEGIN TRANSACTION;
+
+    EXECUTE IMMEDIATE 'DELETE FROM bronze.' || target_table || ' t USING ' || latest_table || ' d' ||
+        ' WHERE ' || key_predicate;
+    rows_deleted := SQLROWCOUNT;
+
+    EXECUTE IMMEDIATE 'INSERT INTO bronze.' || target_table || ' (' || column_list || ')' ||
+        ' SELECT ' || column_list || ' FROM ' || latest_table || ' WHERE cdc_op IN (''I'', ''U'')';
+    rows_inserted := SQLROWCOUNT;
+
+    -- DELETE (not TRUNCATE) empties the staging table and keeps its COPY load metadata
+    EXECUTE IMMEDIATE 'DELETE FROM ' || delta_table;
+
+    COMMIT;
+
+    procedure_result := 'SUCCESS: Applied change capture to ' || target_table || '. ' ||
+                        rows_staged || ' delta rows applied, ' || rows_deleted || ' rows deleted, ' || rows_inserted || ' rows inserted.';
+    SYSTEM$LOG('INFO', procedure_result);
+    RETURN procedure_result;
+
+EXCEPTION
+    WHEN OTHER THEN
+        ROLLBACK;
+        error_message := 'Failed to apply change capture to ' || target_table || ': ' || SQLERRM;
+        SYSTEM$LOG('ERROR', error_message);
+        RAISE;
+END;
+$$;
+
+-- =================================================================================
+-- USAGE INSTRUCTIONS:
+-- 
+-- 1. Capture changes: python Orchestration/ingestion/change_capture.py --state-dir <state> --output-dir <out>
+-- 2. Upload <out>/*_delta_*.csv to s3://robel-data-lake/cdc/<crm|erp>/
+-- 3. Apply deltas per table:
+--
+-- CALL bronze.apply_change_capture('crm_cust_info', 'bronze.crm_cdc_stage', '.*cust_info_delta_.*[.]csv', ARRAY_CONSTRUCT('cst_id'));
+-- CALL bronze.apply_change_capture('crm_prd_info', 'bronze.crm_cdc_stage', '.*prd_info_delta_.*[.]csv', ARRAY_CONSTRUCT('prd_id'));
+-- CALL bronze.apply_change_capture('crm_sales_details', 'bronze.crm_cdc_stage', '.*sales_details_delta_.*[.]csv', ARRAY_CONSTRUCT('sls_ord_num', 'sls_prd_key'));
+-- CALL bronze.apply_change_capture('erp_cust_az12', 'bronze.erp_cdc_stage', '.*CUST_AZ12_delta_.*[.]csv', ARRAY_CONSTRUCT('CID'));
+-- CALL bronze.apply_change_capture('erp_loc_a101', 'bronze.erp_cdc_stage', '.*LOC_A101_delta_.*[.]csv', ARRAY_CONSTRUCT('cid'));
+-- CALL bronze.apply_change_capture('erp_px_cat_g1v2', 'bronze.erp_cdc_stage', '.*PX_CAT_G1V2_delta_.*[.]csv', ARRAY_CONSTRUCT('id'));
+-- 
+-- NOTE: The first run of change_capture.py emits every row as an insert; seed
+-- bronze with load_bronze_layer() and discard that initial delta instead.
+-- =================================================================================
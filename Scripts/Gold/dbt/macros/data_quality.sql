@@ -0,0 +1,106 @@
+{% macro dq_state_relation() %}
+  {#
+    State table of the incremental data quality checks (one row per check)
+    Shared with PipelineHealthChecker (Orchestration/monitoring/scripts/health_checks.py)
+  #}
+  {{ return(api.Relation.create(
+      database=var('watermark_database', target.database),
+      schema=var('watermark_schema', 'control'),
+      identifier='dq_check_watermarks')) }}
+{% endmacro %}
+
+{% macro create_dq_state_table() %}
+  {#
+    Create the data quality state table if missing
+    Usage: on-run-start: "{{ create_dq_state_table() }}"
+  #}
+  create table if not exists {{ dq_state_relation() }} (
+      check_name varchar,                -- <test file>.<check>
+      watermark_column varchar,          -- Load timestamp the check is scoped by
+      watermark_value timestamp_ntz,     -- Highest load timestamp validated so far
+      last_full_sweep_at timestamp_ntz,  -- Last run that checked the whole table
+      updated_at timestamp_ntz
+  )
+{% endmacro %}
+
+{% macro dq_state(check_name) %}
+  {#
+    Stored watermark of a check and whether it is due a full sweep; a check
+    runs incrementally only with var dq_mode = 'incremental', a stored
+    watermark and a full sweep within the last dq_full_sweep_hours
+  #}
+  {% set state = {'scope': 'full', 'watermark': none} %}
+  {% if not execute or var('dq_mode', 'incremental') != 'incremental' %}
+    {{ return(state) }}
+  {% endif %}
+  {% set relation = dq_state_relation() %}
+  {% if adapter.get_relation(relation.database, relation.schema, relation.identifier) is none %}
+    {{ return(state) }}
+  {% endif %}
+  {% set result = run_query(
+      "select to_varchar(watermark_value, 'YYYY-MM-DD HH24:MI:SS.FF6'), " ~
+      "coalesce(datediff('hour', last_full_sweep_at, current_timestamp()::timestamp_ntz) < " ~
+      var('dq_full_sweep_hours', 168) ~ ", false) from " ~ relation ~
+      " where check_name = '" ~ check_name ~ "'") %}
+  {% if result.rows | length > 0 and result.rows[0][0] is not none and result.rows[0][1] %}
+    {% do state.update({'scope': 'incremental', 'watermark': result.rows[0][0]}) %}
+  {% endif %}
+  {{ return(state) }}
+{% endmacro %}
+
+{% macro dq_scope(check_name) %}
+  {#
+    'incremental' or 'full' - select it as dq_scope so results show what was covered
+  #}
+  {{ return(dq_state(check_name)['scope']) }}
+{% endmacro %}
+
+{% macro dq_filter(check_name, column_name, prefix = 'where', overlap_minutes = var('watermark_overlap_minutes', 60)) %}
+  {#
+    Restrict a data quality check to rows loaded since the watermark it last validated
+    (minus a safety overlap); emits nothing when the check is due a full sweep
+    Usage: {{ dq_filter('fct_sales.orphaned_product_records', 'fs.dwh_created_at', prefix='and') }}
+  #}
+  {% set state = dq_state(check_name) %}
+  {% if state['scope'] == 'incremental' %}
+    {{ prefix }} {{ column_name }} > dateadd(minute, -{{ overlap_minutes }}, '{{ state['watermark'] }}'::timestamp_ntz)
+  {% endif %}
+{% endmacro %}
+
+{% macro record_dq_watermarks(results) %}
+  {#
+    on-run-end: advance the watermark of every check declared in a test's
+    meta.dq_checks ({name, model, column}) once the test passed (or warned), and
+    stamp last_full_sweep_at when it covered the full table. A failed test keeps
+    its watermark and loses its sweep stamp, so it runs over the full table
+    (including a retry) until it passes
+    Usage: on-run-end: "{{ record_dq_watermarks(results) }}"
+  #}
+  {% if execute %}
+    {% for result in results if result.node.resource_type == 'test' and result.status == 'fail' %}
+      {% for check in result.node.config.meta.get('dq_checks', []) %}
+        {% do run_query(
+            "update " ~ dq_state_relation() ~ " set last_full_sweep_at = null," ~
+            " updated_at = current_timestamp()::timestamp_ntz where check_name = '" ~ check['name'] ~ "'") %}
+      {% endfor %}
+    {% endfor %}
+    {% for result in results if result.node.resource_type == 'test' and result.status in ('pass', 'warn') %}
+      {% for check in result.node.config.meta.get('dq_checks', []) %}
+        {% set model = graph.nodes.values() | selectattr('resource_type', 'equalto', 'model')
+                                            | selectattr('name', 'equalto', check['model']) | first %}
+        {% set full_sweep = dq_scope(check['name']) == 'full' %}
+        {% do run_query(
+            "merge into " ~ dq_state_relation() ~ " w using (select '" ~ check['name'] ~ "' as check_name, '" ~
+            check['column'] ~ "' as watermark_column, max(" ~ check['column'] ~ ")::timestamp_ntz as watermark_value from " ~
+            api.Relation.create(database=model.database, schema=model.schema, identifier=model.alias) ~
+            ") s on w.check_name = s.check_name" ~
+            " when matched then update set watermark_value = coalesce(s.watermark_value, w.watermark_value)," ~
+            " last_full_sweep_at = " ~ ("current_timestamp()::timestamp_ntz" if full_sweep else "w.last_full_sweep_at") ~
+            ", updated_at = current_timestamp()::timestamp_ntz" ~
+            " when not matched then insert (check_name, watermark_column, watermark_value, last_full_sweep_at, updated_at)" ~
+            " values (s.check_name, s.watermark_column, s.watermark_value, " ~
+            ("current_timestamp()::timestamp_ntz" if full_sweep else "null") ~ ", current_timestamp()::timestamp_ntz)") %}
+      {% endfor %}
+    {% endfor %}
+  {% endif %}
+{% endmacro %}
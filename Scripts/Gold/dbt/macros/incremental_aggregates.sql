@@ -0,0 +1,33 @@
+{% macro touched_partitions(partition_expression, fact_relation, loaded_at_column = 'dwh_created_at') %}
+  {#
+  Purpose: List the aggregate partitions touched by fact rows loaded since the model's watermark
+  Parameters:
+    partition_expression (string): Partition key expressed on the fact columns, e.g. 'order_date'
+    fact_relation (relation): Fact model feeding the aggregate, e.g. ref('fct_sales')
+    loaded_at_column (string): Fact load timestamp compared with the stored watermark
+  Returns: Select of distinct partition values (every partition on the first incremental run)
+  Usage: where fs.order_date in ({{ touched_partitions('order_date', ref('fct_sales')) }})
+  Business Value: Daily mart refreshes scale with the day's new facts instead of all history
+  #}
+  select distinct {{ partition_expression }}
+  from {{ fact_relation }}
+  {{ watermark_filter(loaded_at_column) }}
+{% endmacro %}
+
+{% macro partition_refresh_config(partition_by, watermark_column = 'fact_loaded_at') %}
+  {#
+  Purpose: Shared config for aggregate marts rebuilt partition by partition
+  Parameters:
+    partition_by (list): Columns identifying a rebuilt partition; delete+insert replaces every
+                         mart row whose partition appears in the new batch
+    watermark_column (string): Mart column holding the latest fact load time aggregated
+  Usage: {{ partition_refresh_config(['order_date']) }}
+  #}
+  {{ config(
+      materialized='incremental',
+      incremental_strategy='delete+insert',
+      unique_key=partition_by,
+      on_schema_change='append_new_columns',
+      post_hook="{{ record_watermark('" ~ watermark_column ~ "') }}"
+  ) }}
+{% endmacro %}
@@ -1,12 +1,16 @@
 {{
     config(
         materialized='incremental',
-        unique_key='customer_key'
+        unique_key='customer_key',
+        on_schema_change='append_new_columns',
+        post_hook="{{ record_watermark('silver_loaded_at') }}"
     )
 }}
 
 with silver_customers as (
     select * from {{ ref('stg_customers') }}
+    -- Only silver rows written since the last consumed watermark
+    {{ watermark_filter('dwh_create_date') }}
 ),
 
 erp_customers as (
@@ -32,16 +36,11 @@ unified_customers as (
         end as gender,
         ec.bdate as birthdate,
         sc.cst_create_date as create_date,
+        sc.dwh_create_date as silver_loaded_at,
         current_timestamp() as dwh_created_at
     from silver_customers sc
     left join erp_customers ec on sc.cst_key = ec.cid
     left join erp_locations el on sc.cst_key = el.cid
-    {% if is_incremental() %}
-    where sc.cst_create_date >= (
-        select dateadd(day, -7, max(create_date)) 
-        from {{ this }}
-    )
-    {% endif %}
 )
 
 select * from unified_customers
@@ -1,12 +1,16 @@
 {{
     config(
         materialized='incremental',
-        unique_key='product_key'
+        unique_key='product_key',
+        on_schema_change='append_new_columns',
+        post_hook="{{ record_watermark('silver_loaded_at') }}"
     )
 }}
 
 with silver_products as (
     select * from {{ ref('stg_products') }}
+    -- Only silver rows written since the last consumed watermark
+    {{ watermark_filter('dwh_create_date') }}
 ),
 
 erp_categories as (
@@ -27,16 +31,11 @@ enriched_products as (
         sp.prd_line as product_line,
         sp.prd_start_dt as start_date,
         sp.prd_end_dt as end_date,
+        sp.dwh_create_date as silver_loaded_at,
         current_timestamp() as dwh_created_at
     from silver_products sp
     left join erp_categories ec on sp.cat_id = ec.id
     where sp.prd_end_dt is null
-    {% if is_incremental() %}
-    and sp.prd_start_dt >= (
-        select dateadd(day, -30, max(start_date)) 
-        from {{ this }}
-    )
-    {% endif %}
 )
 
 select * from enriched_products
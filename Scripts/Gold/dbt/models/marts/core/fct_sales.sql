@@ -1,12 +1,16 @@
 {{
     config(
         materialized='incremental',
-        unique_key='order_number'
+        unique_key='order_number',
+        on_schema_change='append_new_columns',
+        post_hook="{{ record_watermark('silver_loaded_at') }}"
     )
 }}
 
 with silver_sales as (
     select * from {{ ref('stg_sales') }}
+    -- Only silver rows written since the last consumed watermark
+    {{ watermark_filter('dwh_create_date') }}
 ),
 
 dim_products as (
@@ -28,16 +32,11 @@ fact_sales as (
         ss.sls_sales as sales_amount,
         ss.sls_quantity as quantity,
         ss.sls_price as price,
+        ss.dwh_create_date as silver_loaded_at,
         current_timestamp() as dwh_created_at
     from silver_sales ss
     left join dim_products dp on ss.sls_prd_key = dp.product_number
     left join dim_customers dc on ss.sls_cust_id = dc.customer_id
-    {% if is_incremental() %}
-    where ss.sls_order_dt >= (
-        select dateadd(day, -7, max(order_date)) 
-        from {{ this }}
-    )
-    {% endif %}
 )
 
 select * from fact_sales
@@ -1,14 +1,11 @@
-{{
-    config(
-        materialized='table'
-    )
-}}
+{{ partition_refresh_config(['acquisition_month']) }}
 
 /*
 Customer Acquisition Mart
 Purpose: Track new customer acquisition metrics and initial value
 Business Use: Marketing ROI analysis, acquisition channel performance, cohort analysis
-Refresh: Monthly full refresh aligned with financial reporting cycles
+Refresh: Incremental - acquisition months touched by newly loaded customers or
+         first-month orders are rebuilt; run with --full-refresh after dimension corrections
 */
 
 with customer_acquisition as (
@@ -18,11 +15,20 @@ with customer_acquisition as (
         dc.country,
         count(distinct dc.customer_key) as new_customers,
         count(distinct fs.order_number) as first_orders,
-        sum(fs.sales_amount) as first_month_revenue
+        sum(fs.sales_amount) as first_month_revenue,
+        -- Latest customer or order load aggregated (orders are optional in the left join)
+        greatest(max(dc.dwh_created_at), coalesce(max(fs.dwh_created_at), max(dc.dwh_created_at))) as fact_loaded_at
     from {{ ref('dim_customers') }} dc
     left join {{ ref('fct_sales') }} fs 
         on dc.customer_key = fs.customer_key
         and date_trunc('month', fs.order_date) = date_trunc('month', dc.create_date)
+    {% if is_incremental() %}
+    where date_trunc('month', dc.create_date) in (
+        {{ touched_partitions("date_trunc('month', create_date)", ref('dim_customers')) }}
+        union
+        {{ touched_partitions("date_trunc('month', order_date)", ref('fct_sales')) }}
+    )
+    {% endif %}
     group by 1,2
 ),
 
@@ -35,7 +41,8 @@ acquisition_metrics as (
         first_orders,
         first_month_revenue,
         -- Average First Order Value - key acquisition metric
-        first_month_revenue / nullif(new_customers, 0) as avg_first_order_value
+        first_month_revenue / nullif(new_customers, 0) as avg_first_order_value,
+        fact_loaded_at
     from customer_acquisition
 )
 
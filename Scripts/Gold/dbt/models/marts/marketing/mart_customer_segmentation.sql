@@ -1,14 +1,11 @@
-{{
-    config(
-        materialized='table'
-    )
-}}
+{{ partition_refresh_config(['customer_key']) }}
 
 /*
 Customer Segmentation Mart
 Purpose: Segment customers based on behavior and value for targeted marketing
 Business Use: Customer lifecycle management, personalized marketing, retention strategies
-Refresh: Weekly full refresh to capture customer behavior changes
+Refresh: Incremental - customers with newly loaded facts are re-segmented over their
+         full order history; run with --full-refresh after dimension corrections
 */
 
 with customer_orders as (
@@ -20,9 +17,13 @@ with customer_orders as (
         min(fs.order_date) as first_order_date,
         max(fs.order_date) as last_order_date,
         count(distinct fs.order_number) as total_orders,
-        sum(fs.sales_amount) as total_spent
+        sum(fs.sales_amount) as total_spent,
+        max(fs.dwh_created_at) as fact_loaded_at
     from {{ ref('fct_sales') }} fs
     join {{ ref('dim_customers') }} dc on fs.customer_key = dc.customer_key
+    {% if is_incremental() %}
+    where fs.customer_key in ({{ touched_partitions('customer_key', ref('fct_sales')) }})
+    {% endif %}
     group by 1,2,3
 ),
 
@@ -49,7 +50,8 @@ customer_segments as (
             when total_spent >= 5000 then 'Medium Value'
             when total_spent >= 1000 then 'Low Value'
             else 'Minimal Value'
-        end as value_segment
+        end as value_segment,
+        fact_loaded_at
     from customer_orders
 )
 
@@ -1,14 +1,11 @@
-{{
-    config(
-        materialized='table'
-    )
-}}
+{{ partition_refresh_config(['order_date']) }}
 
 /*
 Sales Performance Mart
 Purpose: Aggregate sales metrics for business performance reporting
 Business Use: Sales dashboards, performance monitoring, regional analysis
-Refresh: Daily full refresh to ensure consistent metrics
+Refresh: Incremental - order dates touched by newly loaded facts are rebuilt in full,
+         so distinct counts stay exact; run with --full-refresh after dimension corrections
 */
 
 with sales_facts as (
@@ -21,10 +18,14 @@ with sales_facts as (
         sum(fs.sales_amount) as total_sales,
         sum(fs.quantity) as total_quantity,
         count(distinct fs.order_number) as order_count,
-        count(distinct fs.customer_key) as customer_count
+        count(distinct fs.customer_key) as customer_count,
+        max(fs.dwh_created_at) as fact_loaded_at
     from {{ ref('fct_sales') }} fs
     join {{ ref('dim_customers') }} dc on fs.customer_key = dc.customer_key
     join {{ ref('dim_products') }} dp on fs.product_key = dp.product_key
+    {% if is_incremental() %}
+    where fs.order_date in ({{ touched_partitions('order_date', ref('fct_sales')) }})
+    {% endif %}
     group by 1,2,3,4
 ),
 
@@ -42,7 +43,8 @@ performance_metrics as (
         -- Average Order Value (AOV) - key e-commerce metric
         total_sales / nullif(order_count, 0) as avg_order_value,
         -- Revenue per customer - customer value indicator
-        total_sales / nullif(customer_count, 0) as revenue_per_customer
+        total_sales / nullif(customer_count, 0) as revenue_per_customer,
+        fact_loaded_at
     from sales_facts
 )
 
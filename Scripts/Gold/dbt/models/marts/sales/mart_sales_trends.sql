@@ -1,35 +1,84 @@
-{{
-    config(
-        materialized='table'
-    )
-}}
+{{ partition_refresh_config(['year', 'month', 'product_line']) }}
 
 /*
 Sales Trends Mart
 Purpose: Analyze sales trends and growth patterns over time
 Business Use: Trend analysis, forecasting, seasonal pattern identification
-Refresh: Monthly full refresh to capture complete trend cycles
+Refresh: Incremental - each product line is rebuilt from the earliest month touched by
+         newly loaded facts, so later months' prev_month_sales and growth stay correct;
+         run with --full-refresh after dimension corrections
 */
 
-with monthly_sales as (
-    -- Aggregate sales to monthly level with previous period comparison
+{% if is_incremental() %}
+with recompute_from as (
+    -- Earliest touched month per product line; every later month is rebuilt
+    select
+        dp.product_line,
+        min(tp.order_month) as from_month
+    from ({{ touched_partitions("product_key, date_trunc('month', order_date) as order_month", ref('fct_sales')) }}) tp
+    join {{ ref('dim_products') }} dp on tp.product_key = dp.product_key
+    group by 1
+),
+
+previous_month as (
+    -- Last month already in the mart before each rebuilt range, seeds lag() for the first rebuilt month
+    select
+        t.year,
+        t.month,
+        t.product_line,
+        t.monthly_sales
+    from {{ this }} t
+    join recompute_from rf on t.product_line = rf.product_line
+    where date_from_parts(t.year, t.month, 1) < rf.from_month
+    qualify row_number() over (partition by t.product_line order by t.year desc, t.month desc) = 1
+),
+
+monthly_totals as (
+{% else %}
+with monthly_totals as (
+{% endif %}
+    -- Aggregate sales to monthly level
     select
         dd.year,
         dd.month,
         dp.product_line,
         sum(fs.sales_amount) as monthly_sales,
         sum(fs.quantity) as monthly_quantity,
-        -- Previous month sales for growth calculation
-        lag(sum(fs.sales_amount)) over (
-            partition by dp.product_line 
-            order by dd.year, dd.month
-        ) as prev_month_sales
+        max(fs.dwh_created_at) as fact_loaded_at
     from {{ ref('fct_sales') }} fs
     join {{ ref('dim_dates') }} dd on fs.order_date = dd.date
     join {{ ref('dim_products') }} dp on fs.product_key = dp.product_key
+    {% if is_incremental() %}
+    join recompute_from rf
+        on dp.product_line = rf.product_line
+        and fs.order_date >= rf.from_month
+    {% endif %}
     group by 1,2,3
 ),
 
+monthly_sales as (
+    -- Previous month sales for growth calculation
+    select
+        year,
+        month,
+        product_line,
+        monthly_sales,
+        monthly_quantity,
+        fact_loaded_at,
+        lag(monthly_sales) over (
+            partition by product_line
+            order by year, month
+        ) as prev_month_sales,
+        is_seed
+    from (
+        select *, false as is_seed from monthly_totals
+        {% if is_incremental() %}
+        union all
+        select year, month, product_line, monthly_sales, null, null, true from previous_month
+        {% endif %}
+    )
+),
+
 sales_trends as (
     -- Calculate growth metrics and trend indicators
     select
@@ -42,8 +91,10 @@ sales_trends as (
         -- Absolute sales growth (current month vs previous month)
         monthly_sales - prev_month_sales as sales_growth,
         -- Percentage growth rate for trend analysis
-        (monthly_sales - prev_month_sales) / nullif(prev_month_sales, 0) as sales_growth_pct
+        (monthly_sales - prev_month_sales) / nullif(prev_month_sales, 0) as sales_growth_pct,
+        fact_loaded_at
     from monthly_sales
+    where not is_seed
 )
 
 select * from sales_trends
@@ -3,13 +3,26 @@ Dimension Integrity Test: Unique Key Validation
 Purpose: Ensure dimension tables maintain unique primary keys
 Business Impact: Prevents duplicate records in analytical models
 Test Frequency: Daily as part of data quality checks
+Scope: Duplicate-key checks are incremental - only keys of rows loaded since each check's
+       watermark are compared against the whole dimension (macros/data_quality.sql)
 */
 
+{{ config(meta={'dq_checks': [
+    {'name': 'dim_customers.duplicate_keys', 'model': 'dim_customers', 'column': 'dwh_created_at'},
+    {'name': 'dim_products.duplicate_keys', 'model': 'dim_products', 'column': 'dwh_created_at'}
+]}) }}
+
 -- Test for duplicate customer keys
 select
     customer_key,
     count(*) as duplicate_count
 from {{ ref('dim_customers') }}
+{% if dq_scope('dim_customers.duplicate_keys') == 'incremental' %}
+where customer_key in (
+    select customer_key from {{ ref('dim_customers') }}
+    {{ dq_filter('dim_customers.duplicate_keys', 'dwh_created_at') }}
+)
+{% endif %}
 group by customer_key
 having count(*) > 1
 
@@ -23,6 +36,12 @@ select
     product_key,
     count(*) as duplicate_count
 from {{ ref('dim_products') }}
+{% if dq_scope('dim_products.duplicate_keys') == 'incremental' %}
+where product_key in (
+    select product_key from {{ ref('dim_products') }}
+    {{ dq_filter('dim_products.duplicate_keys', 'dwh_created_at') }}
+)
+{% endif %}
 group by product_key
 having count(*) > 1
 
@@ -3,15 +3,25 @@ Referential Integrity Test: Fact Sales Foreign Keys
 Purpose: Ensure all fact table records have valid dimension references
 Business Impact: Prevents orphaned records in sales reporting
 Test Frequency: Daily as part of data quality checks
+Scope: Incremental - only fact rows loaded since each check's watermark (macros/data_quality.sql),
+       with a full-table sweep every dq_full_sweep_hours
 */
 
+{{ config(meta={'dq_checks': [
+    {'name': 'fct_sales.orphaned_product_records', 'model': 'fct_sales', 'column': 'dwh_created_at'},
+    {'name': 'fct_sales.orphaned_customer_records', 'model': 'fct_sales', 'column': 'dwh_created_at'},
+    {'name': 'fct_sales.future_dated_orders', 'model': 'fct_sales', 'column': 'dwh_created_at'}
+]}) }}
+
 -- Test for orphaned product keys in fact sales
 select 
-    count(*) as orphaned_product_records
+    count(*) as orphaned_product_records,
+    '{{ dq_scope('fct_sales.orphaned_product_records') }}' as dq_scope
 from {{ ref('fct_sales') }} fs
 left join {{ ref('dim_products') }} dp on fs.product_key = dp.product_key
 where dp.product_key is null
 and fs.product_key is not null
+{{ dq_filter('fct_sales.orphaned_product_records', 'fs.dwh_created_at', prefix='and') }}
 
 /*
 Expected Result: 0 orphaned records
@@ -20,11 +30,13 @@ Failure Action: Investigate missing product dimension records
 
 -- Test for orphaned customer keys in fact sales
 select 
-    count(*) as orphaned_customer_records
+    count(*) as orphaned_customer_records,
+    '{{ dq_scope('fct_sales.orphaned_customer_records') }}' as dq_scope
 from {{ ref('fct_sales') }} fs
 left join {{ ref('dim_customers') }} dc on fs.customer_key = dc.customer_key
 where dc.customer_key is null
 and fs.customer_key is not null
+{{ dq_filter('fct_sales.orphaned_customer_records', 'fs.dwh_created_at', prefix='and') }}
 
 /*
 Expected Result: 0 orphaned records  
@@ -33,9 +45,11 @@ Failure Action: Investigate missing customer dimension records
 
 -- Test for future-dated sales orders (data quality check)
 select
-    count(*) as future_dated_orders
+    count(*) as future_dated_orders,
+    '{{ dq_scope('fct_sales.future_dated_orders') }}' as dq_scope
 from {{ ref('fct_sales') }}
 where order_date > current_date()
+{{ dq_filter('fct_sales.future_dated_orders', 'dwh_created_at', prefix='and') }}
 
 /*
 Expected Result: 0 future-dated orders
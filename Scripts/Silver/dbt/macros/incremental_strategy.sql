@@ -14,30 +14,116 @@
   {{ return('merge') }}
 {% endmacro %}
 
-{% macro get_incremental_where_clause(column_name = 'loaded_at', lookback_days = 7) %}
+{% macro watermark_relation() %}
   {#
-    Macro to generate consistent incremental WHERE clauses across models
-    Usage: {{ get_incremental_where_clause('created_date', 30) }}
+    Control table holding the high-water mark each incremental model last consumed
+    Shared by the silver and gold projects (one row per model)
   #}
-  {% if is_incremental() %}
-    where {{ column_name }} >= (
-      select dateadd(day, -{{ lookback_days }}, coalesce(max({{ column_name }}), '1900-01-01'::timestamp)) 
-      from {{ this }}
-      where {{ column_name }} is not null
-    )
+  {{ return(api.Relation.create(
+      database=var('watermark_database', target.database),
+      schema=var('watermark_schema', 'control'),
+      identifier='incremental_watermarks')) }}
+{% endmacro %}
+
+{% macro watermark_key() %}
+  {{ return((this.schema ~ '.' ~ this.identifier) | lower) }}
+{% endmacro %}
+
+{% macro create_watermark_table() %}
+  {#
+    Create the watermark control table if missing
+    Usage: on-run-start: "{{ create_watermark_table() }}"
+  #}
+  {% set relation = watermark_relation() %}
+  {% if execute %}
+    {% do run_query('create schema if not exists ' ~ relation.database ~ '.' ~ relation.schema) %}
   {% endif %}
+  create table if not exists {{ relation }} (
+      model_name varchar not null,       -- <schema>.<alias> of the incremental model
+      watermark_column varchar,          -- Column the watermark was taken from
+      watermark_value timestamp_ntz,     -- Highest value consumed by the last successful run
+      invocation_id varchar,             -- dbt invocation that recorded it
+      updated_at timestamp_ntz
+  )
 {% endmacro %}
 
-{% macro incremental_filter(column_name, default_lookback_days = 7) %}
+{% macro get_watermark() %}
   {#
-    Simplified macro for incremental filtering
-    Usage: {{ incremental_filter('order_date') }}
+    Return the stored watermark for the current model as a string, or none
+    when the table or the model's row does not exist yet
+  #}
+  {% if not execute %}
+    {{ return(none) }}
+  {% endif %}
+  {% set relation = watermark_relation() %}
+  {% if adapter.get_relation(relation.database, relation.schema, relation.identifier) is none %}
+    {{ return(none) }}
+  {% endif %}
+  {% set result = run_query(
+      "select to_varchar(watermark_value, 'YYYY-MM-DD HH24:MI:SS.FF6') from " ~ relation ~
+      " where model_name = '" ~ watermark_key() ~ "'") %}
+  {% if result.rows | length == 0 or result.rows[0][0] is none %}
+    {{ return(none) }}
+  {% endif %}
+  {{ return(result.rows[0][0]) }}
+{% endmacro %}
+
+{% macro watermark_filter(column_name, overlap_minutes = var('watermark_overlap_minutes', 60), prefix = 'where') %}
+  {#
+    Restrict an incremental run to rows newer than the stored watermark minus a safety overlap
+    The watermark is inlined as a literal so the predicate stays prunable
+    No stored watermark (first incremental run) means no filter - the merge handles reprocessing
+    Usage: {{ watermark_filter('dwh_loaded_at') }}
   #}
   {% if is_incremental() %}
-    and {{ column_name }} >= dateadd(day, -{{ default_lookback_days }}, current_date)
+    {% set watermark = get_watermark() %}
+    {% if watermark is not none %}
+    {{ prefix }} {{ column_name }} > dateadd(minute, -{{ overlap_minutes }}, '{{ watermark }}'::timestamp_ntz)
+    {% endif %}
   {% endif %}
 {% endmacro %}
 
+{% macro record_watermark(column_name) %}
+  {#
+    Post-hook: store the highest value of column_name now present in the model,
+    i.e. the high-water mark this run actually consumed
+    Usage: post_hook="{{ record_watermark('dwh_loaded_at') }}"
+  #}
+  merge into {{ watermark_relation() }} w
+  using (
+      select
+          '{{ watermark_key() }}' as model_name,
+          '{{ column_name }}' as watermark_column,
+          max({{ column_name }})::timestamp_ntz as watermark_value
+      from {{ this }}
+  ) s
+  on w.model_name = s.model_name
+  when matched and s.watermark_value is not null then update set
+      watermark_column = s.watermark_column,
+      watermark_value = s.watermark_value,
+      invocation_id = '{{ invocation_id }}',
+      updated_at = current_timestamp()::timestamp_ntz
+  when not matched then insert (model_name, watermark_column, watermark_value, invocation_id, updated_at)
+      values (s.model_name, s.watermark_column, s.watermark_value, '{{ invocation_id }}', current_timestamp()::timestamp_ntz)
+{% endmacro %}
+
+{% macro get_incremental_where_clause(column_name = 'dwh_loaded_at', overlap_minutes = var('watermark_overlap_minutes', 60)) %}
+  {#
+    Macro to generate consistent incremental WHERE clauses across models
+    Filters on the model's stored watermark instead of a fixed lookback window
+    Usage: {{ get_incremental_where_clause('dwh_loaded_at') }}
+  #}
+  {{ watermark_filter(column_name, overlap_minutes, 'where') }}
+{% endmacro %}
+
+{% macro incremental_filter(column_name = 'dwh_loaded_at', overlap_minutes = var('watermark_overlap_minutes', 60)) %}
+  {#
+    Simplified macro for incremental filtering inside an existing WHERE clause
+    Usage: {{ incremental_filter('dwh_loaded_at') }}
+  #}
+  {{ watermark_filter(column_name, overlap_minutes, 'and') }}
+{% endmacro %}
+
 {% macro handle_schema_changes() %}
   {#
     Macro to handle schema changes in incremental models
@@ -3,6 +3,8 @@
         materialized='incremental',
         unique_key='cst_id',
         alias='crm_cust_info',
+        on_schema_change='append_new_columns',
+        post_hook="{{ record_watermark('dwh_loaded_at') }}",
         tags=['silver', 'staging', 'crm']
     )
 }}
@@ -16,16 +18,11 @@ with source_data as (
         cst_marital_status,
         cst_gndr,
         cst_create_date,
+        dwh_loaded_at,
         current_timestamp() as dwh_create_date
     from {{ source('bronze', 'crm_cust_info') }}
-    {% if is_incremental() %}
-    -- Incremental logic: process records from last 7 days to catch updates
-    where cst_create_date >= (
-        select dateadd(day, -7, max(cst_create_date)) 
-        from {{ this }}
-        where cst_create_date is not null
-    )
-    {% endif %}
+    -- Incremental logic: only rows loaded into bronze since the last consumed watermark
+    {{ watermark_filter('dwh_loaded_at') }}
 ),
 
 -- Deduplicate customers, keeping most recent record per customer
@@ -62,6 +59,7 @@ cleaned as (
         end as cst_gndr,
         
         cst_create_date,
+        dwh_loaded_at,
         dwh_create_date
         
     from deduplicated
@@ -3,6 +3,8 @@
         materialized='incremental',
         unique_key='prd_id',
         alias='crm_prd_info',
+        on_schema_change='append_new_columns',
+        post_hook="{{ record_watermark('dwh_loaded_at') }}",
         tags=['silver', 'staging', 'crm']
     )
 }}
@@ -16,16 +18,11 @@ with source_data as (
         prd_line,
         prd_start_dt,
         prd_end_dt,
+        dwh_loaded_at,
         current_timestamp() as dwh_create_date
     from {{ source('bronze', 'crm_prd_info') }}
-    {% if is_incremental() %}
-    -- Incremental logic: process recent product updates
-    where prd_start_dt >= (
-        select dateadd(day, -30, max(prd_start_dt)) 
-        from {{ this }}
-        where prd_start_dt is not null
-    )
-    {% endif %}
+    -- Incremental logic: only rows loaded into bronze since the last consumed watermark
+    {{ watermark_filter('dwh_loaded_at') }}
 ),
 
 transformed as (
@@ -64,6 +61,7 @@ transformed as (
             as date
         ) as prd_end_dt,
         
+        dwh_loaded_at,
         dwh_create_date
         
     from source_data
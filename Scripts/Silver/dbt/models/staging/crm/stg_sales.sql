@@ -3,6 +3,8 @@
         materialized='incremental',
         unique_key='sls_ord_num',
         alias='crm_sales_details',
+        on_schema_change='append_new_columns',
+        post_hook="{{ record_watermark('dwh_loaded_at') }}",
         tags=['silver', 'staging', 'crm']
     )
 }}
@@ -18,12 +20,11 @@ with source_data as (
         sls_sales,
         sls_quantity,
         sls_price,
+        dwh_loaded_at,
         current_timestamp() as dwh_create_date
     from {{ source('bronze', 'crm_sales_details') }}
-    {% if is_incremental() %}
-    -- Incremental logic: process sales from last 30 days
-    where try_to_date(sls_order_dt::varchar, 'YYYYMMDD') >= dateadd(day, -30, current_date)
-    {% endif %}
+    -- Incremental logic: only rows loaded into bronze since the last consumed watermark
+    {{ watermark_filter('dwh_loaded_at') }}
 ),
 
 cleaned as (
@@ -65,6 +66,7 @@ cleaned as (
             else sls_price
         end as sls_price,
         
+        dwh_loaded_at,
         dwh_create_date
         
     from source_data
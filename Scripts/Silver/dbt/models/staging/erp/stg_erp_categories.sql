@@ -3,6 +3,8 @@
         materialized='incremental',
         unique_key='id',
         alias='erp_px_cat_g1v2',
+        on_schema_change='append_new_columns',
+        post_hook="{{ record_watermark('dwh_loaded_at') }}",
         tags=['silver', 'staging', 'erp']
     )
 }}
@@ -12,12 +14,8 @@ select
     cat,
     subcat,
     maintenance,
+    dwh_loaded_at,
     current_timestamp() as dwh_create_date
 from {{ source('bronze', 'erp_px_cat_g1v2') }}
-{% if is_incremental() %}
--- Simple incremental logic for category data
-where current_timestamp() >= (
-    select dateadd(day, -30, max(dwh_create_date)) 
-    from {{ this }}
-)
-{% endif %}
+-- Incremental logic: only rows loaded into bronze since the last consumed watermark
+{{ watermark_filter('dwh_loaded_at') }}
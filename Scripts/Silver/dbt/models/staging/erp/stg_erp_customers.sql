@@ -3,6 +3,8 @@
         materialized='incremental',
         unique_key='cid',
         alias='erp_cust_az12',
+        on_schema_change='append_new_columns',
+        post_hook="{{ record_watermark('dwh_loaded_at') }}",
         tags=['silver', 'staging', 'erp']
     )
 }}
@@ -12,15 +14,11 @@ with source_data as (
         cid,
         bdate,
         gen,
+        dwh_loaded_at,
         current_timestamp() as dwh_create_date
     from {{ source('bronze', 'erp_cust_az12') }}
-    {% if is_incremental() %}
-    -- Conservative incremental approach for customer data
-    where current_timestamp() >= (
-        select dateadd(day, -7, max(dwh_create_date)) 
-        from {{ this }}
-    )
-    {% endif %}
+    -- Incremental logic: only rows loaded into bronze since the last consumed watermark
+    {{ watermark_filter('dwh_loaded_at') }}
 ),
 
 cleaned as (
@@ -44,6 +42,7 @@ cleaned as (
             else 'n/a'
         end as gen,
         
+        dwh_loaded_at,
         dwh_create_date
         
     from source_data
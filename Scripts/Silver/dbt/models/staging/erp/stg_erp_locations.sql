@@ -3,6 +3,8 @@
         materialized='incremental',
         unique_key='cid',
         alias='erp_loc_a101',
+        on_schema_change='append_new_columns',
+        post_hook="{{ record_watermark('dwh_loaded_at') }}",
         tags=['silver', 'staging', 'erp']
     )
 }}
@@ -11,15 +13,11 @@ with source_data as (
     select 
         cid,
         cntry,
+        dwh_loaded_at,
         current_timestamp() as dwh_create_date
     from {{ source('bronze', 'erp_loc_a101') }}
-    {% if is_incremental() %}
-    -- Conservative incremental approach for location data
-    where current_timestamp() >= (
-        select dateadd(day, -30, max(dwh_create_date)) 
-        from {{ this }}
-    )
-    {% endif %}
+    -- Incremental logic: only rows loaded into bronze since the last consumed watermark
+    {{ watermark_filter('dwh_loaded_at') }}
 ),
 
 cleaned as (
@@ -35,6 +33,7 @@ cleaned as (
             else trim(cntry)
         end as cntry,
         
+        dwh_loaded_at,
         dwh_create_date
         
     from source_data